@@ -12,6 +12,33 @@ __all__ = [
     "CronWorkflow",
     "Workflow",
     "WorkflowTemplate",
+    # bulk
+    "compile_all",
+    "BuildCache",
+    "CompileResult",
+    "LoadResult",
+    "reconcile",
+    "ReconcileResult",
+    "submit_many",
+    "submit_sweep",
+    "SubmitResult",
+    "SubmitResults",
+    "wait_all",
+    # remote
+    "AsyncClient",
+    "HTTPCache",
+    "NodeStatusView",
+    "RateLimiter",
+    "RetryPolicy",
+    "WorkflowInformer",
+    # serializers
+    "dump_all",
+    "get_serializer",
+    "register_serializer",
+    "set_default_serializer",
+    "JSONSerializer",
+    "Serializer",
+    "YAMLSerializer",
 ]
 
 # modules
@@ -27,3 +54,33 @@ from ._workflow_template import ClusterWorkflowTemplate
 from ._cronworkflow import CronWorkflow
 from ._workflow import Workflow
 from ._workflow_template import WorkflowTemplate
+
+# bulk
+from ._compiler import compile_all
+from ._cache import BuildCache
+from ._compiler import CompileResult
+from ._loader import LoadResult
+from ._reconciler import reconcile
+from ._reconciler import ReconcileResult
+from ._submitter import submit_many
+from ._submitter import submit_sweep
+from ._submitter import SubmitResult
+from ._submitter import SubmitResults
+from ._watch import wait_all
+
+# remote
+from ._aio import AsyncClient
+from ._http import HTTPCache
+from ._status import NodeStatusView
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+from ._informer import WorkflowInformer
+
+# serializers
+from ._serializers import dump_all
+from ._serializers import get_serializer
+from ._serializers import register_serializer
+from ._serializers import set_default_serializer
+from ._serializers import JSONSerializer
+from ._serializers import Serializer
+from ._serializers import YAMLSerializer
@@ -0,0 +1,90 @@
+"""Argo Workflows Python DSL command line interface."""
+
+import argparse
+import logging
+import sys
+
+from typing import List
+from typing import Optional
+
+from ._cache import BuildCache
+from ._compiler import CompileResult
+from ._compiler import compile_all
+
+
+def _compile(args: argparse.Namespace) -> int:
+    cache: Optional[BuildCache] = None
+    if args.cache_dir is not None:
+        cache = BuildCache(args.cache_dir, max_size=args.cache_size * 1024 ** 2)
+
+    results: List[CompileResult] = compile_all(
+        args.sources,
+        workers=args.workers,
+        output=args.output,
+        fmt=args.format,
+        cache=cache,
+    )
+
+    failed: List[CompileResult] = []
+    for result in results:
+        name = result.name or "<import>"
+        if result.ok:
+            cached = " (cached)" if result.cached else ""
+            print(
+                f"{result.duration:8.3f}s  {result.module}:{name}"
+                f" -> {result.path}{cached}"
+            )
+        else:
+            print(f"{result.duration:8.3f}s  {result.module}:{name} FAILED")
+            failed.append(result)
+
+    for result in failed:
+        print(f"\n{result.module}:{result.name or '<import>'}\n{result.error}")
+
+    total = sum(r.duration for r in results)
+    print(
+        f"\n{len(results) - len(failed)} compiled, {len(failed)} failed"
+        f" ({total:.3f}s of compilation)"
+    )
+
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    parser = argparse.ArgumentParser(prog="argo-dsl", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    compile_parser = subparsers.add_parser(
+        "compile", help="compile DSL classes and write their manifests"
+    )
+    compile_parser.add_argument(
+        "sources", nargs="+", help="package names, scripts or directories of scripts"
+    )
+    compile_parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="number of worker processes"
+    )
+    compile_parser.add_argument(
+        "-o", "--output", default=None, help="output directory [next to the sources]"
+    )
+    compile_parser.add_argument(
+        "-f", "--format", choices=["yaml", "json"], default="yaml", help="manifest format"
+    )
+    compile_parser.add_argument(
+        "--cache-dir", default=None, help="directory of the build cache [disabled]"
+    )
+    compile_parser.add_argument(
+        "--cache-size", type=int, default=256, help="build cache size in MiB [256]"
+    )
+    compile_parser.set_defaults(func=_compile)
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
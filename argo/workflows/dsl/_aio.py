@@ -0,0 +1,330 @@
+"""Asynchronous client of the Argo server.
+
+Requires `aiohttp`, install by `pip install argo-workflows-dsl[async]`.
+"""
+
+import asyncio
+import json
+import ssl
+
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1CronWorkflow
+from argo.workflows.client.models import V1alpha1CronWorkflowList
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.models import V1alpha1WorkflowList
+from argo.workflows.client.models import V1alpha1WorkflowWatchEvent
+from argo.workflows.client.rest import ApiException
+
+from . import _http
+from . import _utils
+from ._http import HTTPCache
+
+__all__ = ["AsyncClient"]
+
+T = TypeVar("T")
+
+# connections kept alive by a client
+_POOL_SIZE = 100
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError as exc:
+        raise ImportError(
+            "The asynchronous client requires aiohttp,"
+            " install it by `pip install argo-workflows-dsl[async]`."
+        ) from exc
+
+    return aiohttp
+
+
+class AsyncClient:
+    """Asynchronous client of the Argo server.
+
+    All requests of the client share a single pool of keep-alive connections,
+    so that one event loop can hold thousands of requests in flight.
+    The client must be closed, preferably by `async with`:
+
+        async with AsyncClient(config) as client:
+            created = await wf.asubmit(client, "argo")
+    """
+
+    def __init__(
+        self,
+        configuration: Optional[Configuration] = None,
+        *,
+        limit: int = _POOL_SIZE,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Create a client of the server given by `configuration.host`.
+
+        :param configuration: Configuration, as of ApiClient [default]
+        :param limit: int, max. number of concurrent connections [100]
+        :param headers: Dict[str, str], headers sent with every request
+            to the server, along with the ones of the authentication
+        """
+        _aiohttp()  # fail early
+
+        self.configuration = configuration or Configuration.get_default_copy()
+        self.limit = limit
+
+        self.headers: Dict[str, str] = {}
+        for auth in self.configuration.auth_settings().values():
+            if auth["in"] == "header" and auth["value"]:
+                self.headers[auth["key"]] = auth["value"]
+        self.headers.update(headers or {})
+
+        self._session: Optional[Any] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connections of the client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def session(self) -> Any:
+        """Return the aiohttp session of the client, created on first use."""
+        if self._session is None:
+            aiohttp = _aiohttp()
+
+            connector = aiohttp.TCPConnector(limit=self.limit, ssl=self._ssl())
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+    def _ssl(self) -> Union[bool, ssl.SSLContext]:
+        config: Configuration = self.configuration
+        if not config.verify_ssl:
+            return False
+
+        context = ssl.create_default_context(cafile=config.ssl_ca_cert)
+        if config.cert_file:
+            context.load_cert_chain(config.cert_file, config.key_file)
+
+        return context
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> Any:
+        """Send a request to the server and return the JSON response.
+
+        :param path: str, path of the endpoint, e.g. '/api/v1/workflows/argo'
+        :raises: ApiException if the server responds with an error
+        """
+        aiohttp = _aiohttp()
+
+        async with self.session().request(
+            method,
+            self.configuration.host + path,
+            params=self._params(params),
+            headers=self.headers,
+            json=body,
+            proxy=self.configuration.proxy,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            data: bytes = await resp.read()
+            if resp.status >= 400:
+                raise self._error(resp, data)
+
+        return json.loads(data)
+
+    async def fetch(
+        self,
+        url: str,
+        *,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> str:
+        """Fetch a remote manifest, see `_http.fetch`.
+
+        :raises: aiohttp.ClientResponseError if the server responds with an error
+        """
+        aiohttp = _aiohttp()
+
+        cache = _http.default_cache(cache)
+
+        entry = await self._cached(cache, cache.get, url)
+        if entry is not None and cache.is_fresh(entry):
+            return entry.text
+
+        async with self.session().get(
+            url,
+            headers=_http.conditional_headers(entry),
+            proxy=self.configuration.proxy,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            if entry is not None and resp.status == 304:
+                return await self._cached(cache, _http.revalidated, cache, url, entry)
+
+            resp.raise_for_status()
+            text: str = await resp.text()
+
+        return await self._cached(cache, _http.store, cache, url, text, resp.headers)
+
+    @staticmethod
+    async def _cached(cache: HTTPCache, f: Callable[..., T], *args) -> T:
+        """Call the cache, in the default executor if it is stored on disk.
+
+        Entries on disk are read, written and evicted by blocking file I/O,
+        which would otherwise block the event loop.
+        """
+        if cache.path is None:
+            return f(*args)
+
+        return await asyncio.get_event_loop().run_in_executor(None, f, *args)
+
+    async def create_workflow(
+        self, namespace: str, manifest: Dict[str, Any]
+    ) -> V1alpha1Workflow:
+        """Create a Workflow from its manifest."""
+        data = await self.request(
+            "POST", f"/api/v1/workflows/{namespace}", body={"workflow": manifest}
+        )
+        return _utils.to_model(data, V1alpha1Workflow)
+
+    async def create_cron_workflow(
+        self, namespace: str, manifest: Dict[str, Any]
+    ) -> V1alpha1CronWorkflow:
+        """Create a CronWorkflow from its manifest."""
+        data = await self.request(
+            "POST",
+            f"/api/v1/cron-workflows/{namespace}",
+            body={"cronWorkflow": manifest},
+        )
+        return _utils.to_model(data, V1alpha1CronWorkflow)
+
+    async def get_workflow(self, namespace: str, name: str) -> V1alpha1Workflow:
+        """Return the Workflow of the given name."""
+        data = await self.request("GET", f"/api/v1/workflows/{namespace}/{name}")
+        return _utils.to_model(data, V1alpha1Workflow)
+
+    async def list_workflows(
+        self,
+        namespace: str,
+        *,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> V1alpha1WorkflowList:
+        """Return Workflows of the namespace."""
+        data = await self.request(
+            "GET",
+            f"/api/v1/workflows/{namespace}",
+            params={
+                "listOptions.labelSelector": label_selector,
+                "listOptions.fieldSelector": field_selector,
+            },
+        )
+        return _utils.to_model(data, V1alpha1WorkflowList)
+
+    async def list_cron_workflows(
+        self,
+        namespace: str,
+        *,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> V1alpha1CronWorkflowList:
+        """Return CronWorkflows of the namespace."""
+        data = await self.request(
+            "GET",
+            f"/api/v1/cron-workflows/{namespace}",
+            params={
+                "listOptions.labelSelector": label_selector,
+                "listOptions.fieldSelector": field_selector,
+            },
+        )
+        return _utils.to_model(data, V1alpha1CronWorkflowList)
+
+    async def watch_workflows(
+        self,
+        namespace: str,
+        *,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        resource_version: Optional[str] = None,
+    ) -> AsyncIterator[V1alpha1WorkflowWatchEvent]:
+        """Yield events of Workflows of the namespace as they occur.
+
+        The stream does not time out, stop iterating to close it.
+
+        :raises: ApiException if the server responds with an error
+        """
+        aiohttp = _aiohttp()
+
+        params = {
+            "listOptions.labelSelector": label_selector,
+            "listOptions.fieldSelector": field_selector,
+            "listOptions.resourceVersion": resource_version,
+        }
+        async with self.session().get(
+            f"{self.configuration.host}/api/v1/workflow-events/{namespace}",
+            params=self._params(params),
+            headers=self.headers,
+            proxy=self.configuration.proxy,
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=None),
+        ) as resp:
+            if resp.status >= 400:
+                raise self._error(resp, await resp.read())
+
+            async for line in resp.content:
+                if not line.strip():
+                    continue
+
+                data: Dict[str, Any] = json.loads(line)
+                if "error" in data:
+                    error = data["error"]
+                    exc = ApiException(error.get("httpCode"), error.get("message"))
+                    exc.body = line
+                    raise exc
+
+                yield _utils.to_model(data["result"], V1alpha1WorkflowWatchEvent)
+
+    @staticmethod
+    def _params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        if params is None:
+            return None
+
+        return {k: str(v) for k, v in params.items() if v is not None}
+
+    @staticmethod
+    def _error(resp: Any, data: bytes) -> ApiException:
+        exc = ApiException(resp.status, resp.reason)
+        exc.body = data.decode("utf-8", "replace")
+        exc.headers = resp.headers
+
+        return exc
+
+
+async def fetch(
+    url: str,
+    *,
+    client: Optional[AsyncClient] = None,
+    cache: Optional[HTTPCache] = None,
+    timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+) -> str:
+    """Fetch a remote manifest by the client, or by a new one if not given."""
+    if client is not None:
+        return await client.fetch(url, cache=cache, timeout=timeout)
+
+    async with AsyncClient() as client:
+        return await client.fetch(url, cache=cache, timeout=timeout)
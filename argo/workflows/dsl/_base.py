@@ -1,13 +1,22 @@
+import copy
 import inspect
+import io
+import pickle
 import typing
 
 from functools import partial
 from functools import wraps
 
+from pathlib import Path
+
 from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Type
 from typing import TypeVar
@@ -15,7 +24,19 @@ from typing import Union
 
 from argo.workflows.client import models
 
+from . import _aio
+from . import _http
+from . import _loader
+from . import _serializers
+from . import _utils
+from ._aio import AsyncClient
+from ._cache import BuildCache
+from ._http import HTTPCache
+from ._loader import LoadResult
+from ._serializers import Serializer
+
 T = TypeVar("T")
+R = TypeVar("R", bound="ResourceMixin")
 
 
 class SpecProxy(object):
@@ -42,18 +63,9 @@ class SpecProxy(object):
         if self._callable:
             ret: Any = spec.fget(self._obj, *args, **kwargs)
 
-            if hasattr(spec.__model__, "swagger_types"):
-                for attr, swagger_type in spec.__model__.swagger_types.items():
-                    t: Any = getattr(models, swagger_type, None)
-                    if t == type(ret):
-                        setattr(spec, attr, ret)
-                        break
-            else:
-                for attr, openapi_type in spec.__model__.openapi_types.items():
-                    t: Any = getattr(models, openapi_type, None)
-                    if t == type(ret):
-                        setattr(spec, attr, ret)
-                        break
+            attr: Optional[str] = spec.__return_types__.get(type(ret))
+            if attr is not None:
+                setattr(spec, attr, ret)
 
             spec.__init_model__(ret, *args, **kwargs)
 
@@ -75,9 +87,15 @@ class Spec(property):
 
     __model__ = T
 
+    # index of model types to the attribute of the spec model they're set to
+    __return_types__: Dict[Type[Any], str] = {}
+
     def __new__(cls, f: Callable[..., T]):
         f.__model__ = cls.__model__
 
+        if "__return_types__" not in vars(cls):
+            cls.__return_types__ = cls.__index_return_types(cls.__model__)
+
         self = super().__new__(cls, f)
         self.__callable = True
         self.__compiled_model = None
@@ -112,6 +130,22 @@ class Spec(property):
     def __init_model__(self, *args, **kwargs) -> None:
         """A hook executed before creation of a model."""
 
+    @staticmethod
+    def __index_return_types(model: Type[Any]) -> Dict[Type[Any], str]:
+        """Map model types to the first attribute of the model of that type."""
+        if hasattr(model, "swagger_types"):
+            types: Dict[str, str] = model.swagger_types
+        else:
+            types: Dict[str, str] = model.openapi_types
+
+        index: Dict[Type[Any], str] = {}
+        for attr, t in types.items():
+            klass: Any = getattr(models, t, None)
+            if klass is not None:
+                index.setdefault(klass, attr)
+
+        return index
+
     @property
     def callable(self) -> bool:
         """Return whether current spec is callable."""
@@ -199,3 +233,280 @@ class Prop(metaclass=PropMeta):
             f.__props__.update(dct)
 
         return f
+
+
+class ResourceMixin:
+    """Digests and bulk loading of Workflows, CronWorkflows and WorkflowTemplates.
+
+    DSL objects are hashed and compared by the digest of their manifests,
+    see `digest`, so that equal objects are deduplicated in sets.
+
+    NOTE: This class is not meant to be used directly.
+    """
+
+    def __hash__(self) -> int:
+        """Compute hash of the object, see `digest`.
+
+        The hash changes with the manifest, an object must not be modified
+        while it is an element of a set or a key of a dict. In-place changes
+        of nested objects are not seen until `digest(refresh=True)`.
+
+        Objects are not compiled by hashing, objects which have not been
+        compiled yet (see `compile=False`) are not hashable.
+        """
+        if self.model is None and self.spec is type(self).spec:
+            raise TypeError(
+                f"unhashable {type(self).__name__}, it has not been compiled"
+            )
+
+        return int(self.digest()[:16], 16)
+
+    def __eq__(self, other: Any) -> bool:
+        """Return whether the manifests of the objects are the same."""
+        if isinstance(other, ResourceMixin):
+            return self.digest() == other.digest()
+
+        return super().__eq__(other)
+
+    def __ne__(self, other: Any) -> bool:
+        """Return whether the manifests of the objects differ."""
+        return not self == other
+
+    def __setattr__(self, name: str, value: Any):
+        """Set attribute of the object, the digest is invalidated."""
+        super().__setattr__(name, value)
+
+        vars(self).pop("__digest__", None)
+
+    def _cached_manifest(self) -> Optional[Dict[str, Any]]:
+        """Return the manifest of the object with the compiled spec of its class.
+
+        The spec of a DSL class is compiled once, instances compiled afterwards
+        clone the cached spec, the rest of the manifest (e.g. the metadata)
+        is their own. Each instance owns its copy of the spec, see `_own_spec`.
+
+        :returns: None if the spec is not cached, or the object has its own spec
+        """
+        compiled: Optional[bytes] = vars(type(self)).get("__compiled__")
+        if compiled is None or "spec" in vars(self):
+            return None
+
+        spec: Dict[str, Any]
+        data: Dict[str, Any]
+        spec, data = pickle.loads(compiled)
+
+        self._own_spec(data)
+
+        manifest: Dict[str, Any] = {}
+        for attr in self.attribute_map:
+            if attr == "spec":
+                manifest[attr] = spec
+                continue
+
+            value: Any = getattr(self, attr)
+            manifest[attr] = (
+                value.to_dict() if hasattr(value, "to_dict") else copy.deepcopy(value)
+            )
+
+        return manifest
+
+    def _cache_manifest(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache the compiled spec of the manifest on the class, see `_cached_manifest`.
+
+        Loaded objects carry their own spec, it is not cached.
+        """
+        if self.spec is type(self).spec:
+            data: Dict[str, Any] = _utils.sanitize_for_serialization(self.spec)
+            type(self).__compiled__ = pickle.dumps(
+                (manifest["spec"], data), pickle.HIGHEST_PROTOCOL
+            )
+
+            self._own_spec(data)
+
+        return manifest
+
+    def _own_spec(self, data: Dict[str, Any]):
+        """Set the spec of the object to a copy of the compiled spec of its class.
+
+        The copy is deserialized on access, so that changes of the spec
+        of one object are not seen by the other ones, nor by the cache.
+        """
+        spec: Any = _utils.to_model(data, type(type(self).spec), lazy=True)
+
+        self.spec = spec
+        vars(self)["__cloned__"] = spec
+
+    def _pristine(self) -> bool:
+        """Return whether the object has the spec of its class, unchanged.
+
+        The spec of an object is changed once it has been accessed,
+        i.e. deserialized, see `_own_spec`.
+        """
+        spec: Any = self.spec
+        if spec is type(self).spec:
+            return True
+
+        return vars(self).get("__cloned__") is spec and (
+            _utils.lazy_data(spec) is not None
+        )
+
+    def digest(self, refresh: bool = False) -> str:
+        """Return SHA-256 digest of the manifest.
+
+        The digest is computed over the canonical JSON serialization
+        of the manifest, it is stable across processes. It is computed once
+        and cached until an attribute of the object is set (including
+        by compilation). In-place changes of nested objects, such as
+        `spec.templates`, are not tracked, use `refresh` after making them.
+
+        :param refresh: bool, whether to recompute the cached digest
+        """
+        digest: Optional[str] = vars(self).get("__digest__")
+        if digest is None or refresh:
+            digest = _serializers.digest(self)
+            vars(self)["__digest__"] = digest
+
+        return digest
+
+    def to_file(
+        self,
+        fp: Union[Path, str],
+        fmt: Optional[str] = None,
+        *,
+        cache: Optional[BuildCache] = None,
+        **kwargs,
+    ):
+        """Dumps the object to a file.
+
+        The file is replaced once the manifest is written, it is left intact
+        if the serialization fails.
+
+        :param fmt: str, name of the serializer, see `get_serializer` [default],
+            unknown names fall back to 'yaml'
+        :param cache: BuildCache, if given, the manifest of an unchanged
+            class is read from the cache instead of being compiled
+        """
+        serializer: Serializer
+        try:
+            serializer = _serializers.get_serializer(fmt)
+        except ValueError:
+            # files of unknown formats have always been dumped as YAML
+            serializer = _serializers.get_serializer("yaml")
+
+        key: Optional[str] = None
+        if cache is not None:
+            key = self._cache_key(cache, serializer.name, **kwargs)
+
+        if key is not None:
+            data: Optional[bytes] = cache.get(key)
+            if data is not None:
+                with _utils.atomic_open(fp) as f:
+                    f.write(data.decode("utf-8"))
+                return
+
+        _serializers._compiled(self)
+
+        if key is None:
+            # the manifest is emitted while walking the model, without a copy
+            with _utils.atomic_open(fp) as f:
+                serializer.dump(self, f, **kwargs)
+                f.write(serializer.end)
+
+            return
+
+        buffer = io.StringIO()
+        serializer.dump(self, buffer, **kwargs)
+        buffer.write(serializer.end)
+
+        manifest: str = buffer.getvalue()
+
+        with _utils.atomic_open(fp) as f:
+            f.write(manifest)
+        cache.put(key, manifest.encode("utf-8"))
+
+    def _cache_key(self, cache: BuildCache, fmt: str, **kwargs) -> Optional[str]:
+        """Return the key of the manifest in the build cache.
+
+        The key covers the class definition, see `BuildCache.key`, and the rest
+        of the object, e.g. its metadata. Objects with their own spec, such as
+        loaded manifests or changed copies of the class spec, are not cached.
+
+        :returns: str, or None if the manifest can not be cached
+        """
+        if not self._pristine():
+            return None
+
+        state: str = _serializers.digest(
+            {attr: getattr(self, attr) for attr in self.attribute_map if attr != "spec"}
+        )
+
+        return cache.key(type(self), fmt, state=state, **kwargs)
+
+    @classmethod
+    async def afrom_url(
+        cls: Type[R],
+        url: str,
+        validate: bool = True,
+        *,
+        lazy: bool = False,
+        client: Optional[AsyncClient] = None,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> R:
+        """Create an object from a remote file asynchronously, see `from_url`.
+
+        :param client: AsyncClient whose connections are used, requires aiohttp
+            [a new one, closed afterwards]
+        """
+        text: str = await _aio.fetch(url, client=client, cache=cache, timeout=timeout)
+
+        manifest: Dict[str, Any] = _utils.safe_load(text)
+        return cls.from_dict(manifest, validate=validate, lazy=lazy)
+
+    @classmethod
+    def from_urls(
+        cls: Type[R],
+        urls: Iterable[str],
+        validate: bool = True,
+        *,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> List[R]:
+        """Create objects from remote files, see `from_url`.
+
+        The files are fetched concurrently.
+
+        :param workers: int, number of concurrent requests [16]
+        :returns: List in order of the URLs
+        """
+        texts: List[str] = _http.fetch_all(urls, workers, cache=cache, timeout=timeout)
+
+        return [
+            cls.from_dict(_utils.safe_load(text), validate=validate, lazy=lazy)
+            for text in texts
+        ]
+
+    @classmethod
+    def load_many(
+        cls,
+        paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+        workers: Optional[int] = None,
+        *,
+        validate: bool = True,
+        chunksize: Optional[int] = None,
+    ) -> Iterator[LoadResult]:
+        """Load objects from many files in a process pool.
+
+        Files are loaded by `from_file`, results are yielded as the files
+        are loaded and failures are reported in the results.
+
+        :param paths_or_glob: file path(s), directories or glob patterns
+        :param workers: int, number of worker processes [os.cpu_count()]
+        :param chunksize: int, number of files loaded by a worker at once [auto]
+        :returns: Iterator[LoadResult]
+        """
+        return _loader.load_many(
+            cls, paths_or_glob, workers, validate=validate, chunksize=chunksize
+        )
@@ -0,0 +1,272 @@
+"""On-disk build cache of compiled manifests."""
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import logging
+import os
+import sys
+import sysconfig
+import yaml
+
+from contextlib import suppress
+
+from pathlib import Path
+
+from types import ModuleType
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from argo.workflows import client
+
+from . import _utils
+from .__about__ import __version__
+
+__all__ = ["BuildCache"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+def _default_cache_dir() -> Path:
+    cache_dir: Optional[str] = os.getenv("ARGO_DSL_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache", "argo-dsl")
+
+
+# the standard library and installed packages
+_LIBRARY_PATHS: Tuple[str, ...] = tuple(
+    {
+        os.path.realpath(sysconfig.get_paths()[name])
+        for name in ("stdlib", "platstdlib", "purelib", "platlib")
+    }
+)
+
+
+def _is_library_class(klass: Type[Any]) -> bool:
+    return klass.__module__ == "builtins" or klass.__module__.startswith(
+        ("argo.workflows.dsl.", "argo.workflows.client.")
+    )
+
+
+def _is_library_module(module: ModuleType) -> bool:
+    if module.__name__.startswith(("argo.workflows.dsl", "argo.workflows.client")):
+        return True
+
+    path: Optional[str] = getattr(module, "__file__", None)
+    if path is None:
+        return True  # builtin
+
+    return os.path.realpath(path).startswith(_LIBRARY_PATHS)
+
+
+def _imported_modules(module: ModuleType) -> List[ModuleType]:
+    """Return modules the module imports, or imports names from."""
+    package: Optional[str] = getattr(module, "__package__", None)
+
+    names: List[str] = []
+    for node in ast.walk(ast.parse(inspect.getsource(module))):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                if not package:
+                    continue
+                base = "." * node.level + (node.module or "")
+                name = importlib.util.resolve_name(base, package)
+            else:
+                name = node.module or ""
+
+            names.append(name)
+            # submodules imported from packages
+            names.extend(f"{name}.{alias.name}" for alias in node.names)
+
+    modules: Dict[str, ModuleType] = {}
+    for name in names:
+        imported: Optional[ModuleType] = sys.modules.get(name)
+        if imported is not None and imported is not module:
+            modules[name] = imported
+
+    return list(modules.values())
+
+
+class BuildCache:
+    """Content-addressed on-disk cache of compiled manifests.
+
+    A manifest is keyed by a digest of the source of its DSL class (including
+    closures, scopes and decorator arguments), the module level code
+    of the module the class is defined in (imports, constants, helpers),
+    the source of the modules it imports (transitively, except for
+    the standard library and installed packages), the state of the instance
+    outside of the class definition (e.g. the metadata), the dump options
+    and versions of the DSL, the client and PyYAML.
+
+    Entries are replaced atomically, so that a cache directory can be shared
+    by concurrent writers. When the cache grows over `max_size` bytes,
+    the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, Path]] = None, max_size: int = 256 * 1024 ** 2
+    ):
+        """Create a cache in `path` [$ARGO_DSL_CACHE_DIR or ~/.cache/argo-dsl].
+
+        :param max_size: int, maximum size of the cache in bytes [256 MiB]
+        """
+        self.path = Path(path) if path is not None else _default_cache_dir()
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._written = 0
+        self._module_digests: Dict[str, str] = {}
+        self._imports_digests: Dict[str, str] = {}
+
+    def key(
+        self, klass: Type[Any], fmt: str = "yaml", *, state: str = "", **kwargs
+    ) -> Optional[str]:
+        """Return the cache key of a DSL class.
+
+        :param state: str, digest of the state of an instance which is not
+            defined by its class, e.g. the metadata
+        :returns: str, or None if the source of the class is not available
+        """
+        digest = hashlib.sha256()
+
+        parts: List[str] = [
+            __version__,
+            client.__version__,
+            yaml.__version__,
+            fmt,
+            state,
+            repr(sorted(kwargs.items())),
+        ]
+
+        try:
+            for base in klass.__mro__:
+                if _is_library_class(base):
+                    continue
+
+                parts.extend(
+                    [
+                        f"{base.__module__}.{base.__qualname__}",
+                        inspect.getsource(base),
+                        self._module_digest(base.__module__),
+                        self._imports_digest(base.__module__),
+                    ]
+                )
+        except (ImportError, OSError, TypeError) as exc:
+            _LOGGER.debug("Class %r can not be cached: %s", klass, exc)
+            return None
+
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached manifest, None if it is not cached."""
+        entry: Path = self._entry(key)
+
+        try:
+            data: bytes = entry.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        with suppress(OSError):
+            # mark as recently used
+            os.utime(str(entry))
+
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store the manifest in the cache."""
+        entry: Path = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        # atomic, concurrent readers see either the old or the new entry
+        with _utils.atomic_open(entry, mode="wb") as f:
+            f.write(data)
+
+        self._written += len(data)
+        if self._written > self.max_size // 10:
+            self.evict()
+
+    def evict(self):
+        """Evict the least recently used entries over the size limit."""
+        self._written = 0
+
+        _utils.evict(self.path.glob("*/*"), self.max_size)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for entry in self.path.glob("*/*"):
+            with suppress(FileNotFoundError):
+                entry.unlink()
+
+    def _entry(self, key: str) -> Path:
+        return self.path / key[:2] / key
+
+    def _module_digest(self, module_name: str) -> str:
+        """Return digest of module level code, excluding DSL classes."""
+        if module_name in self._module_digests:
+            return self._module_digests[module_name]
+
+        module = sys.modules[module_name]
+        tree = ast.parse(inspect.getsource(module))
+
+        digest = hashlib.sha256()
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                obj: Any = getattr(module, node.name, None)
+                if hasattr(obj, "__compile_deferred__"):
+                    # DSL classes are keyed by their own source
+                    continue
+
+            digest.update(ast.dump(node).encode("utf-8"))
+
+        self._module_digests[module_name] = digest.hexdigest()
+
+        return self._module_digests[module_name]
+
+    def _imports_digest(self, module_name: str) -> str:
+        """Return digest of the source of modules imported by the module."""
+        if module_name in self._imports_digests:
+            return self._imports_digests[module_name]
+
+        module = sys.modules[module_name]
+
+        seen: Set[str] = {module_name}
+        stack: List[ModuleType] = [module]
+        sources: Dict[str, str] = {}
+
+        while stack:
+            for imported in _imported_modules(stack.pop()):
+                if imported.__name__ in seen or _is_library_module(imported):
+                    continue
+
+                seen.add(imported.__name__)
+                sources[imported.__name__] = inspect.getsource(imported)
+                stack.append(imported)
+
+        digest = hashlib.sha256()
+        for name in sorted(sources):
+            digest.update(f"{name}\0{sources[name]}\0".encode("utf-8"))
+
+        self._imports_digests[module_name] = digest.hexdigest()
+
+        return self._imports_digests[module_name]
@@ -0,0 +1,285 @@
+"""Bulk compilation of DSL classes into manifests."""
+
+import contextlib
+import importlib
+import importlib.util
+import inspect
+import logging
+import pkgutil
+import sys
+import time
+import traceback
+
+from collections import Counter
+
+from concurrent.futures import ProcessPoolExecutor
+
+from inflection import dasherize
+from inflection import underscore
+
+from pathlib import Path
+
+from types import ModuleType
+
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from . import _utils
+from ._cache import BuildCache
+from ._cronworkflow import CronWorkflow
+from ._serializers import get_serializer
+from ._workflow import Workflow
+from ._workflow_template import ClusterWorkflowTemplate
+from ._workflow_template import WorkflowTemplate
+
+__all__ = ["compile_all", "CompileResult"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_BASE_CLASSES = (Workflow, CronWorkflow, WorkflowTemplate, ClusterWorkflowTemplate)
+
+
+class CompileResult(NamedTuple):
+    """Result of compilation of a single DSL class."""
+
+    module: str
+    name: Optional[str]  # None if the module itself failed to import
+    path: Optional[Path]
+    duration: float
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the class has been compiled successfully."""
+        return self.error is None
+
+
+def _resolve(
+    package_or_paths: Union[str, Path, Iterable[Union[str, Path]]]
+) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Resolve packages and paths into module names and file paths.
+
+    :returns: List[Tuple[str, Tuple[str, ...]]], the sources and their
+        module paths, relative to the given directories
+    """
+    if isinstance(package_or_paths, (str, Path)):
+        package_or_paths = [package_or_paths]
+
+    sources: List[Tuple[str, Tuple[str, ...]]] = []
+    for source in package_or_paths:
+        path = Path(source)
+
+        if path.is_dir():
+            # classes of packages are defined in their modules
+            sources.extend(
+                (str(p), p.relative_to(path).with_suffix("").parts)
+                for p in sorted(path.rglob("*.py"))
+                if p.name != "__init__.py"
+            )
+        elif path.suffix == ".py":
+            sources.append((str(path), (path.stem,)))
+        else:
+            package: ModuleType = importlib.import_module(str(source))
+            sources.append((package.__name__, tuple(package.__name__.split("."))))
+
+            for info in pkgutil.walk_packages(
+                getattr(package, "__path__", []), prefix=f"{package.__name__}."
+            ):
+                sources.append((info.name, tuple(info.name.split("."))))
+
+    return sources
+
+
+def _package_root(path: Path) -> Tuple[Path, Tuple[str, ...]]:
+    """Return the directory the script is imported from and its module path.
+
+    Modules of packages are imported from the directory of the top-level
+    package, by the name of the module, so that their relative imports work.
+    """
+    parts: List[str] = [path.stem]
+
+    root: Path = path.parent
+    while (root / "__init__.py").exists():
+        parts.insert(0, root.name)
+        root = root.parent
+
+    return root, tuple(parts)
+
+
+@contextlib.contextmanager
+def _search_path(source: str) -> Iterator[None]:
+    """Prepend the directory of the script to `sys.path`, as `python <script>` does.
+
+    Modules given by their names are imported from `sys.path` as it is.
+    """
+    if not source.endswith(".py"):
+        yield
+        return
+
+    root, _ = _package_root(Path(source).resolve())
+
+    entry = str(root)
+    sys.path.insert(0, entry)
+    try:
+        yield
+    finally:
+        with contextlib.suppress(ValueError):
+            sys.path.remove(entry)
+
+
+def _import(source: str) -> ModuleType:
+    """Import a module given by its name or a file path, see `_search_path`."""
+    if not source.endswith(".py"):
+        return importlib.import_module(source)
+
+    path = Path(source).resolve()
+
+    _, parts = _package_root(path)
+    if len(parts) > 1:
+        return importlib.import_module(".".join(parts))
+
+    name = "_argo_dsl_" + underscore(path.stem).replace("-", "_")
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def _discover(module: ModuleType) -> List[Type[Workflow]]:
+    """Return DSL classes defined in a module."""
+    return [
+        obj
+        for obj in vars(module).values()
+        if inspect.isclass(obj)
+        and issubclass(obj, _BASE_CLASSES)
+        and obj not in _BASE_CLASSES
+        and obj.__module__ == module.__name__
+    ]
+
+
+def _compile_module(
+    args: Tuple[str, Tuple[str, ...], Optional[str], str, Optional[BuildCache]]
+) -> List[CompileResult]:
+    """Compile all DSL classes of a module and write the manifests."""
+    source, module_path, output, fmt, cache = args
+
+    # sibling modules are imported when the script is, and by its classes
+    with _search_path(source):
+        start = time.perf_counter()
+        try:
+            # defer compilation to instantiation so that it is timed per class
+            with _utils.deferred_compilation():
+                module = _import(source)
+        except Exception:
+            duration = time.perf_counter() - start
+            error = traceback.format_exc()
+            return [CompileResult(source, None, None, duration, error)]
+
+        if output is None:
+            out_dir = Path(getattr(module, "__file__", None) or ".").parent
+        else:
+            out_dir = Path(output).joinpath(*module_path)
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+        extension: str = get_serializer(fmt).extension
+
+        results: List[CompileResult] = []
+        for klass in _discover(module):
+            path = out_dir / f"{dasherize(underscore(klass.__name__))}.{extension}"
+
+            hits: int = cache.hits if cache is not None else 0
+
+            start = time.perf_counter()
+            try:
+                # compiled by `to_file` unless found in the cache
+                klass(compile=False).to_file(path, fmt=fmt, cache=cache)
+            except Exception:
+                path, error = None, traceback.format_exc()
+            else:
+                error = None
+
+            duration = time.perf_counter() - start
+            cached: bool = cache is not None and cache.hits > hits
+
+            results.append(
+                CompileResult(source, klass.__name__, path, duration, error, cached)
+            )
+
+        return results
+
+
+def compile_all(
+    package_or_paths: Union[str, Path, Iterable[Union[str, Path]]],
+    workers: Optional[int] = None,
+    *,
+    output: Optional[Union[str, Path]] = None,
+    fmt: str = "yaml",
+    cache: Optional[BuildCache] = None,
+) -> List[CompileResult]:
+    """Compile DSL classes of packages or scripts and write their manifests.
+
+    Every Workflow, CronWorkflow, WorkflowTemplate and ClusterWorkflowTemplate
+    subclass defined in the given modules is compiled in a process pool
+    and dumped to `<output>/<module path>/<class-name>.<fmt>`, where the
+    module path is relative to the given directory or package, e.g.
+    `manifests/my_workflows/etl/hello-world.yaml`. If `output` is not given,
+    manifests are written next to the module they are defined in.
+
+    Failures do not abort the batch, they're reported in the results.
+    Classes written to the same path overwrite each other, they are all
+    reported as failed.
+
+    With a `cache`, manifests of unchanged classes are copied from the cache
+    without being compiled.
+
+    :param package_or_paths: package name(s), script path(s) or directories
+    :param workers: int, number of worker processes [os.cpu_count()]
+    :param output: directory to write the manifests to
+    :param fmt: str, name of the serializer, e.g. 'yaml' or 'json'
+    :param cache: BuildCache, cache of compiled manifests
+    :returns: List[CompileResult], results in order of discovery
+    """
+    if output is not None:
+        Path(output).mkdir(parents=True, exist_ok=True)
+        output = str(output)
+
+    sources: List[Tuple[str, Tuple[str, ...]]] = _resolve(package_or_paths)
+
+    results: List[CompileResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = [(source, path, output, fmt, cache) for source, path in sources]
+        for module_results in executor.map(_compile_module, tasks):
+            results.extend(module_results)
+
+    # e.g. classes of the same name in scripts of the same name
+    paths = Counter(r.path for r in results if r.path is not None)
+    for i, r in enumerate(results):
+        if r.path is not None and paths[r.path] > 1:
+            error = f"{r.path} is written by {paths[r.path]} classes"
+            results[i] = r._replace(path=None, error=error)
+
+    if cache is not None:
+        cache.evict()
+
+    failed = [r for r in results if not r.ok]
+    _LOGGER.info(
+        "Compiled %d DSL classes from %d modules (%d cached), %d failed.",
+        len(results) - len(failed),
+        len(sources),
+        sum(r.cached for r in results),
+        len(failed),
+    )
+
+    return results
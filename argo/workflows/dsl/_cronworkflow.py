@@ -1,8 +1,7 @@
-import inspect
+import copy
 import json
 import logging
-import requests
-import yaml
+import textwrap
 
 from abc import ABCMeta
 from inflection import camelize
@@ -14,7 +13,6 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
-from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
@@ -31,9 +29,18 @@ from argo.workflows.client.models import V1alpha1WorkflowSpec
 from argo.workflows.client.models import V1alpha1CronWorkflow
 from argo.workflows.client.models import V1alpha1CronWorkflowSpec
 from argo.workflows.client.models import V1ObjectMeta
-from argo.workflows.client.models import V1alpha1CreateCronWorkflowRequest
 
+from ._base import ResourceMixin
+from . import _http
+from . import _registry
+from . import _retry
 from . import _utils
+from ._aio import AsyncClient
+from ._http import HTTPCache
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+from ._serializers import get_serializer
+from ._serializers import get_yaml_serializer
 
 __all__ = ["CronWorkflow"]
 
@@ -79,10 +86,30 @@ class CronWorkflowMeta(ABCMeta):
             # No need to initialize any further
             return klass
 
-        cls.__compile(klass, name, bases, props)
+        if "lazy" in kwargs:
+            klass.__lazy__ = kwargs["lazy"]
+
+        lazy: Optional[bool] = klass.__lazy__
+        if lazy is None:
+            lazy = _utils.lazy_compilation()
+
+        if lazy:
+            # defer compilation until the class is used for the first time
+            klass.__deferred__ = (name, bases, props)
+        else:
+            cls.__compile(klass, name, bases, props)
 
         return klass
 
+    def __compile_deferred__(klass: Type["CronWorkflow"]) -> None:
+        """Compile the class if its compilation has been deferred."""
+        deferred: Optional[Tuple[Any, ...]] = vars(klass).get("__deferred__")
+        if deferred is None:
+            return
+
+        del klass.__deferred__
+        type(klass).__compile(klass, *deferred)
+
     @classmethod
     def __compile(
         cls,
@@ -156,69 +183,39 @@ class CronWorkflowMeta(ABCMeta):
             # nothing to do
             return template
 
-        script: List[str] = [f"class {scope}:\n"]
-        script.append(f'    """Scoped objects injected from scope \'{scope}\'."""\n\n')
+        script: List[str] = [
+            f"class {scope}:\n"
+            f'    """Scoped objects injected from scope \'{scope}\'."""\n\n'
+        ]
 
         scoped_objects = scopes.get(scope) or []
         for so in scoped_objects:
-            source, _ = inspect.getsourcelines(so.__get__(cls).__code__)
+            source: Tuple[str, ...] = _utils.getsourcelines(so.__get__(cls).__code__)
 
             for co_start, line in enumerate(source):
                 if line.strip().startswith("def"):
                     break
 
-            source = ["    @staticmethod\n"] + source[co_start:] + ["\n"]
-            script.extend(source)
-
-        script = script + [
-            "\n",
-            *template.script.source.splitlines(keepends=True),
-        ]
+            # re-indent to the scope class, whatever the nesting of the DSL class
+            body: str = textwrap.dedent("".join(source[co_start:]))
+            script.append(f"    @staticmethod\n{textwrap.indent(body, '    ')}\n")
 
-        import_lines: List[str] = []
-        source_lines: List[str] = []
-
-        import_in_previous_line = False
-        for line in script:
-            if "import " in line:
-                import_lines.append(line.strip(" "))
-                import_in_previous_line = True
-            else:
-                is_blankline = not bool(line.strip())
-                if import_in_previous_line and is_blankline:
-                    # blank line separating imports
-                    pass
-                else:
-                    source_lines.append(line)
-
-                import_in_previous_line = False
-
-        # split `imports` and `from` and sort them separately
-        import_lines_with_from: Set[str] = set()
-        import_lines_without_from: Set[str] = set()
-
-        for line in import_lines:
-            if "from " in line:
-                import_lines_with_from.add(line)
-            else:
-                import_lines_without_from.add(line)
-
-        import_lines = [
-            *sorted(import_lines_without_from),
-            "\n",
-            *sorted(import_lines_with_from),
-        ]
+        script.append("\n" + template.script.source)
 
-        template.script.source = "".join((*import_lines, "\n", *source_lines))
+        template.script.source = _utils.hoist_imports(*script)
 
         return template
 
 
-class CronWorkflow(metaclass=CronWorkflowMeta):
+class CronWorkflow(ResourceMixin, metaclass=CronWorkflowMeta):
     """Base class for Workflows."""
 
     __model__ = V1alpha1CronWorkflow
 
+    # whether compilation of subclasses is deferred until their first use,
+    # None stands for the default given by `_utils.lazy_compilation`
+    __lazy__: Optional[bool] = None
+
     def __init__(self, compile=True):
         """CronWorkflow is the definition of a workflow resource.
 
@@ -230,13 +227,12 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
         self.__compiled_model: Union[V1alpha1CronWorkflow, None] = None
         self.__validated = False
 
+        # the metadata of the class is shared, each instance owns a copy
+        self.metadata = copy.deepcopy(type(self).metadata)
+
         if compile:
             self.compile()
 
-    def __hash__(self) -> str:
-        """Compute hash of this CronWorkflow."""
-        return self.to_str().__hash__()
-
     @property
     def model(self) -> Union[V1alpha1CronWorkflow, None]:
         """Return the CronWorkflow model.
@@ -263,56 +259,83 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
         """Set CronWorkflow name."""
         self.metadata.name = name
 
+        vars(self).pop("__digest__", None)
+
     @property
     def validated(self) -> bool:
         """Return whether this workflow has been validated."""
         return self.__validated
 
     @classmethod
-    def from_file(cls, fp: Union[str, Path], validate: bool = True) -> "CronWorkflow":
-        """Create a CronWorkflow from a file."""
+    def from_file(
+        cls, fp: Union[str, Path], validate: bool = True, *, lazy: bool = False
+    ) -> "CronWorkflow":
+        """Create a CronWorkflow from a file, see `from_dict`."""
         wf_path = Path(fp)
 
-        wf: Dict[str, Any] = yaml.safe_load(wf_path.read_text())
-        return cls.from_dict(wf, validate=validate)
+        wf: Dict[str, Any] = _utils.safe_load(wf_path.read_text())
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_url(cls, url: str, validate: bool = True) -> "CronWorkflow":
-        """Create a CronWorkflow from a remote file."""
-        resp = requests.get(url)
-        resp.raise_for_status()
+    def from_url(
+        cls,
+        url: str,
+        validate: bool = True,
+        *,
+        lazy: bool = False,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> "CronWorkflow":
+        """Create a CronWorkflow from a remote file, see `from_dict`.
+
+        Connections to the server are kept alive and reused, cached
+        manifests are revalidated by conditional requests, see `HTTPCache`.
 
-        wf: Dict[str, Any] = yaml.safe_load(resp.text)
-        return cls.from_dict(wf, validate=validate)
+        :param cache: HTTPCache, cache of the manifests [64 entries, in memory]
+        :param timeout: float, seconds to wait for the server to respond [60]
+        """
+        text: str = _http.fetch(url, cache=cache, timeout=timeout)
+
+        wf: Dict[str, Any] = _utils.safe_load(text)
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_dict(cls, wf: Dict[str, Any], validate: bool = True) -> "CronWorkflow":
-        """Create a CronWorkflow from a dict."""
+    def from_dict(
+        cls, wf: Dict[str, Any], validate: bool = True, *, lazy: bool = False
+    ) -> "CronWorkflow":
+        """Create a CronWorkflow from a dict.
+
+        :param validate: bool, whether to deserialize the manifest into models,
+            otherwise the attributes are left as dicts
+        :param lazy: bool, whether to defer deserialization (and validation)
+            of nested models until they're accessed for the first time,
+            the dict must not be modified until then
+        """
         # work around validation issues and allow empty status
-        wf["status"] = wf.get("status", {}) or {}
+        wf = {**wf, "status": wf.get("status", {}) or {}}
 
-        return cls.from_string(json.dumps(wf), validate=validate)
+        return cls.__deserialize(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_string(cls, wf: str, validate: bool = True) -> "CronWorkflow":
-        """Create a CronWorkflow from a YAML string."""
-        body = {"data": wf}
-
-        return cls.__deserialize(body, validate=validate)
+    def from_string(
+        cls, wf: str, validate: bool = True, *, lazy: bool = False
+    ) -> "CronWorkflow":
+        """Create a CronWorkflow from a JSON string, see `from_dict`."""
+        return cls.__deserialize(json.loads(wf), validate=validate, lazy=lazy)
 
     @classmethod
-    def __deserialize(cls, body: Dict[str, str], *, validate: bool) -> "CronWorkflow":
-        """Deserialize given object into a CronWorkflow instance."""
+    def __deserialize(
+        cls, manifest: Dict[str, Any], *, validate: bool, lazy: bool = False
+    ) -> "CronWorkflow":
+        """Deserialize given manifest into a CronWorkflow instance."""
         wf: Union[V1alpha1CronWorkflow, Dict[str, Any]]
         if validate:
-            attr = type("Response", (), body)
-
-            wf = ApiClient().deserialize(attr, cls.__model__)
+            wf = _utils.to_model(manifest, cls.__model__, lazy=lazy)
         else:
             _LOGGER.warning(
                 "Validation is turned off. This may result in missing or invalid attributes."
             )
-            wf = json.loads(body["data"])
+            wf = copy.deepcopy(manifest)
 
         self = cls(compile=False)
 
@@ -336,6 +359,16 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
         if self.model is not None:
             return self.model
 
+        type(self).__compile_deferred__()
+
+        manifest: Optional[Dict[str, Any]] = self._cached_manifest()
+        if manifest is not None:
+            # the spec of the class has been compiled by another instance
+            self.model = CronWorkflow.__model__(**manifest)
+            self.__validated = True
+
+            return self.model
+
         def _compile(obj: Any):
             if hasattr(obj, "__model__"):
                 if not hasattr(obj, "model"):
@@ -377,7 +410,9 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
             return obj
 
         self.spec = _compile(self.spec)
-        self.model = CronWorkflow.__model__(**self.to_dict(omitempty=False))
+
+        manifest = self._cache_manifest(self.to_dict(omitempty=False))
+        self.model = CronWorkflow.__model__(**manifest)
 
         self.__validated = True
 
@@ -389,34 +424,82 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
         namespace: str,
         *,
         parameters: Optional[Dict[str, str]] = None,
+        service: Optional[CronWorkflowServiceApi] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
     ) -> V1alpha1CronWorkflow:
         """Submit an Argo CronWorkflow to a given namespace.
 
+        With a `retry` policy, the manifest is labeled by an idempotency key
+        and a retried submission returns the CronWorkflow created by a failed
+        attempt, if any, instead of creating a duplicate.
+
+        The parameters are not set on the CronWorkflow, so that instances
+        of the same class, sharing the spec, may be submitted concurrently.
+
+        :param service: CronWorkflowServiceApi, shared by batch submissions,
+            see `submit_many` [created for the client]
+        :param retry: RetryPolicy, retries of failed submissions [no retries]
+        :param limiter: RateLimiter, shared by rate-limited submissions
+        :returns: V1alpha1CronWorkflow, submitted CronWorkflow
+        """
+        body: Dict[str, Any] = self.__manifest(parameters)
+
+        if service is None:
+            service = CronWorkflowServiceApi(api_client=client)
+
+        def create() -> V1alpha1CronWorkflow:
+            request = V1alpha1CreateCronWorkflowRequest(cron_workflow=body)
+            return service.create_cron_workflow(namespace, request)
+
+        def list_(selector: str) -> List[V1alpha1CronWorkflow]:
+            return service.list_cron_workflows(
+                namespace, list_options_label_selector=selector
+            ).items
+
+        # submit the workflow
+        created: V1alpha1CronWorkflow = _retry.call_idempotent(
+            body, create, list_, retry=retry, limiter=limiter
+        )
+
+        # return the computed CronWorkflow
+        return created
+
+    async def asubmit(
+        self,
+        client: AsyncClient,
+        namespace: str,
+        *,
+        parameters: Optional[Dict[str, str]] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> V1alpha1CronWorkflow:
+        """Submit an Argo CronWorkflow asynchronously, see `submit`.
+
+        :param client: AsyncClient, requires aiohttp
         :returns: V1alpha1CronWorkflow, submitted CronWorkflow
         """
-        parameters = parameters or {}
-
-        new_parameters: List[V1alpha1Parameter] = []
-        for name, value in parameters.items():
-            param = V1alpha1Parameter(name=name, value=value)
-            new_parameters.append(param)
-
-        if getattr(self.spec.workflow_spec, "arguments"):
-            for p in getattr(self.spec.workflow_spec.arguments, "parameters", []):
-                if p.name in parameters:
-                    continue  # overridden
-                elif not getattr(p, "value"):
-                    default = getattr(p, "default")
-                    if default is not None:
-                        p.value = default
-                    else:
-                        raise Exception(f"Missing required workflow parameter {p.name}")
-
-                new_parameters.append(p)
-
-            self.spec.arguments.parameters = new_parameters
-        elif parameters:
-            raise AttributeError("The CronWorkflow doesn't take any parameters.")
+        body: Dict[str, Any] = self.__manifest(parameters)
+
+        async def create() -> V1alpha1CronWorkflow:
+            return await client.create_cron_workflow(namespace, body)
+
+        async def list_(selector: str) -> List[V1alpha1CronWorkflow]:
+            found = await client.list_cron_workflows(namespace, label_selector=selector)
+            return found.items
+
+        return await _retry.acall_idempotent(
+            body, create, list_, retry=retry, limiter=limiter
+        )
+
+    def __manifest(self, parameters: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """Return the manifest to submit, with the parameters.
+
+        The parameters are patched into the serialized manifest, the CronWorkflow
+        is not modified, its spec may be shared by concurrent submissions
+        of instances of the same class.
+        """
+        type(self).__compile_deferred__()
 
         body: Dict[str, Any]
         if not getattr(self, "validated", True):
@@ -426,45 +509,57 @@ class CronWorkflow(metaclass=CronWorkflowMeta):
             )
             body = camelize(self.to_dict())
         else:
-            body = client.sanitize_for_serialization(self)
+            body = _utils.sanitize_for_serialization(self)
 
-        service = CronWorkflowServiceApi(api_client=client)
-        # submit the workflow
-        created: V1alpha1CronWorkflow = service.create_cron_workflow(
-            namespace, V1alpha1CreateCronWorkflowRequest(
-                cron_workflow=body))
+        spec: Dict[str, Any] = dict(body.get("spec") or {})
+        workflow_spec: Dict[str, Any] = dict(spec.get("workflowSpec") or {})
+        arguments: Optional[Dict[str, Any]] = workflow_spec.get("arguments")
 
-        # return the computed CronWorkflow
-        return created
+        if not arguments:
+            if parameters:
+                raise AttributeError("The CronWorkflow doesn't take any parameters.")
+            return body
 
-    def to_file(self, fp: Union[Path, str], fmt="yaml", **kwargs):
-        """Dumps the CronWorkflow to a file."""
-        d: Dict[str, Any] = _utils.sanitize_for_serialization(self)
+        declared: List[Dict[str, Any]] = list(arguments.get("parameters") or [])
+        workflow_spec["arguments"] = {
+            **arguments,
+            "parameters": _registry.parameters(declared, parameters or {}),
+        }
 
-        opts = kwargs
+        return {**body, "spec": {**spec, "workflowSpec": workflow_spec}}
 
-        if fmt == "json":
-            Path(fp).write_text(json.dumps(d, **opts))
-        else:
-            Path(fp).write_text(
-                yaml.dump(d, Dumper=_utils.BlockDumper, **opts) + "\n")
+    def to_yaml(
+        self, omitempty=True, serializer: Optional[str] = None, **kwargs
+    ) -> str:
+        """Returns the CronWorkflow manifest as a YAML.
 
-    def to_yaml(self, omitempty=True, **kwargs) -> str:
-        """Returns the CronWorkflow manifest as a YAML."""
+        :param serializer: str, name of a YAML serializer, see `get_serializer`
+            [default, if it is a YAML serializer, otherwise 'yaml']
+        :raises: ValueError if the serializer does not emit YAML
+        """
         d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
 
-        opts = dict(default_flow_style=False)
-        opts.update(kwargs)
-
-        serialized = yaml.dump(d, Dumper=_utils.BlockDumper, **opts)
+        serialized = get_yaml_serializer(serializer).dumps(d, **kwargs)
 
         return serialized
 
+    def dumps(self, fmt: Optional[str] = None, omitempty=True, **kwargs) -> str:
+        """Returns the CronWorkflow manifest serialized, e.g. as a JSON.
+
+        :param fmt: str, name of the serializer, see `get_serializer` [default]
+        :raises: ValueError if there is no such serializer
+        """
+        d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
+
+        return get_serializer(fmt).dumps(d, **kwargs)
+
     def to_dict(self, omitempty=True) -> Dict[str, Any]:
         """Returns the CronWorkflow manifest as a dict.
 
         :param omitempty: bool, whether to omit empty values
         """
+        type(self).__compile_deferred__()
+
         result = V1alpha1CronWorkflow.to_dict(self)
 
         if omitempty:
@@ -0,0 +1,286 @@
+"""Fetching of remote manifests."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import requests
+
+from collections import OrderedDict
+
+from concurrent.futures import ThreadPoolExecutor
+
+from contextlib import suppress
+
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from . import _utils
+
+__all__ = ["fetch", "fetch_all", "HTTPCache"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# seconds to wait for the server to respond
+DEFAULT_TIMEOUT = 60.0
+
+# connections kept alive per host, see `fetch_all`
+_POOL_SIZE = 16
+
+__session: Optional[requests.Session] = None
+__session_lock = threading.Lock()
+
+
+class _Entry(NamedTuple):
+    """Cached response."""
+
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class HTTPCache:
+    """Cache of fetched manifests.
+
+    Cached manifests are revalidated by conditional requests (using ETag
+    and Last-Modified headers of the responses), the server then responds
+    with 304 Not Modified instead of sending the manifest again.
+    Within `ttl` seconds after being fetched, manifests are not revalidated.
+
+    Entries are kept in memory and, if `path` is given, on disk, so that
+    they're shared by processes. Entries on disk are replaced atomically.
+    At most `max_entries` entries are kept in memory, the least recently
+    used ones are evicted (and read from disk again when needed). When
+    the cache on disk grows over `max_size` bytes, the least recently
+    used entries are evicted from it, see `BuildCache`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = 0,
+        max_entries: int = 256,
+        max_size: int = 64 * 1024 ** 2,
+    ):
+        """Create a cache, in memory only unless `path` is given.
+
+        :param path: directory of the on-disk cache
+        :param ttl: float, seconds during which entries are used as they are [0]
+        :param max_entries: int, maximum number of entries kept in memory [256]
+        :param max_size: int, maximum size of the cache on disk in bytes [64 MiB]
+        """
+        self.path = Path(path).expanduser() if path is not None else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._written = 0
+
+    def get(self, url: str) -> Optional[_Entry]:
+        """Return the cached response, None if it is not cached."""
+        with self._lock:
+            entry: Optional[_Entry] = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+
+        if entry is not None or self.path is None:
+            return entry
+
+        path: Path = self._entry(url)
+        try:
+            data: Dict[str, Any] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        with suppress(OSError):
+            # mark as recently used
+            os.utime(str(path))
+
+        entry = _Entry(**data)
+        self._remember(url, entry)
+
+        return entry
+
+    def put(self, url: str, entry: _Entry):
+        """Store the response in the cache."""
+        self._remember(url, entry)
+
+        if self.path is None:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        data: bytes = json.dumps(entry._asdict()).encode("utf-8")
+
+        # atomic, concurrent readers see either the old or the new entry
+        with _utils.atomic_open(self._entry(url), mode="wb") as f:
+            f.write(data)
+
+        with self._lock:
+            self._written += len(data)
+            evict: bool = self._written > self.max_size // 10
+
+        if evict:
+            self.evict()
+
+    def is_fresh(self, entry: _Entry) -> bool:
+        """Return whether the entry can be used without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def evict(self):
+        """Evict the least recently used entries on disk over the size limit."""
+        with self._lock:
+            self._written = 0
+
+        if self.path is not None:
+            # entries and the temporary files of their writers
+            _utils.evict(self.path.glob("*.json*"), self.max_size)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+        if self.path is not None:
+            for entry in self.path.glob("*.json"):
+                with suppress(FileNotFoundError):
+                    entry.unlink()
+
+    def _remember(self, url: str, entry: _Entry):
+        """Keep the entry in memory, evicting the least recently used ones."""
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _entry(self, url: str) -> Path:
+        return self.path / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+# responses are revalidated by default, but not stored on disk
+__cache = HTTPCache(max_entries=64)
+
+
+def default_cache(cache: Optional[HTTPCache] = None) -> HTTPCache:
+    """Return the given cache or the default one, of 64 entries in memory."""
+    return cache if cache is not None else __cache
+
+
+def session() -> requests.Session:
+    """Return the HTTP session shared by all threads.
+
+    Connections to the servers are kept alive and reused by the session.
+    """
+    global __session
+
+    if __session is None:
+        with __session_lock:
+            if __session is None:
+                s = requests.Session()
+
+                adapter = HTTPAdapter(
+                    pool_connections=_POOL_SIZE, pool_maxsize=_POOL_SIZE
+                )
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+
+                __session = s
+
+    return __session
+
+
+def conditional_headers(entry: Optional[_Entry]) -> Dict[str, str]:
+    """Return headers of a request revalidating the cached response."""
+    headers: Dict[str, str] = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    return headers
+
+
+def revalidated(cache: HTTPCache, url: str, entry: _Entry) -> str:
+    """Refresh the cached response, the server responded with 304."""
+    _LOGGER.debug("Not modified: %s", url)
+    cache.put(url, entry._replace(fetched_at=time.time()))
+
+    return entry.text
+
+
+def store(cache: HTTPCache, url: str, text: str, headers: Mapping[str, str]) -> str:
+    """Store the fetched manifest in the cache if it can be revalidated."""
+    etag: Optional[str] = headers.get("ETag")
+    last_modified: Optional[str] = headers.get("Last-Modified")
+
+    if etag or last_modified or cache.ttl > 0:
+        cache.put(url, _Entry(text, etag, last_modified, time.time()))
+
+    return text
+
+
+def fetch(
+    url: str,
+    *,
+    cache: Optional[HTTPCache] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> str:
+    """Fetch a remote manifest.
+
+    :param cache: HTTPCache, cache of the manifests [64 entries, in memory]
+    :param timeout: float, seconds to wait for the server to respond [60]
+    :returns: str, the manifest
+    :raises: requests.HTTPError if the server responds with an error
+    """
+    cache = default_cache(cache)
+
+    entry: Optional[_Entry] = cache.get(url)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.text
+
+    resp = session().get(url, headers=conditional_headers(entry), timeout=timeout)
+
+    if entry is not None and resp.status_code == requests.codes.not_modified:
+        return revalidated(cache, url, entry)
+
+    resp.raise_for_status()
+
+    return store(cache, url, resp.text, resp.headers)
+
+
+def fetch_all(
+    urls: Iterable[str],
+    workers: Optional[int] = None,
+    *,
+    cache: Optional[HTTPCache] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> List[str]:
+    """Fetch remote manifests concurrently, see `fetch`.
+
+    :param workers: int, number of concurrent requests [16]
+    :returns: List[str], the manifests in order of the URLs
+    :raises: requests.HTTPError if the server responds with an error
+    """
+    with ThreadPoolExecutor(max_workers=workers or _POOL_SIZE) as executor:
+        return list(
+            executor.map(lambda url: fetch(url, cache=cache, timeout=timeout), urls)
+        )
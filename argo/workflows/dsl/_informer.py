@@ -0,0 +1,378 @@
+"""Local cache of workflows of a namespace, kept up to date by the watch stream."""
+
+import json
+import logging
+import math
+import threading
+import time
+
+from collections import defaultdict
+
+from typing import Any
+from typing import DefaultDict
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import WorkflowServiceApi
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.rest import ApiException
+
+from . import _utils
+from . import _watch
+from ._retry import RetryPolicy
+
+__all__ = ["WorkflowInformer"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# reconnects of the stream, retried until the informer is stopped
+_RECONNECT = RetryPolicy(max_attempts=8, backoff=0.5, max_backoff=30.0)
+
+
+class WorkflowInformer:
+    """Local cache of the Workflows of a namespace.
+
+    The Workflows are listed once and then kept up to date by the watch
+    stream, queries are answered from memory without requests to the
+    server. The stream is resumed from the last event when it breaks,
+    and the Workflows are relisted if the event has expired. Failures
+    which are not retryable, e.g. 403 of a missing permission, stop the
+    informer, see `start`.
+
+    The cache is at most `max_staleness` seconds behind the server,
+    as long as the stream is healthy. Otherwise, queries fall back to
+    requests to the server until the stream recovers.
+
+    Returned Workflows are shared by the callers and must not be modified.
+
+    Usage:
+
+        with WorkflowInformer(client, "argo") as informer:
+            created = wf.submit(client, "argo")
+            ...
+            phase = informer.get(created).status.phase
+    """
+
+    def __init__(
+        self,
+        client: ApiClient,
+        namespace: str,
+        *,
+        label_selector: Optional[str] = None,
+        max_staleness: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        """Create an informer, see `start`.
+
+        :param label_selector: str, limits the cached Workflows
+        :param max_staleness: float, seconds the cache may lag behind
+            the server before queries fall back to requests [30]
+        :param retry: RetryPolicy, backoff of reconnects of the stream,
+            retryable failures are retried until the informer is stopped
+        """
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.max_staleness = max_staleness
+        self.retry = retry or _RECONNECT
+
+        self._service = WorkflowServiceApi(api_client=client)
+
+        # manifests by name, deserialized on demand
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._models: Dict[str, V1alpha1Workflow] = {}
+
+        self._by_label: DefaultDict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self._by_phase: DefaultDict[Optional[str], Set[str]] = defaultdict(set)
+
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._synced_at: float = -math.inf
+
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._resp: Any = None
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "WorkflowInformer":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._manifests)
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since the cache was last known to be up to date."""
+        return time.monotonic() - self._synced_at
+
+    @property
+    def stale(self) -> bool:
+        """Whether the cache may lag behind more than `max_staleness`."""
+        return self.staleness > self.max_staleness
+
+    def start(self, timeout: Optional[float] = None) -> "WorkflowInformer":
+        """Start watching the Workflows, wait until they've been listed.
+
+        :param timeout: float, seconds to wait for the list [no timeout]
+        :raises: TimeoutError if the Workflows haven't been listed in time,
+            or the error which stopped the informer, e.g. ApiException
+            if listing the Workflows is forbidden
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self.__run, name=f"informer-{self.namespace}", daemon=True
+            )
+            self._thread.start()
+
+        if not self._synced.wait(timeout):
+            raise TimeoutError(f"Timed out listing workflows of {self.namespace}")
+
+        error: Optional[BaseException] = self._error
+        if error is not None:
+            # the next start lists the Workflows again
+            self.stop()
+            self._synced.clear()
+            self._error = None
+
+            raise error
+
+        return self
+
+    def stop(self):
+        """Stop watching the Workflows, the cache is kept."""
+        self._stopped.set()
+
+        # interrupts the blocking read of the stream (urllib3>=2.3), otherwise
+        # the stream ends by its timeout
+        shutdown: Any = getattr(self._resp, "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def get(self, workflow: Any) -> Optional[V1alpha1Workflow]:
+        """Return the Workflow by name.
+
+        A created Workflow, e.g. returned by `Workflow.submit`, which
+        the stream has not delivered yet is returned as it is.
+
+        :param workflow: name, created Workflow or its metadata
+        :returns: V1alpha1Workflow, or None if there is no such Workflow
+        """
+        name: str = _watch.name_of(workflow)
+
+        if self.stale:
+            _LOGGER.debug("The cache is stale, getting workflow %s.", name)
+            try:
+                return self._service.get_workflow(self.namespace, name)
+            except ApiException as exc:
+                if exc.status == 404:
+                    return None
+                raise
+
+        with self._lock:
+            found: Optional[V1alpha1Workflow] = self.__model(name)
+
+        if found is None and isinstance(workflow, V1alpha1Workflow):
+            return workflow
+
+        return found
+
+    def list(
+        self,
+        *,
+        labels: Optional[Dict[str, str]] = None,
+        phase: Optional[str] = None,
+    ) -> List[V1alpha1Workflow]:
+        """Return Workflows by their labels and/or phase, ordered by name.
+
+        :param labels: Dict[str, str], labels the Workflows have [any]
+        :param phase: str, e.g. "Running", "" for Workflows without a phase [any]
+        """
+        if self.stale:
+            _LOGGER.debug("The cache is stale, listing workflows.")
+            return self.__list_remote(labels, phase)
+
+        with self._lock:
+            candidates: List[Set[str]] = [
+                self._by_label.get(label, set()) for label in (labels or {}).items()
+            ]
+            if phase is not None:
+                candidates.append(self._by_phase.get(phase or None, set()))
+
+            names: Iterable[str]
+            if candidates:
+                names = set.intersection(*candidates)
+            else:
+                names = self._manifests
+
+            return [self.__model(name) for name in sorted(names)]
+
+    def __list_remote(
+        self, labels: Optional[Dict[str, str]], phase: Optional[str]
+    ) -> List[V1alpha1Workflow]:
+        selectors: List[str] = [f"{k}={v}" for k, v in (labels or {}).items()]
+        if self.label_selector:
+            selectors.insert(0, self.label_selector)
+
+        found = self._service.list_workflows(
+            self.namespace, list_options_label_selector=",".join(selectors) or None
+        )
+        return sorted(
+            (
+                wf
+                for wf in found.items or []
+                if phase is None or (wf.status and wf.status.phase or "") == phase
+            ),
+            key=lambda wf: wf.metadata.name,
+        )
+
+    def __model(self, name: str) -> Optional[V1alpha1Workflow]:
+        model: Optional[V1alpha1Workflow] = self._models.get(name)
+        if model is None:
+            manifest: Optional[Dict[str, Any]] = self._manifests.get(name)
+            if manifest is None:
+                return None
+
+            # the (possibly huge) status is deserialized on access
+            model = _utils.to_model(manifest, V1alpha1Workflow, lazy=True)
+            self._models[name] = model
+
+        return model
+
+    def __put(self, obj: Dict[str, Any]):
+        metadata: Dict[str, Any] = obj.get("metadata") or {}
+        name: str = metadata["name"]
+
+        self.__delete(name)
+
+        self._manifests[name] = obj
+        for label in (metadata.get("labels") or {}).items():
+            self._by_label[label].add(name)
+        self._by_phase[(obj.get("status") or {}).get("phase") or None].add(name)
+
+    def __delete(self, name: str):
+        obj: Optional[Dict[str, Any]] = self._manifests.pop(name, None)
+        if obj is None:
+            return
+
+        self._models.pop(name, None)
+
+        labels: Dict[str, str] = (obj.get("metadata") or {}).get("labels") or {}
+        for label in labels.items():
+            self.__unindex(self._by_label, label, name)
+
+        phase: Optional[str] = (obj.get("status") or {}).get("phase") or None
+        self.__unindex(self._by_phase, phase, name)
+
+    @staticmethod
+    def __unindex(index: Dict[Any, Set[str]], key: Any, name: str):
+        names: Set[str] = index[key]
+        names.discard(name)
+        if not names:
+            del index[key]
+
+    def __touch(self):
+        self._synced_at = time.monotonic()
+
+    def __list(self) -> str:
+        """Replace the cache by a list, return its resource version."""
+        resp = self._service.list_workflows(
+            self.namespace,
+            list_options_label_selector=self.label_selector,
+            _preload_content=False,
+        )
+        data: Dict[str, Any] = json.loads(resp.data)
+
+        with self._lock:
+            for name in list(self._manifests):
+                self.__delete(name)
+            for obj in data.get("items") or []:
+                self.__put(obj)
+
+        self.__touch()
+        self._synced.set()
+
+        _LOGGER.debug("Listed %d workflows of %s.", len(self), self.namespace)
+
+        return _watch.resource_version(data) or ""
+
+    def __watch(self, version: str) -> Iterable[str]:
+        """Update the cache by events, yield their resource versions."""
+        # the server closes the stream regularly, which bounds the staleness
+        # of the cache if the connection dies silently
+        resp = self._resp = self._service.watch_workflows(
+            self.namespace,
+            list_options_label_selector=self.label_selector,
+            list_options_resource_version=version,
+            list_options_timeout_seconds=max(1, math.ceil(self.max_staleness / 2)),
+            _preload_content=False,
+            _request_timeout=(self.max_staleness, self.max_staleness),
+        )
+        self.__touch()
+
+        try:
+            for type_, obj in _watch.events(resp):
+                with self._lock:
+                    if type_ == "DELETED":
+                        self.__delete((obj.get("metadata") or {}).get("name"))
+                    elif type_ != "BOOKMARK":
+                        self.__put(obj)
+
+                self.__touch()
+
+                yield _watch.resource_version(obj) or version
+        finally:
+            self._resp = None
+
+        self.__touch()
+
+    def __run(self):
+        version: Optional[str] = None
+        attempt = 1
+        while not self._stopped.is_set():
+            try:
+                if version is None:
+                    version = self.__list()
+                    continue
+
+                for version in self.__watch(version):
+                    attempt = 1
+            except _watch.Expired:
+                _LOGGER.debug("Resource version %s expired.", version)
+                version = None
+            except Exception as exc:
+                if self._stopped.is_set():
+                    break
+
+                if not self.retry.is_retryable(exc):
+                    _LOGGER.error(
+                        "The workflow watch of %s failed with %s, stopped.",
+                        self.namespace,
+                        getattr(exc, "status", None) or type(exc).__name__,
+                    )
+                    self._error = exc
+                    self._synced.set()  # raised by `start`
+                    break
+
+                delay: float = self.retry.delay(attempt)
+                _LOGGER.warning(
+                    "The workflow watch of %s failed with %s, reconnecting in %.2fs.",
+                    self.namespace,
+                    getattr(exc, "status", None) or type(exc).__name__,
+                    delay,
+                )
+                self._stopped.wait(delay)
+                attempt = min(attempt + 1, self.retry.max_attempts)
@@ -0,0 +1,132 @@
+"""Bulk loading of manifests."""
+
+import glob
+import logging
+import os
+import time
+import traceback
+
+from concurrent.futures import as_completed
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+
+from pathlib import Path
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Type
+from typing import Union
+
+__all__ = ["load_many", "LoadResult"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_EXTENSIONS = (".yaml", ".yml", ".json")
+
+
+class LoadResult(NamedTuple):
+    """Result of loading of a single manifest."""
+
+    path: Path
+    obj: Optional[Any]  # None if the manifest failed to load
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the manifest has been loaded successfully."""
+        return self.error is None
+
+
+def _resolve(paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]]):
+    """Resolve glob patterns and directories into file paths."""
+    if isinstance(paths_or_glob, (str, Path)):
+        paths_or_glob = [paths_or_glob]
+
+    paths: List[Path] = []
+    for source in paths_or_glob:
+        path = Path(source)
+
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.rglob("*") if p.suffix in _EXTENSIONS))
+        elif glob.has_magic(str(source)):
+            matches: List[str] = glob.glob(str(source), recursive=True)
+            paths.extend(Path(p) for p in sorted(matches))
+        else:
+            paths.append(path)
+
+    return paths
+
+
+def _load_chunk(
+    klass: Type[Any], paths: List[Path], validate: bool
+) -> List[LoadResult]:
+    """Load manifests of a chunk of files."""
+    results: List[LoadResult] = []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            obj: Any = klass.from_file(path, validate=validate)
+        except Exception:
+            duration = time.perf_counter() - start
+            results.append(LoadResult(path, None, duration, traceback.format_exc()))
+        else:
+            results.append(LoadResult(path, obj, time.perf_counter() - start))
+
+    return results
+
+
+def load_many(
+    klass: Type[Any],
+    paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+    workers: Optional[int] = None,
+    *,
+    validate: bool = True,
+    chunksize: Optional[int] = None,
+) -> Iterator[LoadResult]:
+    """Load manifests by `klass.from_file` in a process pool.
+
+    Results are yielded as soon as they're loaded, i.e. not in order
+    of the paths. Failures do not abort the batch, they're reported
+    in the results.
+
+    :param klass: Workflow, CronWorkflow or WorkflowTemplate (sub)class
+    :param paths_or_glob: file path(s), directories or glob patterns
+    :param workers: int, number of worker processes [os.cpu_count()]
+    :param validate: bool, see `from_dict`
+    :param chunksize: int, number of files loaded by a worker at once [auto]
+    :returns: Iterator[LoadResult]
+    """
+    paths: List[Path] = _resolve(paths_or_glob)
+    if not paths:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker balance the load, larger ones save round trips
+        chunksize = max(1, min(64, len(paths) // (workers * 4)))
+
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: List[Future] = [
+            executor.submit(_load_chunk, klass, paths[i : i + chunksize], validate)
+            for i in range(0, len(paths), chunksize)
+        ]
+
+        try:
+            for future in as_completed(futures):
+                for result in future.result():
+                    failed += not result.ok
+                    yield result
+        finally:
+            # the consumer may stop early, do not wait for the rest
+            for future in futures:
+                future.cancel()
+
+    _LOGGER.info("Loaded %d manifests, %d failed.", len(paths) - failed, failed)
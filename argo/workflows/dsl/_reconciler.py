@@ -0,0 +1,409 @@
+"""Reconciliation of (cluster) workflow templates with the Argo server."""
+
+import json
+import logging
+import time
+import traceback
+
+from inflection import camelize
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import ClusterWorkflowTemplateServiceApi
+from argo.workflows.client import WorkflowTemplateServiceApi
+from argo.workflows.client.models import V1alpha1ClusterWorkflowTemplateCreateRequest
+from argo.workflows.client.models import V1alpha1ClusterWorkflowTemplateUpdateRequest
+from argo.workflows.client.models import V1alpha1WorkflowTemplateCreateRequest
+from argo.workflows.client.models import V1alpha1WorkflowTemplateUpdateRequest
+from argo.workflows.client.models import V1ObjectMeta
+from argo.workflows.client.rest import ApiException
+
+from . import _retry
+from . import _serializers
+from . import _submitter
+from . import _utils
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+from ._workflow_template import ClusterWorkflowTemplate
+from ._workflow_template import WorkflowTemplate
+
+__all__ = ["reconcile", "ReconcileResult"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# annotation of applied templates, the digest of their manifest
+DIGEST_ANNOTATION = "argo-dsl/digest"
+
+# label of applied templates, the owner given to `reconcile`
+OWNER_LABEL = "argo-dsl/owner"
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+UNCHANGED = "unchanged"
+
+
+class ReconcileResult(NamedTuple):
+    """Result of reconciliation of a single template."""
+
+    kind: str
+    name: str
+    action: str  # create, update, delete or unchanged
+    metadata: Optional[V1ObjectMeta]  # None if deleted or not applied
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the template has been reconciled successfully."""
+        return self.error is None
+
+
+class _Templates:
+    """Templates of a kind on the server, namespaced or cluster-scoped."""
+
+    def __init__(self, client: ApiClient, kind: str, namespace: Optional[str]):
+        self.kind = kind
+        self.namespace = namespace
+
+        self._service: Any
+        if kind == "ClusterWorkflowTemplate":
+            self._service = ClusterWorkflowTemplateServiceApi(api_client=client)
+        else:
+            self._service = WorkflowTemplateServiceApi(api_client=client)
+
+    def __call(self, method: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        """Call the method of the service, return the decoded response."""
+        if self.kind == "ClusterWorkflowTemplate":
+            method = method.replace("workflow_template", "cluster_workflow_template")
+        else:
+            args = (self.namespace, *args)
+
+        resp = getattr(self._service, method)(*args, _preload_content=False, **kwargs)
+        return json.loads(resp.data)
+
+    def list(self, label_selector: Optional[str]) -> List[Dict[str, Any]]:
+        """Return manifests of the templates."""
+        data = self.__call(
+            "list_workflow_templates", list_options_label_selector=label_selector
+        )
+        return data.get("items") or []
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return manifest of the template, None if there is no such template."""
+        try:
+            return self.__call("get_workflow_template", name)
+        except ApiException as exc:
+            if exc.status == 404:
+                return None
+            raise
+
+    def create(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        body: Any
+        if self.kind == "ClusterWorkflowTemplate":
+            body = V1alpha1ClusterWorkflowTemplateCreateRequest(template=manifest)
+        else:
+            body = V1alpha1WorkflowTemplateCreateRequest(
+                namespace=self.namespace, template=manifest
+            )
+
+        return self.__call("create_workflow_template", body)
+
+    def update(self, name: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        body: Any
+        if self.kind == "ClusterWorkflowTemplate":
+            body = V1alpha1ClusterWorkflowTemplateUpdateRequest(
+                name=name, template=manifest
+            )
+        else:
+            body = V1alpha1WorkflowTemplateUpdateRequest(
+                name=name, namespace=self.namespace, template=manifest
+            )
+
+        return self.__call("update_workflow_template", name, body)
+
+    def delete(self, name: str) -> Dict[str, Any]:
+        return self.__call("delete_workflow_template", name)
+
+
+def _digest(manifest: Dict[str, Any]) -> Optional[str]:
+    metadata: Dict[str, Any] = manifest.get("metadata") or {}
+    return (metadata.get("annotations") or {}).get(DIGEST_ANNOTATION)
+
+
+def _normalized(obj: Any) -> Any:
+    """Return copy of the object without zero values of its dicts.
+
+    The server omits zero values (None, false, 0, empty strings, lists
+    and dicts) of the manifest it stores, an omitted value is the same
+    as its zero value.
+    """
+    if isinstance(obj, dict):
+        normalized = ((k, _normalized(v)) for k, v in obj.items())
+        return {k: v for k, v in normalized if v}
+    if isinstance(obj, list):
+        return [_normalized(v) for v in obj]
+
+    return obj
+
+
+def _spec_digest(manifest: Dict[str, Any]) -> str:
+    """Return digest of the spec of the manifest, local or stored by the server."""
+    return _serializers.digest(_normalized(manifest.get("spec") or {}))
+
+
+def _owner(manifest: Dict[str, Any]) -> Optional[str]:
+    metadata: Dict[str, Any] = manifest.get("metadata") or {}
+    return (metadata.get("labels") or {}).get(OWNER_LABEL)
+
+
+def _manifest(
+    template: WorkflowTemplate, owner: Optional[str]
+) -> Tuple[Dict[str, Any], str]:
+    """Return the manifest to apply, annotated by its digest, and the digest."""
+    type(template).__compile_deferred__()
+
+    manifest: Dict[str, Any]
+    if not getattr(template, "validated", True):
+        manifest = camelize(template.to_dict())
+    else:
+        manifest = _utils.sanitize_for_serialization(template)
+
+    # in-place changes of the template are not tracked by the cached digest
+    digest: str = template.digest(refresh=True)
+
+    metadata: Dict[str, Any] = manifest.get("metadata") or {}
+    annotations: Dict[str, str] = {
+        **(metadata.get("annotations") or {}),
+        DIGEST_ANNOTATION: digest,
+    }
+    manifest["metadata"] = {**metadata, "annotations": annotations}
+
+    if owner is not None:
+        labels: Dict[str, str] = {**(metadata.get("labels") or {}), OWNER_LABEL: owner}
+        manifest["metadata"]["labels"] = labels
+
+    return manifest, digest
+
+
+def _apply(
+    templates: _Templates,
+    name: str,
+    action: str,
+    manifest: Optional[Dict[str, Any]],
+    digest: Optional[str],
+    retry: Optional[RetryPolicy],
+    limiter: Optional[RateLimiter],
+) -> ReconcileResult:
+    """Apply a single change of a template."""
+
+    def create() -> Dict[str, Any]:
+        return templates.create(manifest)
+
+    def update() -> Dict[str, Any]:
+        return templates.update(name, manifest)
+
+    def delete() -> Dict[str, Any]:
+        try:
+            return templates.delete(name)
+        except ApiException as exc:
+            if exc.status == 404 and retry is not None:
+                return {}  # deleted by a failed attempt
+            raise
+
+    def find() -> Optional[Dict[str, Any]]:
+        # the change of a failed attempt, if any, is recognized by the digest
+        found: Optional[Dict[str, Any]] = templates.get(name)
+        if (
+            found is not None
+            and _digest(found) == digest
+            and _spec_digest(found) == _spec_digest(manifest)
+        ):
+            return found
+
+        return None
+
+    call: Callable[[], Dict[str, Any]] = {
+        CREATE: create,
+        UPDATE: update,
+        DELETE: delete,
+    }[action]
+
+    start = time.perf_counter()
+    try:
+        data: Dict[str, Any] = _retry.call(
+            call, find if action != DELETE else None, retry=retry, limiter=limiter
+        )
+    except Exception:
+        duration = time.perf_counter() - start
+        return ReconcileResult(
+            templates.kind, name, action, None, duration, traceback.format_exc()
+        )
+
+    duration = time.perf_counter() - start
+
+    metadata: Optional[V1ObjectMeta] = None
+    if data.get("metadata"):
+        metadata = _utils.to_model(data["metadata"], V1ObjectMeta)
+
+    return ReconcileResult(templates.kind, name, action, metadata, duration)
+
+
+def reconcile(
+    client: ApiClient,
+    namespace: Optional[str],
+    templates: Iterable[WorkflowTemplate],
+    concurrency: int = 8,
+    *,
+    prune: bool = False,
+    label_selector: Optional[str] = None,
+    owner: Optional[str] = None,
+    dry_run: bool = False,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> List[ReconcileResult]:
+    """Create, update and delete templates on the server to match the given ones.
+
+    The templates of each kind are listed once. Applied templates are
+    annotated by the digest of their manifest, see `WorkflowTemplate.digest`,
+    and only templates which are missing on the server or whose digest
+    differs are written, concurrently. Templates whose spec has been
+    edited on the server are updated as well, the spec on the server
+    is compared with the applied one, other edits (e.g. of labels)
+    are left intact. Reconciling unchanged templates takes a single
+    request per kind.
+
+    Pruning is limited to the templates of the `label_selector`
+    or of the `owner`, so that templates applied by other projects
+    are left intact.
+
+    :param namespace: str, namespace of WorkflowTemplates, ignored
+        by ClusterWorkflowTemplates, None to reconcile only those
+    :param templates: WorkflowTemplates and/or ClusterWorkflowTemplates
+    :param concurrency: int, number of concurrent writes [8]
+    :param prune: bool, whether to delete templates on the server which
+        have been applied by `reconcile` but are not among the templates,
+        requires `label_selector` or `owner`
+    :param label_selector: str, limits the listed (and pruned) templates
+    :param owner: str, labels the applied templates by `argo-dsl/owner`,
+        limits the pruned templates to those of the owner
+    :param dry_run: bool, whether to only return the changes to make
+    :param retry: RetryPolicy, retries of failed writes, see `submit`
+    :param limiter: RateLimiter, limit of the rate of the writes
+    :returns: List[ReconcileResult], changes in order of the templates,
+        followed by deletions
+    :raises: ValueError if several templates of a kind have the same name,
+        WorkflowTemplates are given without a namespace, or `prune`
+        is not limited by `label_selector` or `owner`
+    """
+    if prune and label_selector is None and owner is None:
+        raise ValueError("Pruning requires a label_selector or an owner.")
+
+    desired: Dict[str, Dict[str, Tuple[Dict[str, Any], str]]] = {
+        "WorkflowTemplate": {},
+        "ClusterWorkflowTemplate": {},
+    }
+    order: List[Tuple[str, str]] = []
+    for template in templates:
+        kind = (
+            "ClusterWorkflowTemplate"
+            if isinstance(template, ClusterWorkflowTemplate)
+            else "WorkflowTemplate"
+        )
+        if template.name in desired[kind]:
+            raise ValueError(f"Duplicate {kind} {template.name}")
+        if kind == "WorkflowTemplate" and namespace is None:
+            raise ValueError(f"{kind} {template.name} requires a namespace.")
+
+        desired[kind][template.name] = _manifest(template, owner)
+        order.append((kind, template.name))
+
+    # planned changes, by kind and name of the templates
+    plan: Dict[Tuple[str, str], Tuple[_Templates, str, str, Any, Any]] = {}
+    unchanged: Dict[Tuple[str, str], ReconcileResult] = {}
+    deletions: List[Tuple[_Templates, str, str, Any, Any]] = []
+
+    for kind, manifests in desired.items():
+        if not manifests and not prune:
+            continue
+        if kind == "WorkflowTemplate" and namespace is None:
+            continue  # only cluster-scoped templates
+
+        api = _Templates(client, kind, namespace)
+
+        existing: Dict[str, Dict[str, Any]] = {
+            item["metadata"]["name"]: item for item in api.list(label_selector)
+        }
+        for name, (manifest, digest) in manifests.items():
+            found: Optional[Dict[str, Any]] = existing.get(name)
+            if found is None:
+                plan[kind, name] = (api, name, CREATE, manifest, digest)
+            elif (
+                _digest(found) != digest
+                # edited on the server, e.g. by `kubectl edit`
+                or _spec_digest(found) != _spec_digest(manifest)
+                or (owner is not None and _owner(found) != owner)
+            ):
+                # optimistic concurrency, fails if modified since listed
+                version: Optional[str] = found["metadata"].get("resourceVersion")
+                manifest["metadata"]["resourceVersion"] = version
+
+                plan[kind, name] = (api, name, UPDATE, manifest, digest)
+            else:
+                metadata = _utils.to_model(found["metadata"], V1ObjectMeta)
+                unchanged[kind, name] = ReconcileResult(
+                    kind, name, UNCHANGED, metadata, 0.0
+                )
+
+        if prune:
+            deletions.extend(
+                (api, name, DELETE, None, None)
+                for name, item in existing.items()
+                if name not in manifests
+                and _digest(item) is not None
+                and (owner is None or _owner(item) == owner)
+            )
+
+    _LOGGER.info(
+        "%d templates to create or update, %d to delete, %d unchanged.",
+        len(plan),
+        len(deletions),
+        len(unchanged),
+    )
+
+    changes: List[Tuple[_Templates, str, str, Any, Any]] = [
+        *plan.values(),
+        *deletions,
+    ]
+
+    applied: List[ReconcileResult]
+    if dry_run:
+        applied = [
+            ReconcileResult(api.kind, name, action, None, 0.0)
+            for api, name, action, _, _ in changes
+        ]
+    else:
+        _submitter._check_pool(client, concurrency)
+
+        applied = _submitter._pipeline(
+            lambda change: _apply(*change, retry, limiter),
+            changes,
+            concurrency,
+            what="template changes",
+        )
+
+    # in order of the templates, followed by the deletions
+    results: Dict[Tuple[str, str], ReconcileResult] = {
+        **unchanged,
+        **{(r.kind, r.name): r for r in applied[: len(plan)]},
+    }
+    return [results[key] for key in order] + applied[len(plan) :]
@@ -0,0 +1,274 @@
+"""Registration of Workflows as WorkflowTemplates, submitted by reference."""
+
+import copy
+import logging
+import threading
+
+from inflection import camelize
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import WorkflowTemplateServiceApi
+from argo.workflows.client.models import V1alpha1WorkflowTemplateCreateRequest
+from argo.workflows.client.rest import ApiException
+
+from . import _retry
+from . import _serializers
+from . import _utils
+from ._aio import AsyncClient
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+
+__all__ = ["Reference", "reference", "register", "aregister", "forget", "parameters"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# label of registered templates
+REGISTERED_LABEL = "argo-dsl/registered"
+
+# templates are named by the Workflow, suffixed by the digest of the spec
+_DIGEST_LENGTH = 12
+_NAME_LENGTH = 63
+
+# registered templates, by host, namespace and name
+__registered: Set[Tuple[str, str, str]] = set()
+
+# locks of registrations, by the same keys, so that the templates are created
+# once, while registrations of other templates are not blocked by the server
+__locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+__lock = threading.Lock()
+
+
+def parameters(
+    declared: Optional[List[Dict[str, Any]]], values: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """Return arguments of a submission, see `Workflow.submit`.
+
+    :param declared: manifests of the parameters of the Workflow,
+        None if the Workflow doesn't take any parameters
+    :param values: values of the parameters, override the declared ones
+    """
+    if declared is None:
+        if values:
+            raise AttributeError("The Workflow doesn't take any parameters.")
+        return []
+
+    params: List[Dict[str, Any]] = [
+        {"name": name, "value": value} for name, value in values.items()
+    ]
+    for p in declared:
+        if p["name"] in values:
+            continue  # overridden
+        elif not p.get("value"):
+            default = p.get("default")
+            if default is None:
+                raise Exception(f"Missing required workflow parameter {p['name']}")
+
+            p = {**p, "value": default}
+
+        params.append(p)
+
+    return params
+
+
+class Reference:
+    """WorkflowTemplate of a Workflow and the Workflows referencing it.
+
+    The template carries the whole spec of the Workflow, except for
+    the values of the parameters, and is named by its digest, so
+    a template of the same name on the server is the same template.
+    The referencing Workflows carry only the metadata of the Workflow,
+    the `workflowTemplateRef` and the arguments.
+    """
+
+    def __init__(self, wf: Any):
+        type(wf).__compile_deferred__()
+
+        manifest: Dict[str, Any]
+        if not getattr(wf, "validated", True):
+            manifest = camelize(wf.to_dict())
+        else:
+            manifest = _utils.sanitize_for_serialization(wf)
+
+        spec: Dict[str, Any] = dict(manifest.get("spec") or {})
+        self.metadata: Dict[str, Any] = manifest.get("metadata") or {}
+
+        self.declared: Optional[List[Dict[str, Any]]] = None
+        if spec.get("arguments"):
+            arguments: Dict[str, Any] = spec["arguments"]
+            self.declared = list(arguments.get("parameters") or [])
+
+            # the values are submitted, Workflows differing only
+            # by the values of the parameters share the template
+            spec["arguments"] = {
+                **arguments,
+                "parameters": [
+                    {k: v for k, v in p.items() if k != "value"}
+                    for p in self.declared
+                ],
+            }
+
+        self.digest: str = _serializers.digest(spec)
+
+        prefix: str = (
+            self.metadata.get("name") or self.metadata.get("generateName") or "workflow"
+        )
+        prefix = prefix.rstrip("-")[: _NAME_LENGTH - _DIGEST_LENGTH - 1]
+
+        self.name: str = f"{prefix}-{self.digest[:_DIGEST_LENGTH]}"
+        self.template: Dict[str, Any] = {
+            "apiVersion": manifest.get("apiVersion", "argoproj.io/v1alpha1"),
+            "kind": "WorkflowTemplate",
+            "metadata": {"name": self.name, "labels": {REGISTERED_LABEL: "true"}},
+            "spec": spec,
+        }
+
+    def manifest(self) -> Dict[str, Any]:
+        """Return manifest of a referencing Workflow, of the declared arguments."""
+        spec: Dict[str, Any] = {"workflowTemplateRef": {"name": self.name}}
+        if self.declared is not None:
+            spec["arguments"] = {"parameters": self.declared}
+
+        return {
+            "apiVersion": self.template["apiVersion"],
+            "kind": "Workflow",
+            # the labels are shared by the submissions, see `idempotency_key`
+            "metadata": copy.deepcopy(self.metadata),
+            "spec": spec,
+        }
+
+    def workflow(self, values: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """Return manifest of a referencing Workflow to submit."""
+        manifest: Dict[str, Any] = self.manifest()
+        if self.declared is not None or values:
+            manifest["spec"]["arguments"] = {
+                "parameters": parameters(self.declared, values or {})
+            }
+
+        return manifest
+
+
+def reference(wf: Any) -> Reference:
+    """Return the Reference of the Workflow, cached until its digest changes.
+
+    The digest is invalidated when an attribute of the Workflow is set,
+    in-place changes of nested objects require `wf.digest(refresh=True)`.
+    """
+    digest: str = wf.digest()
+
+    cached: Optional[Reference] = vars(wf).get("__reference__")
+    if cached is not None and vars(wf).get("__referenced__") == digest:
+        return cached
+
+    ref = Reference(wf)
+    vars(wf)["__reference__"] = ref
+    vars(wf)["__referenced__"] = digest
+
+    return ref
+
+
+def _key(host: str, namespace: str, ref: Reference) -> Tuple[str, str, str]:
+    return host, namespace, ref.name
+
+
+def forget(host: str, namespace: str, ref: Reference):
+    """Forget the registration, e.g. if the template has been deleted."""
+    __registered.discard(_key(host, namespace, ref))
+
+
+def register(
+    client: ApiClient,
+    namespace: str,
+    ref: Reference,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> bool:
+    """Create the template of the Reference, once per process.
+
+    :returns: bool, whether the template has been created, False if
+        it has been registered already
+    """
+    key = _key(client.configuration.host, namespace, ref)
+    if key in __registered:
+        return False
+
+    service = WorkflowTemplateServiceApi(api_client=client)
+
+    def create() -> bool:
+        request = V1alpha1WorkflowTemplateCreateRequest(
+            namespace=namespace, template=ref.template
+        )
+        try:
+            resp = service.create_workflow_template(
+                namespace, request, _preload_content=False
+            )
+            resp.read()  # the connection is reused once the response is read
+        except ApiException as exc:
+            if exc.status == 409:
+                return False  # the same template, named by the digest
+            raise
+
+        return True
+
+    with __lock:
+        lock: threading.Lock = __locks.setdefault(key, threading.Lock())
+
+    try:
+        with lock:
+            if key in __registered:
+                return False  # registered concurrently
+
+            created: bool = _retry.call(create, retry=retry, limiter=limiter)
+            __registered.add(key)
+    finally:
+        with __lock:
+            __locks.pop(key, None)
+
+    _LOGGER.debug("Registered WorkflowTemplate %s, created: %s.", ref.name, created)
+
+    return created
+
+
+async def aregister(
+    client: AsyncClient,
+    namespace: str,
+    ref: Reference,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> bool:
+    """Create the template of the Reference asynchronously, see `register`.
+
+    Concurrent registrations of the same template are not serialized,
+    all but one are rejected by the server as conflicts.
+    """
+    key = _key(client.configuration.host, namespace, ref)
+    if key in __registered:
+        return False
+
+    async def create() -> bool:
+        try:
+            await client.request(
+                "POST",
+                f"/api/v1/workflow-templates/{namespace}",
+                body={"namespace": namespace, "template": ref.template},
+            )
+        except ApiException as exc:
+            if exc.status == 409:
+                return False  # the same template, named by the digest
+            raise
+
+        return True
+
+    created: bool = await _retry.acall(create, retry=retry, limiter=limiter)
+    __registered.add(key)
+
+    return created
@@ -0,0 +1,314 @@
+"""Rate limiting and retries of requests to the Argo server."""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import urllib3
+import uuid
+
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from argo.workflows.client.rest import ApiException
+
+__all__ = ["RateLimiter", "RetryPolicy"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# label of submitted manifests, retried creates look up the workflow by it
+IDEMPOTENCY_LABEL = "argo-dsl/idempotency-key"
+
+# errors of requests which failed before the server responded
+_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    urllib3.exceptions.HTTPError,
+)
+
+T = TypeVar("T")
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of requests.
+
+    The limiter is shared by threads and coroutines of an event loop,
+    requests above the rate wait for their turn in order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """Create a limiter of `rate` requests per second.
+
+        :param rate: float, requests per second
+        :param burst: int, requests allowed at once after a pause [max(1, rate)]
+        """
+        if rate <= 0:
+            raise ValueError(f"Expected a positive rate, got: {rate}")
+
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return seconds to wait until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            # tokens may go negative, the waiting requests are queued
+            self._tokens -= 1
+
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Wait until a request is allowed."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """Wait until a request is allowed, asynchronously."""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class RetryPolicy:
+    """Retries of failed requests with jittered exponential backoff.
+
+    Throttled requests (429), server errors (5xx), timeouts and connection
+    errors are retried. The delay honors the Retry-After header.
+    """
+
+    STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        *,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+    ):
+        """Create a policy.
+
+        :param max_attempts: int, attempts including the first one [5]
+        :param backoff: float, seconds of the first delay, doubled by attempt [0.5]
+        :param max_backoff: float, max. seconds of the delay, including
+            the delays requested by the server by Retry-After [30]
+        :param jitter: bool, whether to randomize the delays ("full jitter")
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Return whether the failed request should be retried."""
+        if isinstance(exc, ApiException):
+            return exc.status in self.STATUSES
+
+        if isinstance(exc, _ERRORS):
+            return True
+
+        try:
+            import aiohttp
+        except ImportError:
+            return False
+
+        return isinstance(exc, aiohttp.ClientConnectionError)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return seconds to wait before the next attempt.
+
+        :param attempt: int, number of the failed attempt, starting at 1
+        :param retry_after: float, seconds requested by the server,
+            capped by `max_backoff`
+        """
+        backoff = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+
+        if retry_after is not None:
+            return min(self.max_backoff, max(retry_after, backoff))
+
+        return backoff
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Return seconds of the Retry-After header of the failed response."""
+    headers: Any = getattr(exc, "headers", None)
+    value: Optional[str] = headers.get("Retry-After") if headers else None
+    if value is None:
+        return None
+
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, date.timestamp() - time.time())
+
+
+def idempotency_key(manifest: Dict[str, Any]) -> str:
+    """Label the manifest by an idempotency key, unless it is labeled already.
+
+    :returns: str, the key
+    """
+    labels: Dict[str, str] = manifest.setdefault("metadata", {}).setdefault(
+        "labels", {}
+    )
+    return labels.setdefault(IDEMPOTENCY_LABEL, uuid.uuid4().hex)
+
+
+def _log_retry(exc: BaseException, attempt: int, delay: float):
+    _LOGGER.warning(
+        "Attempt %d failed with %s, retrying in %.2fs.",
+        attempt,
+        getattr(exc, "status", None) or type(exc).__name__,
+        delay,
+    )
+
+
+def call(
+    create: Callable[[], T],
+    find: Optional[Callable[[], Optional[T]]] = None,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> T:
+    """Call `create` with rate limiting and retries.
+
+    A failed create may have succeeded on the server, so before it is retried,
+    `find` looks up and returns the created object, if any.
+    """
+    attempt = 1
+    while True:
+        try:
+            if attempt > 1 and find is not None:
+                if limiter is not None:
+                    limiter.acquire()
+
+                found: Optional[T] = find()
+                if found is not None:
+                    _LOGGER.info("Found the object created by a failed attempt.")
+                    return found
+
+            if limiter is not None:
+                limiter.acquire()
+
+            return create()
+        except Exception as exc:
+            if retry is None or attempt >= retry.max_attempts:
+                raise
+            if not retry.is_retryable(exc):
+                raise
+
+            delay = retry.delay(attempt, retry_after(exc))
+            _log_retry(exc, attempt, delay)
+
+            time.sleep(delay)
+            attempt += 1
+
+
+async def acall(
+    create: Callable[[], Awaitable[T]],
+    find: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> T:
+    """Await `create` with rate limiting and retries, see `call`."""
+    attempt = 1
+    while True:
+        try:
+            if attempt > 1 and find is not None:
+                if limiter is not None:
+                    await limiter.aacquire()
+
+                found: Optional[T] = await find()
+                if found is not None:
+                    _LOGGER.info("Found the object created by a failed attempt.")
+                    return found
+
+            if limiter is not None:
+                await limiter.aacquire()
+
+            return await create()
+        except Exception as exc:
+            if retry is None or attempt >= retry.max_attempts:
+                raise
+            if not retry.is_retryable(exc):
+                raise
+
+            delay = retry.delay(attempt, retry_after(exc))
+            _log_retry(exc, attempt, delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def call_idempotent(
+    manifest: Dict[str, Any],
+    create: Callable[[], T],
+    list_: Callable[[str], Optional[List[T]]],
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> T:
+    """Create the object of the manifest with rate limiting and retries.
+
+    With a retry policy, the manifest is labeled by an idempotency key, see
+    `idempotency_key`, and a retried create returns the object created by
+    a failed attempt, if any, instead of creating a duplicate.
+
+    :param create: callable, creates the object of the manifest
+    :param list_: callable, lists objects by a label selector
+    """
+    if retry is None:
+        return call(create, limiter=limiter)
+
+    selector = f"{IDEMPOTENCY_LABEL}={idempotency_key(manifest)}"
+
+    def find() -> Optional[T]:
+        return next(iter(list_(selector) or []), None)
+
+    return call(create, find, retry=retry, limiter=limiter)
+
+
+async def acall_idempotent(
+    manifest: Dict[str, Any],
+    create: Callable[[], Awaitable[T]],
+    list_: Callable[[str], Awaitable[Optional[List[T]]]],
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> T:
+    """Create the object of the manifest asynchronously, see `call_idempotent`."""
+    if retry is None:
+        return await acall(create, limiter=limiter)
+
+    selector = f"{IDEMPOTENCY_LABEL}={idempotency_key(manifest)}"
+
+    async def find() -> Optional[T]:
+        return next(iter(await list_(selector) or []), None)
+
+    return await acall(create, find, retry=retry, limiter=limiter)
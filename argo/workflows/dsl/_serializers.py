@@ -0,0 +1,496 @@
+"""Serializers of manifests."""
+
+import hashlib
+import json
+import re
+import yaml
+
+from datetime import date
+from datetime import datetime
+
+from functools import lru_cache
+
+from operator import itemgetter
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from yaml.events import DocumentEndEvent
+from yaml.events import DocumentStartEvent
+from yaml.events import MappingEndEvent
+from yaml.events import MappingStartEvent
+from yaml.events import ScalarEvent
+from yaml.events import SequenceEndEvent
+from yaml.events import SequenceStartEvent
+from yaml.nodes import MappingNode
+from yaml.nodes import Node
+from yaml.nodes import ScalarNode
+from yaml.nodes import SequenceNode
+
+from . import _utils
+
+try:
+    from yaml import CDumper as Dumper
+except ImportError:
+    from yaml import Dumper
+
+__all__ = [
+    "dump_all",
+    "get_serializer",
+    "register_serializer",
+    "set_default_serializer",
+    "JSONSerializer",
+    "Serializer",
+    "YAMLSerializer",
+]
+
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_INT_TAG = "tag:yaml.org,2002:int"
+_MAP_TAG = "tag:yaml.org,2002:map"
+_SEQ_TAG = "tag:yaml.org,2002:seq"
+
+# trailing spaces are not allowed in YAML blocks
+_TRAILING_SPACES = re.compile(" +\n")
+
+
+# (attribute, key) pairs of a model, in order of declaration and sorted by keys
+_Fields = Tuple[Tuple[str, str], ...]
+
+
+@lru_cache(maxsize=1024)
+def _model_fields(klass: Type[Any]) -> Tuple[_Fields, _Fields]:
+    """Return fields of a model class, computed once per class."""
+    fields: _Fields = tuple(
+        (attr, klass.attribute_map[attr]) for attr in klass.openapi_types
+    )
+
+    return fields, tuple(sorted(fields, key=itemgetter(1)))
+
+
+def _is_model(obj: Any) -> bool:
+    return hasattr(type(obj), "openapi_types")
+
+
+def _json_default(obj: Any) -> Any:
+    """Return JSON serializable form of a model or a datetime."""
+    if _is_model(obj):
+        fields, _ = _model_fields(type(obj))
+
+        d: Dict[str, Any] = {}
+        for attr, key in fields:
+            value: Any = getattr(obj, attr)
+            if value is not None:
+                d[key] = value
+
+        return d
+
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _represent_str(dumper: yaml.BaseDumper, data: str) -> ScalarNode:
+    if "\n" in data:
+        data = _TRAILING_SPACES.sub("\n", data).strip()
+        return dumper.represent_scalar(_STR_TAG, data, style="|")
+
+    return dumper.represent_scalar(_STR_TAG, data)
+
+
+class ManifestDumper(Dumper):
+    """Dumper of manifests, multi-line strings are dumped as block literals.
+
+    Plain data (dicts, lists, strings, booleans and integers) are emitted
+    directly as events, without building the representation graph.
+    Sub-objects shared within the data are dumped repeatedly, not as aliases.
+
+    Models are dumped as if sanitized by `_utils.sanitize_for_serialization`
+    (keys of the manifest, None attributes omitted, datetimes as ISO 8601
+    strings), without making the sanitized copy.
+
+    The output is the same as of `_utils.BlockDumper`, the emitter of libyaml
+    is used when available.
+    """
+
+    def __init__(
+        self,
+        stream,
+        default_style: Optional[str] = None,
+        default_flow_style: Optional[bool] = False,
+        canonical: Optional[bool] = None,
+        explicit_start: Optional[bool] = None,
+        explicit_end: Optional[bool] = None,
+        version: Optional[Tuple[int, int]] = None,
+        tags: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ):
+        super().__init__(
+            stream,
+            default_style=default_style,
+            default_flow_style=default_flow_style,
+            canonical=canonical,
+            explicit_start=explicit_start,
+            explicit_end=explicit_end,
+            version=version,
+            tags=tags,
+            **kwargs,
+        )
+
+        # the C emitter does not expose its options
+        self.__document: Tuple[Any, ...] = (explicit_start, explicit_end, version, tags)
+        self.__fast: bool = (
+            default_style is None and default_flow_style is False and not canonical
+        )
+
+        # implicit flags of scalars, by tag and value
+        self.__implicit: Dict[Tuple[str, str], Tuple[bool, bool]] = {}
+
+        self.__sanitize: bool = False
+
+    def represent(self, data: Any):
+        if not self.__fast:
+            if _is_model(data):
+                data = _utils.sanitize_for_serialization(data)
+
+            return super().represent(data)
+
+        explicit_start, explicit_end, version, tags = self.__document
+
+        # data of models is sanitized as it is emitted
+        self.__sanitize = _is_model(data)
+
+        self.emit(
+            DocumentStartEvent(explicit=explicit_start, version=version, tags=tags)
+        )
+        self.__emit(data)
+        self.emit(DocumentEndEvent(explicit=explicit_end))
+
+    def __emit(self, data: Any):
+        t = type(data)
+
+        if t is str:
+            if "\n" in data:
+                data = _TRAILING_SPACES.sub("\n", data).strip()
+                self.__emit_scalar(_STR_TAG, data, "|")
+            else:
+                self.__emit_scalar(_STR_TAG, data)
+        elif t is dict:
+            items = list(data.items())
+            if self.sort_keys:
+                try:
+                    items.sort()
+                except TypeError:
+                    pass
+
+            self.emit(MappingStartEvent(None, _MAP_TAG, True, flow_style=False))
+            for key, value in items:
+                self.__emit(key)
+                self.__emit(value)
+            self.emit(MappingEndEvent())
+        elif t is list:
+            self.emit(SequenceStartEvent(None, _SEQ_TAG, True, flow_style=False))
+            for item in data:
+                self.__emit(item)
+            self.emit(SequenceEndEvent())
+        elif t is bool:
+            self.__emit_scalar(_BOOL_TAG, "true" if data else "false")
+        elif t is int:
+            self.__emit_scalar(_INT_TAG, str(data))
+        elif hasattr(t, "openapi_types"):
+            fields, sorted_fields = _model_fields(t)
+
+            self.emit(MappingStartEvent(None, _MAP_TAG, True, flow_style=False))
+            for attr, key in sorted_fields if self.sort_keys else fields:
+                value: Any = getattr(data, attr)
+                if value is None:
+                    continue
+
+                self.__emit_scalar(_STR_TAG, key)
+                self.__emit(value)
+            self.emit(MappingEndEvent())
+        elif self.__sanitize and isinstance(data, (dict, list, date)):
+            # subclasses and datetimes, as by `_utils.sanitize_for_serialization`
+            if isinstance(data, dict):
+                self.__emit(dict(data))
+            elif isinstance(data, list):
+                self.__emit(list(data))
+            else:
+                self.__emit(data.isoformat())
+        else:
+            # floats, None, subclasses, custom types, ...
+            self.__emit_node(self.represent_data(data))
+
+    def __emit_node(self, node: Node):
+        if isinstance(node, ScalarNode):
+            self.__emit_scalar(node.tag, node.value, node.style)
+        elif isinstance(node, SequenceNode):
+            implicit = node.tag == self.resolve(SequenceNode, node.value, True)
+            self.emit(SequenceStartEvent(None, node.tag, implicit, node.flow_style))
+            for item in node.value:
+                self.__emit_node(item)
+            self.emit(SequenceEndEvent())
+        elif isinstance(node, MappingNode):
+            implicit = node.tag == self.resolve(MappingNode, node.value, True)
+            self.emit(MappingStartEvent(None, node.tag, implicit, node.flow_style))
+            for key, value in node.value:
+                self.__emit_node(key)
+                self.__emit_node(value)
+            self.emit(MappingEndEvent())
+
+    def __emit_scalar(self, tag: str, value: str, style: Optional[str] = None):
+        implicit = self.__implicit.get((tag, value))
+        if implicit is None:
+            # the same keys and values repeat many times in a manifest
+            implicit = self.__implicit[tag, value] = (
+                tag == self.resolve(ScalarNode, value, (True, False)),
+                tag == self.resolve(ScalarNode, value, (False, True)),
+            )
+
+        self.emit(ScalarEvent(None, tag, implicit, value, style=style))
+
+
+ManifestDumper.add_representer(str, _represent_str)
+
+
+class Serializer:
+    """Base class of manifest serializers.
+
+    Subclasses set `name` (to select them by), `extension` of the files
+    and implement `dumps`, `end` is written after the manifest by `to_file`.
+    See `register_serializer`.
+
+    Subclasses may implement `dump` to serialize models directly, without
+    sanitizing them into a dict first.
+    """
+
+    name: str
+    extension: str
+    end: str = ""
+
+    def dumps(self, obj: Dict[str, Any], **kwargs) -> str:
+        """Serialize the manifest into a string."""
+        raise NotImplementedError
+
+    def dump(self, obj: Any, stream: IO[str], **kwargs):
+        """Serialize the manifest or a model into a stream."""
+        stream.write(self.dumps(_utils.sanitize_for_serialization(obj), **kwargs))
+
+    def dump_all(self, objs: Iterable[Any], stream: IO[str], **kwargs) -> int:
+        """Serialize manifests or models into a multi-document stream.
+
+        Documents are written one by one, each followed by a newline.
+
+        :returns: int, number of documents written
+        """
+        count = 0
+        for count, obj in enumerate(objs, 1):
+            self.dump(obj, stream, **kwargs)
+            stream.write("\n")
+
+        return count
+
+
+class YAMLSerializer(Serializer):
+    """YAML serializer, multi-line strings are dumped as block literals."""
+
+    name = "yaml"
+    extension = "yaml"
+    end = "\n"
+
+    def __init__(self, dumper: Type[yaml.BaseDumper] = ManifestDumper):
+        """Create YAML serializer.
+
+        :param dumper: PyYAML dumper class [ManifestDumper]
+        """
+        self.dumper = dumper
+
+    def dumps(self, obj: Dict[str, Any], **kwargs) -> str:
+        opts = dict(default_flow_style=False)
+        opts.update(kwargs)
+
+        return yaml.dump(obj, Dumper=self.dumper, **opts)
+
+    def dump(self, obj: Any, stream: IO[str], **kwargs):
+        if not issubclass(self.dumper, ManifestDumper):
+            return super().dump(obj, stream, **kwargs)
+
+        opts = dict(default_flow_style=False)
+        opts.update(kwargs)
+
+        # models are emitted as they're walked, see `ManifestDumper`
+        yaml.dump(obj, stream, Dumper=self.dumper, **opts)
+
+    def dump_all(self, objs: Iterable[Any], stream: IO[str], **kwargs) -> int:
+        """Serialize manifests or models into a stream of YAML documents.
+
+        Each document starts with the `---` marker.
+
+        :returns: int, number of documents written
+        """
+        kwargs.setdefault("explicit_start", True)
+
+        count = 0
+        for count, obj in enumerate(objs, 1):
+            self.dump(obj, stream, **kwargs)
+
+        return count
+
+
+class JSONSerializer(Serializer):
+    """JSON serializer, the fastest one."""
+
+    name = "json"
+    extension = "json"
+
+    def dumps(self, obj: Dict[str, Any], **kwargs) -> str:
+        return json.dumps(obj, **kwargs)
+
+    def dump(self, obj: Any, stream: IO[str], **kwargs):
+        # models are converted one at a time by the encoder, the C encoder
+        # of `json.dumps` is much faster than the streaming `json.dump`
+        kwargs.setdefault("default", _json_default)
+
+        stream.write(json.dumps(obj, **kwargs))
+
+    def dump_all(self, objs: Iterable[Any], stream: IO[str], **kwargs) -> int:
+        """Serialize manifests or models into a JSON lines stream.
+
+        :raises: ValueError if indentation is requested
+        """
+        if kwargs.get("indent") is not None:
+            raise ValueError("JSON lines can not be indented.")
+
+        return super().dump_all(objs, stream, **kwargs)
+
+
+__serializers: Dict[str, Serializer] = {}
+__default: str = "yaml"
+
+
+def register_serializer(serializer: Serializer):
+    """Register a serializer (replacing a serializer of the same name)."""
+    __serializers[serializer.name] = serializer
+
+
+def set_default_serializer(name: str):
+    """Set the serializer used when none is given.
+
+    :raises: ValueError if there is no such serializer
+    """
+    global __default
+
+    get_serializer(name)
+    __default = name
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """Return serializer by its name, the default one if no name is given.
+
+    :raises: ValueError if there is no such serializer
+    """
+    serializer: Optional[Serializer] = __serializers.get(name or __default)
+    if serializer is None:
+        raise ValueError(
+            f"Unknown serializer '{name}', expected one of {sorted(__serializers)}."
+        )
+
+    return serializer
+
+
+def get_yaml_serializer(name: Optional[str] = None) -> YAMLSerializer:
+    """Return YAML serializer by its name, see `to_yaml`.
+
+    If no name is given, the default serializer is returned if it is
+    a YAML serializer, the `yaml` serializer otherwise.
+
+    :raises: ValueError if there is no such YAML serializer
+    """
+    if name is None:
+        name = __default if isinstance(get_serializer(), YAMLSerializer) else "yaml"
+
+    serializer: Serializer = get_serializer(name)
+    if not isinstance(serializer, YAMLSerializer):
+        raise ValueError(
+            f"Serializer '{name}' does not emit YAML, use `dumps` or `to_file`."
+        )
+
+    return serializer
+
+
+register_serializer(YAMLSerializer())
+register_serializer(JSONSerializer())
+
+
+def _compiled(obj: Any) -> Any:
+    """Return the object compiled if it is a DSL object, see `to_file`."""
+    compile_deferred = getattr(type(obj), "__compile_deferred__", None)
+    if compile_deferred is None:
+        return obj  # a model or a manifest
+
+    compile_deferred()
+
+    if obj.model is None and obj.spec is type(obj).spec:
+        obj.compile()
+
+    return obj
+
+
+def dump_all(
+    objs: Iterable[Any],
+    fp: Union[str, Path, IO[str]],
+    fmt: Optional[str] = None,
+    *,
+    buffer_size: int = 1024 ** 2,
+    **kwargs,
+) -> int:
+    """Write DSL objects into a single multi-document stream.
+
+    Workflows, CronWorkflows and WorkflowTemplates (as well as models
+    and manifests) are compiled and written one by one, as they're produced
+    by the iterable. YAML documents are separated by `---`, JSON documents
+    are written as JSON lines. Only the document being written is held
+    in memory, the file is flushed whenever `buffer_size` characters
+    are buffered. A file is replaced once all the documents are written.
+
+    :param fp: file path or a text stream to write to
+    :param fmt: str, name of the serializer, see `get_serializer` [default]
+    :param buffer_size: int, size of the write buffer of the file [1 MiB]
+    :returns: int, number of documents written
+    :raises: ValueError if there is no such serializer
+    """
+    serializer: Serializer = get_serializer(fmt)
+
+    documents: Iterable[Any] = map(_compiled, objs)
+
+    if not isinstance(fp, (str, Path)):
+        return serializer.dump_all(documents, fp, **kwargs)
+
+    with _utils.atomic_open(fp, buffering=buffer_size) as f:
+        return serializer.dump_all(documents, f, **kwargs)
+
+
+def digest(obj: Any) -> str:
+    """Return SHA-256 digest of the canonical JSON serialization of the object.
+
+    DSL objects are compiled first, see `dump_all`.
+    """
+    canonical: str = json.dumps(
+        _compiled(obj),
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,196 @@
+"""Indexed view of the node statuses of a workflow, deserialized on demand."""
+
+import json
+import logging
+
+from collections import defaultdict
+
+from dateutil.parser import isoparse
+
+from typing import Any
+from typing import DefaultDict
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+from argo.workflows.client.models import V1alpha1NodeStatus
+
+from . import _utils
+
+__all__ = ["NodeStatusView"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+_Ids = Dict[str, Any]
+
+
+class NodeStatusView:
+    """Node statuses of a workflow, indexed by phase, template and boundary.
+
+    The nodes are kept as decoded JSON and indexed by a single pass over
+    them, a node is deserialized into V1alpha1NodeStatus only when it is
+    accessed. Queries by the indexes take time proportional to the number
+    of the nodes of the smallest index they use.
+
+    Usage:
+
+        nodes = NodeStatusView.of(wf)
+        for node in nodes.select(phase="Failed", leaf=True):
+            print(node.display_name, node.message, nodes.duration(node.id))
+    """
+
+    def __init__(self, nodes: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Index node statuses of a manifest, see `of`.
+
+        :param nodes: decoded JSON of `status.nodes`, by id,
+            which must not be modified
+        """
+        self._nodes: Dict[str, Dict[str, Any]] = nodes or {}
+        self._models: Dict[str, V1alpha1NodeStatus] = {}
+
+        # indexes are ordered sets of ids, i.e. dicts of None
+        self._by_phase: DefaultDict[Optional[str], _Ids] = defaultdict(dict)
+        self._by_template: DefaultDict[Optional[str], _Ids] = defaultdict(dict)
+        self._by_boundary: DefaultDict[Optional[str], _Ids] = defaultdict(dict)
+        self._parents: Dict[str, str] = {}
+        self._leaves: _Ids = {}
+
+        for node_id, node in self._nodes.items():
+            self._by_phase[node.get("phase")][node_id] = None
+            self._by_template[node.get("templateName")][node_id] = None
+            self._by_boundary[node.get("boundaryID")][node_id] = None
+
+            children: Optional[List[str]] = node.get("children")
+            if children:
+                for child in children:
+                    self._parents[child] = node_id
+            else:
+                self._leaves[node_id] = None
+
+    @classmethod
+    def of(cls, wf: Any) -> "NodeStatusView":
+        """Return the view of node statuses of the workflow.
+
+        The nodes of a manifest, or of a model deserialized lazily whose
+        status has not been accessed yet, are indexed without being
+        deserialized, see `Workflow.from_dict`.
+
+        :param wf: Workflow, V1alpha1Workflow or its manifest
+        """
+        status: Any
+        if isinstance(wf, dict):
+            status = wf.get("status")
+        else:
+            status = getattr(wf, "status", None)
+
+        if not status:
+            return cls()
+
+        if isinstance(status, dict):
+            return cls(status.get("nodes"))
+
+        data: Optional[Dict[str, Any]] = _utils.lazy_data(status)
+        if data is not None:
+            return cls(data.get("nodes"))
+
+        _LOGGER.debug("Serializing deserialized node statuses for the view.")
+        return cls(_utils.sanitize_for_serialization(status.nodes))
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes, IO[Any]]) -> "NodeStatusView":
+        """Return the view of node statuses of a JSON workflow manifest."""
+        if not isinstance(data, (str, bytes)):
+            data = data.read()
+
+        return cls.of(json.loads(data))
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes)
+
+    def __contains__(self, node_id: Any) -> bool:
+        return node_id in self._nodes
+
+    def __getitem__(self, node_id: str) -> V1alpha1NodeStatus:
+        model: Optional[V1alpha1NodeStatus] = self._models.get(node_id)
+        if model is None:
+            model = _utils.to_model(self._nodes[node_id], V1alpha1NodeStatus)
+            self._models[node_id] = model
+
+        return model
+
+    def raw(self, node_id: str) -> Dict[str, Any]:
+        """Return decoded JSON of the node, which must not be modified."""
+        return self._nodes[node_id]
+
+    def phases(self) -> Dict[Optional[str], int]:
+        """Return numbers of nodes by phase."""
+        return {phase: len(ids) for phase, ids in self._by_phase.items()}
+
+    def parent(self, node_id: str) -> Optional[str]:
+        """Return id of the node which has the node as a child, if any."""
+        return self._parents.get(node_id)
+
+    def children(self, node_id: str) -> List[str]:
+        """Return ids of child nodes of the node."""
+        return list(self._nodes[node_id].get("children") or [])
+
+    def duration(self, node_id: str) -> Optional[float]:
+        """Return seconds the node has run for, None unless finished."""
+        node: Dict[str, Any] = self._nodes[node_id]
+
+        started_at: Optional[str] = node.get("startedAt")
+        finished_at: Optional[str] = node.get("finishedAt")
+        if not started_at or not finished_at:
+            return None
+
+        return (isoparse(finished_at) - isoparse(started_at)).total_seconds()
+
+    def ids(
+        self,
+        *,
+        phase: Optional[str] = None,
+        template: Optional[str] = None,
+        boundary: Optional[str] = None,
+        leaf: Optional[bool] = None,
+    ) -> List[str]:
+        """Return ids of nodes matching all of the given criteria.
+
+        :param phase: str, e.g. "Failed"
+        :param template: str, name of the template of the nodes
+        :param boundary: str, id of the boundary node (DAG or steps) of the nodes
+        :param leaf: bool, whether the nodes have no children
+        """
+        candidates: List[_Ids] = []
+        if phase is not None:
+            candidates.append(self._by_phase.get(phase, {}))
+        if template is not None:
+            candidates.append(self._by_template.get(template, {}))
+        if boundary is not None:
+            candidates.append(self._by_boundary.get(boundary, {}))
+        if leaf:
+            candidates.append(self._leaves)
+
+        if not candidates:
+            candidates.append(self._nodes)
+
+        # the smallest index is filtered by the others
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+
+        return [
+            i
+            for i in smallest
+            if all(i in other for other in others)
+            and (leaf is not False or i not in self._leaves)
+        ]
+
+    def select(self, **criteria: Any) -> List[V1alpha1NodeStatus]:
+        """Return nodes matching all of the given criteria, see `ids`."""
+        return [self[i] for i in self.ids(**criteria)]
@@ -0,0 +1,440 @@
+"""Batch submission of workflows."""
+
+import json
+import logging
+import re
+import time
+import traceback
+import urllib3
+import uuid
+
+from collections import deque
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+from inflection import camelize
+
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from urllib.parse import quote
+from urllib.parse import urlencode
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import CronWorkflowServiceApi
+from argo.workflows.client import WorkflowServiceApi
+from argo.workflows.client.models import V1ObjectMeta
+from argo.workflows.client.rest import ApiException
+from argo.workflows.client.rest import RESTResponse
+
+from . import _http
+from . import _registry
+from . import _retry
+from . import _utils
+from ._cronworkflow import CronWorkflow
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+from ._workflow import Workflow
+
+__all__ = ["submit_many", "submit_sweep", "SubmitResult", "SubmitResults"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SubmitResult(NamedTuple):
+    """Result of submission of a single workflow."""
+
+    obj: Any  # the workflow, or parameters of a sweep variant
+    created: Optional[Any]  # None if the submission failed
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the workflow has been submitted successfully."""
+        return self.error is None
+
+
+class SubmitResults(List[SubmitResult]):
+    """Results of a batch submission, in order, and their totals."""
+
+    def __init__(self, results: Iterable[SubmitResult] = (), duration: float = 0.0):
+        super().__init__(results)
+        self.duration: float = duration  # of the whole batch
+
+    @property
+    def succeeded(self) -> int:
+        """Return number of the workflows submitted successfully."""
+        return sum(r.ok for r in self)
+
+    @property
+    def failed(self) -> int:
+        """Return number of the failed submissions."""
+        return len(self) - self.succeeded
+
+    @property
+    def rate(self) -> float:
+        """Return number of the submissions per second."""
+        return len(self) / self.duration if self.duration else 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Return whether all the workflows have been submitted successfully."""
+        return all(r.ok for r in self)
+
+
+def _check_pool(client: ApiClient, concurrency: int):
+    maxsize: Optional[int] = client.configuration.connection_pool_maxsize
+    if maxsize is not None and maxsize < concurrency:
+        _LOGGER.debug(
+            "The connection pool holds %d connections for %d concurrent"
+            " submissions, the rest is reconnected for every request.",
+            maxsize,
+            concurrency,
+        )
+
+
+def _pipeline(
+    submit: Callable[[T], Any],
+    items: Iterable[T],
+    concurrency: int,
+    what: str = "workflows",
+) -> SubmitResults:
+    """Submit items by a bounded pool of threads, return results in order.
+
+    Results are expected to have the `ok` property, see `SubmitResult`.
+    """
+    results: List[Any] = []
+    pending: Deque[Future] = deque()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for item in items:
+            if len(pending) >= 2 * concurrency:
+                results.append(pending.popleft().result())
+
+            pending.append(executor.submit(submit, item))
+
+        results.extend(future.result() for future in pending)
+
+    submitted = SubmitResults(results, time.perf_counter() - start)
+    _LOGGER.info(
+        "Submitted %d %s in %.2fs (%.1f/s), %d failed.",
+        submitted.succeeded,
+        what,
+        submitted.duration,
+        submitted.rate,
+        submitted.failed,
+    )
+
+    return submitted
+
+
+def _submit(
+    obj: Union[Workflow, CronWorkflow],
+    namespace: str,
+    services: Dict[type, Any],
+    retry: Optional[RetryPolicy],
+    limiter: Optional[RateLimiter],
+    by_reference: bool = False,
+) -> SubmitResult:
+    """Submit a single workflow by the shared service."""
+    start = time.perf_counter()
+    try:
+        kwargs: Dict[str, Any] = {}
+        if isinstance(obj, CronWorkflow):
+            service = services[CronWorkflowServiceApi]
+        elif isinstance(obj, Workflow):
+            service = services[WorkflowServiceApi]
+            kwargs["by_reference"] = by_reference
+        else:
+            raise TypeError(f"Expected Workflow or CronWorkflow, got: {type(obj)}")
+
+        created: Any = obj.submit(
+            service.api_client,
+            namespace,
+            service=service,
+            retry=retry,
+            limiter=limiter,
+            **kwargs,
+        )
+    except Exception:
+        duration = time.perf_counter() - start
+        return SubmitResult(obj, None, duration, traceback.format_exc())
+
+    return SubmitResult(obj, created, time.perf_counter() - start)
+
+
+def submit_many(
+    client: ApiClient,
+    namespace: str,
+    workflows: Iterable[Union[Workflow, CronWorkflow]],
+    concurrency: int = 8,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+    by_reference: bool = False,
+) -> SubmitResults:
+    """Submit workflows concurrently, by a bounded pool of threads.
+
+    The submissions share the client's connection pool, which should hold
+    at least `concurrency` connections, see
+    `Configuration.connection_pool_maxsize`. Workflows are consumed from
+    the iterable as the submissions progress, at most a few per thread
+    are pending at a time.
+
+    Failures do not abort the batch, they're reported in the results.
+
+    :param workflows: Workflows and/or CronWorkflows to submit
+    :param concurrency: int, number of concurrent submissions [8]
+    :param retry: RetryPolicy, retries of failed submissions, see `submit`
+    :param limiter: RateLimiter, limit of the rate of the submissions
+    :param by_reference: bool, whether to submit Workflows by reference
+        to their registered WorkflowTemplates, see `Workflow.submit`
+    :returns: SubmitResults, list of the results in order of the workflows,
+        with the totals and the rate of the batch
+    """
+    _check_pool(client, concurrency)
+
+    services: Dict[type, Any] = {
+        WorkflowServiceApi: WorkflowServiceApi(api_client=client),
+        CronWorkflowServiceApi: CronWorkflowServiceApi(api_client=client),
+    }
+
+    return _pipeline(
+        lambda obj: _submit(obj, namespace, services, retry, limiter, by_reference),
+        workflows,
+        concurrency,
+    )
+
+
+class _RequestTemplate:
+    """Create request of a Workflow, serialized once for variants of parameters.
+
+    Only the parameters (and the idempotency key) are rendered into
+    the serialized request, so that a variant costs the same regardless
+    of the size of the Workflow.
+    """
+
+    _SLOT = re.compile(r'"(__argo_dsl_(?:parameters|key)__)"')
+
+    def __init__(
+        self,
+        wf: Workflow,
+        idempotent: bool = False,
+        reference: Optional[_registry.Reference] = None,
+    ):
+        type(wf).__compile_deferred__()
+
+        manifest: Dict[str, Any]
+        if reference is not None:
+            manifest = reference.manifest()
+        elif not getattr(wf, "validated", True):
+            manifest = camelize(wf.to_dict())
+        else:
+            manifest = _utils.sanitize_for_serialization(wf)
+
+        # the manifest is shallow-copied along the patched paths
+        spec: Dict[str, Any] = dict(manifest.get("spec") or {})
+        manifest = {**manifest, "spec": spec}
+
+        self.declared: Optional[List[Dict[str, Any]]] = None
+        if spec.get("arguments"):
+            arguments: Dict[str, Any] = spec["arguments"]
+            self.declared = list(arguments.get("parameters") or [])
+
+            spec["arguments"] = {**arguments, "parameters": "__argo_dsl_parameters__"}
+
+        if idempotent:
+            metadata: Dict[str, Any] = manifest.get("metadata") or {}
+            labels: Dict[str, str] = {
+                **(metadata.get("labels") or {}),
+                _retry.IDEMPOTENCY_LABEL: "__argo_dsl_key__",
+            }
+            manifest["metadata"] = {**metadata, "labels": labels}
+
+        text: str = json.dumps({"workflow": manifest}, separators=(",", ":"))
+
+        # literal parts alternate with names of the slots
+        self._parts: List[str] = self._SLOT.split(text)
+
+    def parameters(self, values: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Return parameters of the variant, see `Workflow.submit`."""
+        return _registry.parameters(self.declared, values)
+
+    def render(self, values: Dict[str, str], key: Optional[str] = None) -> bytes:
+        """Return the serialized request of the variant."""
+        slots: Dict[str, str] = {
+            "__argo_dsl_parameters__": json.dumps(self.parameters(values)),
+            "__argo_dsl_key__": json.dumps(key),
+        }
+
+        parts: List[str] = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = slots[parts[i]]
+
+        return "".join(parts).encode("utf-8")
+
+
+def _request(
+    client: ApiClient,
+    method: str,
+    path: str,
+    *,
+    path_params: Optional[Dict[str, str]] = None,
+    query: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+    timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """Send a serialized request by the client's connection pool.
+
+    The path parameters are quoted and the request is authenticated as by
+    the client, see `ApiClient.call_api`, the proxy is a part of the connection
+    pool. Unlike `ApiClient.call_api`, the body is sent as it is.
+
+    :param path: str, path of the resource, e.g. '/api/v1/workflows/{namespace}'
+    """
+    headers: Dict[str, str] = {
+        **client.default_headers,
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+    if client.cookie:
+        headers["Cookie"] = client.cookie
+
+    params: List[Tuple[str, str]] = list((query or {}).items())
+    client.update_params_for_auth(
+        headers, params, list(client.configuration.auth_settings())
+    )
+
+    for name, value in (path_params or {}).items():
+        path = path.replace(
+            f"{{{name}}}",
+            quote(value, safe=client.configuration.safe_chars_for_path_param),
+        )
+
+    url: str = client.configuration.host + path
+    if params:
+        url += "?" + urlencode(params)
+
+    resp = RESTResponse(
+        client.rest_client.pool_manager.request(
+            method,
+            url,
+            body=body,
+            headers=headers,
+            timeout=urllib3.Timeout(total=timeout),
+        )
+    )
+    if not 200 <= resp.status <= 299:
+        raise ApiException(http_resp=resp)
+
+    return json.loads(resp.data)
+
+
+def _submit_variant(
+    client: ApiClient,
+    namespace: str,
+    template: _RequestTemplate,
+    values: Dict[str, str],
+    retry: Optional[RetryPolicy],
+    limiter: Optional[RateLimiter],
+    timeout: Optional[float],
+) -> SubmitResult:
+    """Submit a single variant of the sweep."""
+    path = "/api/v1/workflows/{namespace}"
+    path_params = {"namespace": namespace}
+    key: Optional[str] = uuid.uuid4().hex if retry is not None else None
+
+    def create() -> V1ObjectMeta:
+        body: bytes = template.render(values, key)
+        data = _request(
+            client, "POST", path, path_params=path_params, body=body, timeout=timeout
+        )
+        return _utils.to_model(data.get("metadata") or {}, V1ObjectMeta)
+
+    def find() -> Optional[V1ObjectMeta]:
+        query = {"listOptions.labelSelector": f"{_retry.IDEMPOTENCY_LABEL}={key}"}
+        found = _request(
+            client, "GET", path, path_params=path_params, query=query, timeout=timeout
+        )
+        items = found.get("items") or []
+        if not items:
+            return None
+
+        return _utils.to_model(items[0].get("metadata") or {}, V1ObjectMeta)
+
+    start = time.perf_counter()
+    try:
+        created: V1ObjectMeta = _retry.call(
+            create, find if key else None, retry=retry, limiter=limiter
+        )
+    except Exception:
+        duration = time.perf_counter() - start
+        return SubmitResult(values, None, duration, traceback.format_exc())
+
+    return SubmitResult(values, created, time.perf_counter() - start)
+
+
+def submit_sweep(
+    client: ApiClient,
+    namespace: str,
+    workflow: Workflow,
+    variants: Iterable[Dict[str, str]],
+    concurrency: int = 8,
+    *,
+    retry: Optional[RetryPolicy] = None,
+    limiter: Optional[RateLimiter] = None,
+    by_reference: bool = False,
+    timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+) -> SubmitResults:
+    """Submit a Workflow once for every variant of its parameters.
+
+    The Workflow is serialized once and only the parameters are patched
+    into the request of each variant, the Workflow itself is not modified.
+    Variants are consumed from the iterable as the submissions progress,
+    see `submit_many`.
+
+    :param variants: parameters of the variants, see `Workflow.submit`
+    :param concurrency: int, number of concurrent submissions [8]
+    :param retry: RetryPolicy, retries of failed submissions, see `submit`
+    :param limiter: RateLimiter, limit of the rate of the submissions
+    :param by_reference: bool, whether to register the Workflow and submit
+        the variants by reference, see `Workflow.submit`
+    :param timeout: float, seconds to wait for the server to respond
+        to a request [60]
+    :returns: SubmitResults, results in order of the variants, with
+        the parameters as `obj` and metadata of the created Workflow,
+        see `submit_many`
+    """
+    _check_pool(client, concurrency)
+
+    reference: Optional[_registry.Reference] = None
+    if by_reference:
+        reference = _registry.reference(workflow)
+        _registry.register(client, namespace, reference, retry=retry, limiter=limiter)
+
+    template = _RequestTemplate(
+        workflow, idempotent=retry is not None, reference=reference
+    )
+
+    return _pipeline(
+        lambda values: _submit_variant(
+            client, namespace, template, values, retry, limiter, timeout
+        ),
+        variants,
+        concurrency,
+    )
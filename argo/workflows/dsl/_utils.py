@@ -1,19 +1,62 @@
+import ast
+import contextlib
+import copy
+import dateutil.parser
+import inspect
+import json
+import linecache
+import os
 import re
+import textwrap
+import threading
+import time
+import uuid
 import yaml
 
+from datetime import date
+from datetime import datetime
+
+from functools import lru_cache
+from functools import partial
+
+from pathlib import Path
+
+from types import CodeType
+
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Type
+from typing import Union
 
-from uuid import uuid4
+from argo.workflows.client import Configuration
+from argo.workflows.client import models
+from argo.workflows.client.rest import ApiException
 
 try:
     from yaml import CDumper as Dumper
+    from yaml import CSafeLoader as SafeLoader
 except ImportError:
     from yaml import Dumper
+    from yaml import SafeLoader
 
 """Argo Workflow Python DSL utilities."""
 
-__mark = "___%s" % uuid4()
+# temporary files of `atomic_open`, removed after this many seconds by `evict`
+# if their writers crashed
+_TMP_INFIX = ".tmp-"
+_STALE_TMP_SECONDS = 3600
+
+# source lines of files and the lines of functions they define, see `getsourcelines`
+__function_index: Dict[str, Tuple[List[str], Dict[int, int]]] = {}
 
 
 class BlockDumper(Dumper):
@@ -26,46 +69,451 @@ class BlockDumper(Dumper):
         return super().represent_scalar(tag, value, style)
 
 
-def _omitempty_rec(obj: Dict[str, Any]):
-    obj[__mark] = True
+def omitempty(obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Return copy of the object with empty values omitted.
+
+    None values are omitted from dictionaries at any depth, including
+    dictionaries in (nested) lists. The object itself is not modified.
+    Sub-objects shared within the object are copied only once and stay
+    shared in the copy.
+    """
     result: Dict[str, Any] = {}
 
-    for k, v in obj.items():
-        if k == __mark:
+    # copies of the containers visited so far, by id of the original
+    copies: Dict[int, Any] = {id(obj): result}
+    memo = copies.setdefault
+
+    # containers to be copied, the copies are already referenced by their parents
+    stack: List[Tuple[Any, Any]] = [(obj, result)]
+
+    while stack:
+        src, dst = stack.pop()
+
+        if isinstance(src, dict):
+            for k, v in src.items():
+                if v is None:  # empty
+                    continue
+
+                if isinstance(v, dict):
+                    pruned: Any = {}
+                elif isinstance(v, list):
+                    pruned = []
+                else:
+                    dst[k] = v
+                    continue
+
+                dst[k] = memo(id(v), pruned)
+                if dst[k] is pruned:
+                    stack.append((v, pruned))
+        else:
+            for v in src:
+                if isinstance(v, dict):
+                    pruned = {}
+                elif isinstance(v, list):
+                    pruned = []
+                else:
+                    dst.append(v)
+                    continue
+
+                dst.append(memo(id(v), pruned))
+                if dst[-1] is pruned:
+                    stack.append((v, pruned))
+
+    return result
+
+
+# overrides ARGO_DSL_LAZY in the thread, see `deferred_compilation`
+_LAZY = threading.local()
+
+
+def lazy_compilation() -> bool:
+    """Return whether DSL classes are compiled lazily by default.
+
+    Set the ARGO_DSL_LAZY environment variable to defer compilation
+    of all DSL classes which do not specify `lazy` explicitly.
+    """
+    lazy: Optional[bool] = getattr(_LAZY, "lazy", None)
+    if lazy is not None:
+        return lazy
+
+    return os.getenv("ARGO_DSL_LAZY", "").lower() in ("1", "true", "yes")
+
+
+@contextlib.contextmanager
+def deferred_compilation(lazy: bool = True) -> Iterator[None]:
+    """Override the default of `lazy_compilation` for classes defined within."""
+    previous: Optional[bool] = getattr(_LAZY, "lazy", None)
+    _LAZY.lazy = lazy
+    try:
+        yield
+    finally:
+        _LAZY.lazy = previous
+
+
+def _index_functions(lines: List[str]) -> Dict[int, int]:
+    """Return map of first lines of functions (including decorators) to last lines."""
+    try:
+        tree = ast.parse("".join(lines))
+    except SyntaxError:
+        return {}
+
+    index: Dict[int, int] = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
             continue
 
-        if v is None:  # empty
+        end: Optional[int] = getattr(node, "end_lineno", None)  # Python 3.8+
+        if end is None:
             continue
 
-        if isinstance(v, dict) and __mark not in v:
-            result[k] = _omitempty_rec(v)
-        elif isinstance(v, list):
-            result[k] = list(
-                map(lambda d: _omitempty_rec(d) if isinstance(d, dict) else d, v)
+        # trailing comments indented as the body belong to the function
+        body_col: int = node.body[0].col_offset
+        for i in range(end, len(lines)):
+            line = lines[i].lstrip()
+            if line.startswith("#") and len(lines[i]) - len(line) >= body_col:
+                end = i + 1
+            elif line:
+                break
+
+        start = min([node.lineno, *(d.lineno for d in node.decorator_list)])
+        index[start] = end
+
+    return index
+
+
+@lru_cache(maxsize=4096)
+def getsourcelines(code: CodeType) -> Tuple[str, ...]:
+    """Return source lines of a code object.
+
+    The lines are cached per code object, scoped objects shared
+    by many closures are read only once. Each source file is parsed
+    once to find the functions it defines, instead of tokenizing
+    the file for every function like `inspect.getsourcelines` does.
+    """
+    filename: str = code.co_filename
+
+    linecache.checkcache(filename)
+    lines: List[str] = linecache.getlines(filename)
+
+    cached = __function_index.get(filename)
+    if cached is None or cached[0] is not lines:
+        # the file has not been indexed yet or it has changed since
+        cached = __function_index[filename] = (lines, _index_functions(lines))
+
+    end: Optional[int] = cached[1].get(code.co_firstlineno)
+    if end is None:
+        source: List[str]
+        source, _ = inspect.getsourcelines(code)
+
+        return tuple(source)
+
+    return tuple(lines[code.co_firstlineno - 1 : end])
+
+
+@lru_cache(maxsize=4096)
+def split_imports(source: str) -> Tuple[FrozenSet[str], FrozenSet[str], str]:
+    """Split import statements (at any depth) from the rest of the source.
+
+    Blank lines following an import are dropped together with the import.
+
+    :returns: Tuple of `import` lines, `from` import lines and the remaining source
+    """
+    lines: List[str] = source.splitlines(keepends=True)
+
+    imports: Set[str] = set()
+    from_imports: Set[str] = set()
+    hoisted: Set[int] = set()
+
+    try:
+        tree = ast.parse(textwrap.dedent(source))
+    except SyntaxError:
+        # not a valid Python code, fall back to scanning the lines
+        nodes = [
+            (i, i, "from " in line)
+            for i, line in enumerate(lines, 1)
+            if "import " in line
+        ]
+    else:
+        nodes = [
+            (
+                node.lineno,
+                getattr(node, "end_lineno", node.lineno),  # Python 3.8+
+                isinstance(node, ast.ImportFrom),
             )
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+        ]
+
+    for start, end, is_from in nodes:
+        if start in hoisted:
+            continue  # multiple statements on a single line
+
+        statement = textwrap.dedent("".join(lines[start - 1 : end]))
+        (from_imports if is_from else imports).add(statement)
+
+        hoisted.update(range(start, end + 1))
+        # blank line separating imports
+        if end < len(lines) and not lines[end].strip():
+            hoisted.add(end + 1)
+
+    rest = "".join(line for i, line in enumerate(lines, 1) if i not in hoisted)
+
+    return frozenset(imports), frozenset(from_imports), rest
+
+
+def hoist_imports(*sources: str) -> str:
+    """Join sources and hoist their import statements to the top.
+
+    Imports are deduplicated, `import` and `from` imports are sorted separately.
+    """
+    imports: Set[str] = set()
+    from_imports: Set[str] = set()
+    rest: List[str] = []
+
+    for source in sources:
+        source_imports, source_from_imports, source_rest = split_imports(source)
+
+        imports.update(source_imports)
+        from_imports.update(source_from_imports)
+        rest.append(source_rest)
+
+    return "".join((*sorted(imports), "\n", *sorted(from_imports), "\n", *rest))
+
+
+class _ModelSerializer:
+    """Serializer and deserializer of models.
+
+    Models are (de)serialized by their `openapi_types` and `attribute_map`,
+    the same way as by `ApiClient`, without the REST pool manager
+    and the default headers of a client. Deserialized models share
+    the configuration of the serializer instead of creating their own.
+
+    The deserializers of OpenAPI types and the fields of model classes
+    are resolved once, instead of parsing the type names for every value.
+
+    The serializer holds no state other than these caches, a single instance
+    is shared by all threads.
+    """
+
+    PRIMITIVE_TYPES = (float, bool, bytes, str, int)
+    NATIVE_TYPES_MAPPING: Dict[str, Any] = {
+        "int": int,
+        "long": int,
+        "float": float,
+        "str": str,
+        "bool": bool,
+        "date": date,
+        "datetime": datetime,
+        "object": object,
+    }
+
+    def __init__(self):
+        self.configuration = Configuration.get_default_copy()
+
+        self.__parsers: Dict[Tuple[Any, bool], Callable[[Any], Any]] = {}
+        self.__fields: Dict[Type[Any], Tuple[Tuple[str, str, str], ...]] = {}
+
+    def sanitize_for_serialization(self, obj: Any) -> Any:
+        """Return JSON serializable form of the object, see `ApiClient`."""
+        if obj is None or isinstance(obj, self.PRIMITIVE_TYPES):
+            return obj
+        if isinstance(obj, list):
+            return [self.sanitize_for_serialization(item) for item in obj]
+        if isinstance(obj, tuple):
+            return tuple(self.sanitize_for_serialization(item) for item in obj)
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+
+        if isinstance(obj, dict):
+            items: Dict[str, Any] = obj
         else:
-            result[k] = v
+            items = {}
+            for attr in obj.openapi_types:
+                value: Any = getattr(obj, attr)
+                if value is not None:
+                    items[obj.attribute_map[attr]] = value
 
-    return result
+        return {k: self.sanitize_for_serialization(v) for k, v in items.items()}
 
+    def deserialize(self, data: str, klass: Any) -> Any:
+        """Deserialize JSON data into an instance of the (OpenAPI) type."""
+        try:
+            decoded: Any = json.loads(data)
+        except ValueError:
+            decoded = data
 
-def _remove_marks(obj: Dict[str, Any]):
-    if __mark not in obj:
-        return
-    del obj[__mark]
-    for v in obj.values():
-        if isinstance(v, dict):
-            _remove_marks(v)
+        return self.to_model(decoded, klass)
 
+    def to_model(self, data: Any, klass: Any, lazy: bool = False) -> Any:
+        """Deserialize decoded JSON data into an instance of the (OpenAPI) type.
 
-def omitempty(obj: Dict[str, Any]) -> Dict[str, Any]:
-    """Return copy of the object with empty values omitted."""
+        :param lazy: bool, whether to defer deserialization of nested models
+            until they're accessed, see `_lazy_class`
+        """
+        if data is None:
+            return None
+
+        parser: Optional[Callable[[Any], Any]] = self.__parsers.get((klass, lazy))
+        if parser is None:
+            parser = self.__parsers[klass, lazy] = self.__parser(klass, lazy)
+
+        return parser(data)
+
+    def build_model(self, data: Dict[str, Any], klass: Type[Any], lazy: bool) -> Any:
+        """Build the model, deserializing the values of its fields."""
+        fields = self.__fields.get(klass)
+        if fields is None:
+            fields = self.__fields[klass] = tuple(
+                (attr, klass.attribute_map[attr], attr_type)
+                for attr, attr_type in klass.openapi_types.items()
+            )
+
+        kwargs: Dict[str, Any] = {}
+        for attr, key, attr_type in fields:
+            if key in data:
+                kwargs[attr] = self.to_model(data[key], attr_type, lazy)
+
+        return klass(local_vars_configuration=self.configuration, **kwargs)
+
+    def __parser(self, klass: Any, lazy: bool) -> Callable[[Any], Any]:
+        """Return deserializer of the (OpenAPI) type, see `ApiClient.deserialize`."""
+        if isinstance(klass, str):
+            if klass.startswith("list["):
+                item_type: str = klass[len("list[") : -1]
+
+                return lambda data: [
+                    self.to_model(item, item_type, lazy) for item in data
+                ]
+
+            if klass.startswith("dict("):
+                _, value_type = klass[len("dict(") : -1].split(", ", 1)
+
+                return lambda data: {
+                    k: self.to_model(v, value_type, lazy) for k, v in data.items()
+                }
+
+            klass = self.NATIVE_TYPES_MAPPING.get(klass) or getattr(models, klass)
+
+        if klass in self.PRIMITIVE_TYPES:
+            return partial(_deserialize_primitive, klass=klass)
+        if klass is object:
+            # free-form values, not shared with the data
+            return copy.deepcopy
+        if klass is date:
+            return _deserialize_date
+        if klass is datetime:
+            return _deserialize_datetime
+
+        return partial(self.__deserialize_model, klass=klass, lazy=lazy)
+
+    def __deserialize_model(self, data: Any, klass: Type[Any], lazy: bool) -> Any:
+        discriminated: bool = bool(
+            hasattr(klass, "get_real_child_model")
+            and klass.discriminator_value_class_map
+        )
+        if not klass.openapi_types and not discriminated:
+            return data
+
+        if not isinstance(data, dict):
+            return klass(local_vars_configuration=self.configuration)
+
+        if discriminated:
+            instance: Any = self.build_model(data, klass, lazy=False)
+
+            child: Optional[str] = instance.get_real_child_model(data)
+            return self.to_model(data, child) if child else instance
+
+        if lazy:
+            lazy_klass: Type[Any] = _lazy_class(klass)
+
+            instance = lazy_klass.__new__(lazy_klass)
+            vars(instance)["__lazy__"] = data
+
+            return instance
+
+        return self.build_model(data, klass, lazy=False)
+
+
+def _deserialize_primitive(data: Any, klass: Type[Any]) -> Any:
     try:
-        result = _omitempty_rec(obj)
-    finally:
-        _remove_marks(obj)
+        return klass(data)
+    except UnicodeEncodeError:
+        return str(data)
+    except TypeError:
+        return data
 
-    return result
+
+def _deserialize_date(data: str) -> date:
+    try:
+        return dateutil.parser.parse(data).date()
+    except ValueError:
+        raise ApiException(status=0, reason=f"Failed to parse `{data}` as date object")
+
+
+def _deserialize_datetime(data: str) -> datetime:
+    try:
+        return dateutil.parser.parse(data)
+    except ValueError:
+        raise ApiException(
+            status=0, reason=f"Failed to parse `{data}` as datetime object"
+        )
+
+
+@lru_cache(maxsize=None)
+def _lazy_class(klass: Type[Any]) -> Type[Any]:
+    """Return subclass of the model class, instances of which are built on access.
+
+    An instance holds the data of the model until any of its fields
+    is accessed. Then the model is built (and validated) with its nested
+    models deferred the same way and the instance becomes an instance
+    of the model class.
+    """
+
+    def materialize(self):
+        data: Optional[Dict[str, Any]] = vars(self).get("__lazy__")
+        if data is None:
+            return  # built already (e.g. by another thread)
+
+        model: Any = __serializer.build_model(data, klass, lazy=True)
+
+        vars(self).update(vars(model))
+        vars(self).pop("__lazy__", None)
+
+        self.__class__ = klass
+
+    def field(attr: str) -> property:
+        prop: property = getattr(klass, attr)
+
+        def fget(self):
+            materialize(self)
+            return prop.fget(self)
+
+        def fset(self, value: Any):
+            materialize(self)
+            prop.fset(self, value)
+
+        return property(fget, fset, doc=prop.__doc__)
+
+    def __reduce_ex__(self, protocol: int):
+        materialize(self)
+        return self.__reduce_ex__(protocol)
+
+    props: Dict[str, Any] = {attr: field(attr) for attr in klass.openapi_types}
+    props.update(
+        __module__=klass.__module__,
+        __qualname__=klass.__qualname__,
+        __reduce_ex__=__reduce_ex__,
+    )
+
+    return type(klass.__name__, (klass,), props)
+
+
+def lazy_data(model: Any) -> Optional[Dict[str, Any]]:
+    """Return data of a lazily deserialized model, None if it has been built."""
+    return vars(model).get("__lazy__") if hasattr(model, "__dict__") else None
+
+
+__serializer = _ModelSerializer()
 
 
 def sanitize_for_serialization(obj: Dict[str, Any]) -> Dict[str, Any]:
@@ -74,7 +522,96 @@ def sanitize_for_serialization(obj: Dict[str, Any]) -> Dict[str, Any]:
     May be used with a V1alpha1Workflow to sanitize it
     back to the original state (i.e. per manifest).
     """
-    from argo.workflows.client import ApiClient
+    return __serializer.sanitize_for_serialization(obj)
+
+
+def deserialize(data: str, klass: Type[Any]) -> Any:
+    """Deserialize JSON data into an instance of the model class."""
+    return __serializer.deserialize(data, klass)
+
+
+def to_model(data: Dict[str, Any], klass: Type[Any], lazy: bool = False) -> Any:
+    """Build an instance of the model class from a manifest.
+
+    Unlike `deserialize`, the manifest is not encoded and decoded
+    as JSON first. The manifest is not modified and the model
+    does not share any objects with it.
+
+    If `lazy`, nested models are built and validated only when their fields
+    are accessed for the first time. The manifest must not be modified
+    until then.
+    """
+    return __serializer.to_model(data, klass, lazy)
+
+
+def safe_load(stream: Union[str, IO[str]]) -> Any:
+    """Load YAML document, using the LibYAML loader if available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+@contextlib.contextmanager
+def atomic_open(
+    path: Union[str, Path], buffering: int = -1, *, mode: str = "w"
+) -> Iterator[IO[Any]]:
+    """Open a file for writing, the file is replaced once written.
+
+    The content is written to a temporary file in the same directory,
+    which replaces the file only if the block exits without an exception,
+    so that the file is never left truncated or partially written.
+
+    :param mode: str, 'w' to write text or 'wb' to write bytes ['w']
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"Unsupported mode: {mode!r}")
+
+    path = Path(path)
+    tmp: Path = path.with_name(f".{path.name}{_TMP_INFIX}{uuid.uuid4().hex[:8]}")
+
+    # created with the same permissions as by `open`
+    fd: int = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, mode, buffering=buffering) as f:
+            yield f
+
+        os.replace(str(tmp), str(path))
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(str(tmp))
+        raise
+
+
+def evict(paths: Iterable[Path], max_size: int):
+    """Remove the least recently used files until they fit in `max_size` bytes.
+
+    Files are ordered by their modification time, readers mark the files
+    they use by `os.utime`. Temporary files of `atomic_open` are not counted,
+    those left behind by crashed writers are removed.
+    """
+    now: float = time.time()
+
+    entries: List[Tuple[float, int, Path]] = []
+    total = 0
+
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue  # evicted by another process
+
+        if path.name.startswith(".") and _TMP_INFIX in path.name:
+            if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+            continue
+
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_size:
+            break
 
-    cl = ApiClient()
-    return cl.sanitize_for_serialization(obj)
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        total -= size
@@ -0,0 +1,292 @@
+"""Waiting for workflows to finish, by the watch stream of the Argo server."""
+
+import json
+import logging
+import math
+import time
+
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import WorkflowServiceApi
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.rest import ApiException
+
+from . import _utils
+from ._retry import RetryPolicy
+
+__all__ = ["wait", "wait_all"]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# phases of finished workflows
+PHASES = frozenset({"Succeeded", "Failed", "Error"})
+
+# reconnects of the stream, attempts are counted since the last event
+_RECONNECT = RetryPolicy(max_attempts=10, backoff=0.5, max_backoff=10.0)
+
+
+class Expired(Exception):
+    """The resource version to resume from is too old (410 Gone)."""
+
+
+def name_of(obj: Any) -> str:
+    """Return name of the workflow, created Workflow or its metadata.
+
+    :raises: ValueError if the workflow has no name, e.g. it is to be
+        generated by the server
+    """
+    name: Optional[str]
+    if isinstance(obj, str):
+        name = obj
+    else:
+        metadata: Any = getattr(obj, "metadata", None)
+        name = getattr(metadata or obj, "name", None)
+
+    if not name:
+        raise ValueError(f"Expected a named workflow, got: {obj!r}")
+
+    return name
+
+
+def events(resp: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (type, manifest) events of the watch stream of the response.
+
+    :raises: Expired if the resource version of the watch has expired
+    :raises: ApiException if the stream reports an error
+    """
+    try:
+        for line in resp:
+            if not line.strip():
+                continue
+
+            data: Dict[str, Any] = json.loads(line)
+            if "error" in data:
+                error: Dict[str, Any] = data["error"]
+                if error.get("httpCode") == 410:
+                    raise Expired(error.get("message"))
+
+                exc = ApiException(error.get("httpCode"), error.get("message"))
+                exc.body = line
+                raise exc
+
+            result: Dict[str, Any] = data.get("result") or {}
+            obj: Dict[str, Any] = result.get("object") or {}
+            if result.get("type") == "ERROR":
+                if obj.get("code") == 410:
+                    raise Expired(obj.get("message"))
+
+                raise ApiException(obj.get("code"), obj.get("message"))
+
+            yield result.get("type") or "", obj
+    finally:
+        resp.release_conn()
+
+
+def resource_version(obj: Dict[str, Any]) -> Optional[str]:
+    """Return resource version of the manifest of a workflow or a list."""
+    return (obj.get("metadata") or {}).get("resourceVersion")
+
+
+class _Waiter:
+    """Workflows awaited by a single stream of events of the namespace."""
+
+    def __init__(
+        self,
+        service: WorkflowServiceApi,
+        namespace: str,
+        names: Iterable[str],
+        *,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ):
+        self.service = service
+        self.namespace = namespace
+
+        self.pending: Set[str] = set(names)
+        self.finished: Dict[str, V1alpha1Workflow] = {}
+
+        self.selectors: Dict[str, Any] = {
+            "list_options_label_selector": label_selector,
+            "list_options_field_selector": field_selector,
+        }
+
+    def update(self, obj: Dict[str, Any], deleted: bool = False):
+        """Update the workflows by their current manifest."""
+        name: Optional[str] = (obj.get("metadata") or {}).get("name")
+        if name not in self.pending:
+            return
+
+        phase: Optional[str] = (obj.get("status") or {}).get("phase")
+        if deleted and phase not in PHASES:
+            raise ApiException(404, f"Workflow {name} was deleted before it finished")
+
+        if phase in PHASES:
+            # only finished workflows are deserialized, their status on access
+            self.finished[name] = _utils.to_model(obj, V1alpha1Workflow, lazy=True)
+            self.pending.discard(name)
+
+    def list(self, timeout: Optional[float]) -> str:
+        """Update the workflows by a list, return its resource version."""
+        resp = self.service.list_workflows(
+            self.namespace,
+            _preload_content=False,
+            _request_timeout=timeout,
+            **self.selectors,
+        )
+        data: Dict[str, Any] = json.loads(resp.data)
+
+        listed: Set[str] = set()
+        for obj in data.get("items") or []:
+            listed.add((obj.get("metadata") or {}).get("name"))
+            self.update(obj)
+
+        # workflows which don't exist would be awaited forever
+        missing: List[str] = sorted(self.pending - listed)
+        if missing:
+            raise ApiException(404, "Workflows not found: " + ", ".join(missing[:10]))
+
+        return resource_version(data) or ""
+
+    def watch(self, version: str, timeout: Optional[float]) -> Iterator[str]:
+        """Update the workflows by events, yield their resource versions."""
+        resp = self.service.watch_workflows(
+            self.namespace,
+            list_options_resource_version=version,
+            list_options_timeout_seconds=math.ceil(timeout) if timeout else None,
+            _preload_content=False,
+            _request_timeout=(timeout, timeout) if timeout else None,
+            **self.selectors,
+        )
+        for type_, obj in events(resp):
+            self.update(obj, deleted=type_ == "DELETED")
+
+            yield resource_version(obj) or version
+
+            if not self.pending:
+                return
+
+    def run(self, timeout: Optional[float], retry: RetryPolicy):
+        """Wait until the workflows finish, resuming the stream if it breaks."""
+        deadline: Optional[float] = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            if deadline is None:
+                return None
+
+            left: float = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError(
+                    f"Timed out waiting for {len(self.pending)} workflows: "
+                    + ", ".join(sorted(self.pending)[:10])
+                )
+
+            return left
+
+        version: Optional[str] = None
+        attempt = 1
+        while self.pending:
+            left: Optional[float] = remaining()
+            try:
+                if version is None:
+                    version = self.list(left)
+                    continue
+
+                # the server may close the stream, e.g. by its timeout
+                for version in self.watch(version, left):
+                    attempt = 1
+            except Expired:
+                _LOGGER.debug("Resource version %s expired.", version)
+                version = None
+            except Exception as exc:
+                if attempt >= retry.max_attempts or not retry.is_retryable(exc):
+                    raise
+
+                delay: float = retry.delay(attempt)
+                _LOGGER.warning(
+                    "The workflow watch failed with %s, reconnecting in %.2fs.",
+                    getattr(exc, "status", None) or type(exc).__name__,
+                    delay,
+                )
+                time.sleep(min(delay, remaining() or delay))
+                attempt += 1
+
+
+def wait_all(
+    client: ApiClient,
+    namespace: str,
+    workflows: Iterable[Any],
+    timeout: Optional[float] = None,
+    *,
+    label_selector: Optional[str] = None,
+    retry: Optional[RetryPolicy] = None,
+) -> Dict[str, V1alpha1Workflow]:
+    """Wait until the workflows finish.
+
+    The workflows are listed once and then awaited by a single stream
+    of events of the namespace, regardless of their number. A broken
+    stream is resumed from the last event, or relisted if the event
+    has expired.
+
+    :param workflows: names, created Workflows or their metadata,
+        e.g. `created` of the results of `submit_many`
+    :param timeout: float, seconds to wait [no timeout]
+    :param label_selector: str, narrows the stream, e.g. to the label
+        of the submitted workflows
+    :param retry: RetryPolicy, reconnects of the stream, attempts are
+        counted since the last event [10 attempts]
+    :returns: Dict[str, V1alpha1Workflow], finished workflows by name,
+        in order of the workflows
+    :raises: TimeoutError if the workflows haven't finished in time
+    :raises: ApiException if a workflow doesn't exist, or was deleted
+        before it finished
+    :raises: ValueError if a workflow has no name
+    """
+    names: List[str] = list(dict.fromkeys(name_of(obj) for obj in workflows))
+
+    waiter = _Waiter(
+        WorkflowServiceApi(api_client=client),
+        namespace,
+        names,
+        label_selector=label_selector,
+    )
+    waiter.run(timeout, retry or _RECONNECT)
+
+    return {name: waiter.finished[name] for name in names}
+
+
+def wait(
+    client: ApiClient,
+    namespace: str,
+    workflow: Any,
+    timeout: Optional[float] = None,
+    *,
+    retry: Optional[RetryPolicy] = None,
+) -> V1alpha1Workflow:
+    """Wait until the workflow finishes, see `wait_all`.
+
+    The stream is narrowed to the events of the workflow.
+
+    :returns: V1alpha1Workflow, the finished workflow
+    """
+    name: str = name_of(workflow)
+
+    waiter = _Waiter(
+        WorkflowServiceApi(api_client=client),
+        namespace,
+        [name],
+        field_selector=f"metadata.name={name}",
+    )
+    waiter.run(timeout, retry or _RECONNECT)
+
+    return waiter.finished[name]
@@ -1,14 +1,13 @@
 from abc import ABCMeta
 
+import copy
 import logging
 import re
 
-import inspect
 import json
-import yaml
+import textwrap
 
 import pprint
-import requests
 
 from inflection import camelize
 from inflection import dasherize
@@ -21,7 +20,6 @@ from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
-from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
@@ -40,10 +38,22 @@ from argo.workflows.client.models import V1alpha1WorkflowSpec
 from argo.workflows.client.models import V1alpha1WorkflowStatus
 from argo.workflows.client.models import V1ObjectMeta
 from argo.workflows.client.models import V1alpha1WorkflowCreateRequest
+from argo.workflows.client.rest import ApiException
 
 from ._base import Prop
+from ._base import ResourceMixin
 from ._base import Spec
+from . import _http
+from . import _registry
+from . import _retry
 from . import _utils
+from . import _watch
+from ._aio import AsyncClient
+from ._http import HTTPCache
+from ._retry import RateLimiter
+from ._retry import RetryPolicy
+from ._serializers import get_serializer
+from ._serializers import get_yaml_serializer
 
 __all__ = ["Workflow"]
 
@@ -84,10 +94,30 @@ class WorkflowMeta(ABCMeta):
             # No need to initialize any further
             return klass
 
-        cls.__compile(klass, name, bases, props)
+        if "lazy" in kwargs:
+            klass.__lazy__ = kwargs["lazy"]
+
+        lazy: Optional[bool] = klass.__lazy__
+        if lazy is None:
+            lazy = _utils.lazy_compilation()
+
+        if lazy:
+            # defer compilation until the class is used for the first time
+            klass.__deferred__ = (name, bases, props)
+        else:
+            cls.__compile(klass, name, bases, props)
 
         return klass
 
+    def __compile_deferred__(klass: Type["Workflow"]) -> None:
+        """Compile the class if its compilation has been deferred."""
+        deferred: Optional[Tuple[Any, ...]] = vars(klass).get("__deferred__")
+        if deferred is None:
+            return
+
+        del klass.__deferred__
+        type(klass).__compile(klass, *deferred)
+
     @classmethod
     def __compile(
         cls,
@@ -158,69 +188,39 @@ class WorkflowMeta(ABCMeta):
             # nothing to do
             return template
 
-        script: List[str] = [f"class {scope}:\n"]
-        script.append(f'    """Scoped objects injected from scope \'{scope}\'."""\n\n')
+        script: List[str] = [
+            f"class {scope}:\n"
+            f'    """Scoped objects injected from scope \'{scope}\'."""\n\n'
+        ]
 
         scoped_objects = scopes.get(scope) or []
         for so in scoped_objects:
-            source, _ = inspect.getsourcelines(so.__get__(cls).__code__)
+            source: Tuple[str, ...] = _utils.getsourcelines(so.__get__(cls).__code__)
 
             for co_start, line in enumerate(source):
                 if line.strip().startswith("def"):
                     break
 
-            source = ["    @staticmethod\n"] + source[co_start:] + ["\n"]
-            script.extend(source)
+            # re-indent to the scope class, whatever the nesting of the DSL class
+            body: str = textwrap.dedent("".join(source[co_start:]))
+            script.append(f"    @staticmethod\n{textwrap.indent(body, '    ')}\n")
 
-        script = script + [
-            "\n",
-            *template.script.source.splitlines(keepends=True),
-        ]
-
-        import_lines: List[str] = []
-        source_lines: List[str] = []
-
-        import_in_previous_line = False
-        for line in script:
-            if "import " in line:
-                import_lines.append(line.strip(" "))
-                import_in_previous_line = True
-            else:
-                is_blankline = not bool(line.strip())
-                if import_in_previous_line and is_blankline:
-                    # blank line separating imports
-                    pass
-                else:
-                    source_lines.append(line)
-
-                import_in_previous_line = False
-
-        # split `imports` and `from` and sort them separately
-        import_lines_with_from: Set[str] = set()
-        import_lines_without_from: Set[str] = set()
-
-        for line in import_lines:
-            if "from " in line:
-                import_lines_with_from.add(line)
-            else:
-                import_lines_without_from.add(line)
-
-        import_lines = [
-            *sorted(import_lines_without_from),
-            "\n",
-            *sorted(import_lines_with_from),
-        ]
+        script.append("\n" + template.script.source)
 
-        template.script.source = "".join((*import_lines, "\n", *source_lines))
+        template.script.source = _utils.hoist_imports(*script)
 
         return template
 
 
-class Workflow(metaclass=WorkflowMeta):
+class Workflow(ResourceMixin, metaclass=WorkflowMeta):
     """Base class for Workflows."""
 
     __model__ = V1alpha1Workflow
 
+    # whether compilation of subclasses is deferred until their first use,
+    # None stands for the default given by `_utils.lazy_compilation`
+    __lazy__: Optional[bool] = None
+
     def __init__(self, compile=True):
         """Workflow is the definition of a workflow resource.
 
@@ -232,13 +232,12 @@ class Workflow(metaclass=WorkflowMeta):
         self.__compiled_model: Union[V1alpha1Workflow, None] = None
         self.__validated = False
 
+        # the metadata of the class is shared, each instance owns a copy
+        self.metadata = copy.deepcopy(type(self).metadata)
+
         if compile:
             self.compile()
 
-    def __hash__(self) -> str:
-        """Compute hash of this Workflow."""
-        return self.to_str().__hash__()
-
     @property
     def model(self) -> Union[V1alpha1Workflow, None]:
         """Return the Workflow model.
@@ -265,56 +264,83 @@ class Workflow(metaclass=WorkflowMeta):
         """Set Workflow name."""
         self.metadata.name = name
 
+        vars(self).pop("__digest__", None)
+
     @property
     def validated(self) -> bool:
         """Return whether this workflow has been validated."""
         return self.__validated
 
     @classmethod
-    def from_file(cls, fp: Union[str, Path], validate: bool = True) -> "Workflow":
-        """Create a Workflow from a file."""
+    def from_file(
+        cls, fp: Union[str, Path], validate: bool = True, *, lazy: bool = False
+    ) -> "Workflow":
+        """Create a Workflow from a file, see `from_dict`."""
         wf_path = Path(fp)
 
-        wf: Dict[str, Any] = yaml.safe_load(wf_path.read_text())
-        return cls.from_dict(wf, validate=validate)
+        wf: Dict[str, Any] = _utils.safe_load(wf_path.read_text())
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_url(cls, url: str, validate: bool = True) -> "Workflow":
-        """Create a Workflow from a remote file."""
-        resp = requests.get(url)
-        resp.raise_for_status()
+    def from_url(
+        cls,
+        url: str,
+        validate: bool = True,
+        *,
+        lazy: bool = False,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> "Workflow":
+        """Create a Workflow from a remote file, see `from_dict`.
+
+        Connections to the server are kept alive and reused, cached
+        manifests are revalidated by conditional requests, see `HTTPCache`.
+
+        :param cache: HTTPCache, cache of the manifests [64 entries, in memory]
+        :param timeout: float, seconds to wait for the server to respond [60]
+        """
+        text: str = _http.fetch(url, cache=cache, timeout=timeout)
 
-        wf: Dict[str, Any] = yaml.safe_load(resp.text)
-        return cls.from_dict(wf, validate=validate)
+        wf: Dict[str, Any] = _utils.safe_load(text)
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_dict(cls, wf: Dict[str, Any], validate: bool = True) -> "Workflow":
-        """Create a Workflow from a dict."""
+    def from_dict(
+        cls, wf: Dict[str, Any], validate: bool = True, *, lazy: bool = False
+    ) -> "Workflow":
+        """Create a Workflow from a dict.
+
+        :param validate: bool, whether to deserialize the manifest into models,
+            otherwise the attributes are left as dicts
+        :param lazy: bool, whether to defer deserialization (and validation)
+            of nested models until they're accessed for the first time,
+            the dict must not be modified until then
+        """
         # work around validation issues and allow empty status
-        wf["status"] = wf.get("status", {}) or {}
+        wf = {**wf, "status": wf.get("status", {}) or {}}
 
-        return cls.from_string(json.dumps(wf), validate=validate)
+        return cls.__deserialize(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_string(cls, wf: str, validate: bool = True) -> "Workflow":
-        """Create a Workflow from a YAML string."""
-        body = {"data": wf}
-
-        return cls.__deserialize(body, validate=validate)
+    def from_string(
+        cls, wf: str, validate: bool = True, *, lazy: bool = False
+    ) -> "Workflow":
+        """Create a Workflow from a JSON string, see `from_dict`."""
+        return cls.__deserialize(json.loads(wf), validate=validate, lazy=lazy)
 
     @classmethod
-    def __deserialize(cls, body: Dict[str, str], *, validate: bool) -> "Workflow":
-        """Deserialize given object into a Workflow instance."""
+    def __deserialize(
+        cls, manifest: Dict[str, Any], *, validate: bool, lazy: bool = False
+    ) -> "Workflow":
+        """Deserialize given manifest into a Workflow instance."""
         wf: Union[V1alpha1Workflow, Dict[str, Any]]
         if validate:
-            attr = type("Response", (), body)
-
-            wf = ApiClient().deserialize(attr, cls.__model__)
+            wf = _utils.to_model(manifest, cls.__model__, lazy=lazy)
         else:
             _LOGGER.warning(
                 "Validation is turned off. This may result in missing or invalid attributes."
             )
-            wf = json.loads(body["data"])
+            wf = copy.deepcopy(manifest)
 
         self = cls(compile=False)
 
@@ -338,6 +364,16 @@ class Workflow(metaclass=WorkflowMeta):
         if self.model is not None:
             return self.model
 
+        type(self).__compile_deferred__()
+
+        manifest: Optional[Dict[str, Any]] = self._cached_manifest()
+        if manifest is not None:
+            # the spec of the class has been compiled by another instance
+            self.model = Workflow.__model__(**manifest)
+            self.__validated = True
+
+            return self.model
+
         def _compile(obj: Any):
             if hasattr(obj, "__model__"):
                 if not hasattr(obj, "model"):
@@ -379,7 +415,9 @@ class Workflow(metaclass=WorkflowMeta):
             return obj
 
         self.spec = _compile(self.spec)
-        self.model = Workflow.__model__(**self.to_dict(omitempty=False))
+
+        manifest = self._cache_manifest(self.to_dict(omitempty=False))
+        self.model = Workflow.__model__(**manifest)
 
         self.__validated = True
 
@@ -391,34 +429,177 @@ class Workflow(metaclass=WorkflowMeta):
         namespace: str,
         *,
         parameters: Optional[Dict[str, str]] = None,
+        service: Optional[WorkflowServiceApi] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        by_reference: bool = False,
     ) -> V1alpha1Workflow:
         """Submit an Argo Workflow to a given namespace.
 
+        With a `retry` policy, the manifest is labeled by an idempotency key
+        and a retried submission returns the Workflow created by a failed
+        attempt, if any, instead of creating a duplicate.
+
+        With `by_reference`, the Workflow is registered as a WorkflowTemplate
+        once per process, see `register`, and the submitted Workflow carries
+        only the metadata, the `workflowTemplateRef` and the arguments.
+        In-place changes of nested objects of the Workflow are registered
+        once its digest is refreshed, see `digest`.
+
+        The parameters are not set on the Workflow, so that instances
+        of the same class, sharing the spec, may be submitted concurrently.
+
+        :param service: WorkflowServiceApi, shared by batch submissions,
+            see `submit_many` [created for the client]
+        :param retry: RetryPolicy, retries of failed submissions [no retries]
+        :param limiter: RateLimiter, shared by rate-limited submissions
+        :param by_reference: bool, whether to submit a reference
+            to the registered WorkflowTemplate instead of the whole spec
+        :returns: V1alpha1Workflow, submitted Workflow
+        """
+        ref: Optional[_registry.Reference] = None
+
+        body: Dict[str, Any]
+        if by_reference:
+            ref = _registry.reference(self)
+            _registry.register(client, namespace, ref, retry=retry, limiter=limiter)
+
+            body = ref.workflow(parameters)
+        else:
+            body = self.__manifest(parameters)
+
+        if service is None:
+            service = WorkflowServiceApi(api_client=client)
+
+        def create() -> V1alpha1Workflow:
+            request = V1alpha1WorkflowCreateRequest(workflow=body)
+            return service.create_workflow(namespace, request)
+
+        def list_(selector: str) -> List[V1alpha1Workflow]:
+            return service.list_workflows(
+                namespace, list_options_label_selector=selector
+            ).items
+
+        # submit the workflow
+        try:
+            created: V1alpha1Workflow = _retry.call_idempotent(
+                body, create, list_, retry=retry, limiter=limiter
+            )
+        except ApiException as exc:
+            if ref is not None and exc.status in (400, 404):
+                # the template may have been deleted, registered again next time
+                _registry.forget(client.configuration.host, namespace, ref)
+            raise
+
+        # return the computed Workflow
+        return created
+
+    async def asubmit(
+        self,
+        client: AsyncClient,
+        namespace: str,
+        *,
+        parameters: Optional[Dict[str, str]] = None,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+        by_reference: bool = False,
+    ) -> V1alpha1Workflow:
+        """Submit an Argo Workflow asynchronously, see `submit`.
+
+        :param client: AsyncClient, requires aiohttp
         :returns: V1alpha1Workflow, submitted Workflow
         """
-        parameters = parameters or {}
-
-        new_parameters: List[V1alpha1Parameter] = []
-        for name, value in parameters.items():
-            param = V1alpha1Parameter(name=name, value=value)
-            new_parameters.append(param)
-
-        if getattr(self.spec, "arguments"):
-            for p in getattr(self.spec.arguments, "parameters", []):
-                if p.name in parameters:
-                    continue  # overridden
-                elif not getattr(p, "value"):
-                    default = getattr(p, "default")
-                    if default is not None:
-                        p.value = default
-                    else:
-                        raise Exception(f"Missing required workflow parameter {p.name}")
-
-                new_parameters.append(p)
-
-            self.spec.arguments.parameters = new_parameters
-        elif parameters:
-            raise AttributeError("The Workflow doesn't take any parameters.")
+        ref: Optional[_registry.Reference] = None
+
+        body: Dict[str, Any]
+        if by_reference:
+            ref = _registry.reference(self)
+            await _registry.aregister(
+                client, namespace, ref, retry=retry, limiter=limiter
+            )
+
+            body = ref.workflow(parameters)
+        else:
+            body = self.__manifest(parameters)
+
+        async def create() -> V1alpha1Workflow:
+            return await client.create_workflow(namespace, body)
+
+        async def list_(selector: str) -> List[V1alpha1Workflow]:
+            found = await client.list_workflows(namespace, label_selector=selector)
+            return found.items
+
+        try:
+            return await _retry.acall_idempotent(
+                body, create, list_, retry=retry, limiter=limiter
+            )
+        except ApiException as exc:
+            if ref is not None and exc.status in (400, 404):
+                _registry.forget(client.configuration.host, namespace, ref)
+            raise
+
+    def register(
+        self,
+        client: ApiClient,
+        namespace: str,
+        *,
+        retry: Optional[RetryPolicy] = None,
+        limiter: Optional[RateLimiter] = None,
+    ) -> str:
+        """Register the Workflow as a WorkflowTemplate, see `submit`.
+
+        The template is named by the Workflow and the digest of its spec,
+        it is created once per process and namespace, unless it exists
+        on the server already. Changed Workflows are registered as new
+        templates, the previous ones are left on the server, labeled
+        by `argo-dsl/registered`.
+
+        :param retry: RetryPolicy, retries of the failed creation
+        :param limiter: RateLimiter, shared by rate-limited submissions
+        :returns: str, name of the WorkflowTemplate
+        """
+        ref: _registry.Reference = _registry.reference(self)
+        _registry.register(client, namespace, ref, retry=retry, limiter=limiter)
+
+        return ref.name
+
+    def wait(
+        self,
+        client: ApiClient,
+        namespace: str,
+        timeout: Optional[float] = None,
+        *,
+        name: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> V1alpha1Workflow:
+        """Wait until the submitted Workflow finishes, see `wait_all`.
+
+        :param timeout: float, seconds to wait [no timeout]
+        :param name: str, name of the submitted Workflow, e.g. generated
+            by the server on submission [name of the Workflow]
+        :param retry: RetryPolicy, reconnects of the watch stream
+        :returns: V1alpha1Workflow, the finished Workflow
+        :raises: TimeoutError if the Workflow hasn't finished in time
+        :raises: ValueError if the name is not known, i.e. it is generated
+            by the server and not given
+        """
+        name = name or self.name
+        if not name:
+            raise ValueError(
+                "The name of the Workflow is generated by the server, pass `name` "
+                "of the Workflow returned by `submit`."
+            )
+
+        return _watch.wait(client, namespace, name, timeout, retry=retry)
+
+    def __manifest(self, parameters: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        """Return the manifest to submit, with the parameters.
+
+        The parameters are patched into the serialized manifest, the Workflow
+        is not modified, its spec may be shared by concurrent submissions
+        of instances of the same class.
+        """
+        type(self).__compile_deferred__()
 
         body: Dict[str, Any]
         if not getattr(self, "validated", True):
@@ -428,46 +609,56 @@ class Workflow(metaclass=WorkflowMeta):
             )
             body = camelize(self.to_dict())
         else:
-            body = client.sanitize_for_serialization(self)
+            body = _utils.sanitize_for_serialization(self)
 
-        service = WorkflowServiceApi(api_client=client)
-        # submit the workflow
-        created: models.V1alpha1Workflow = service.create_workflow(
-            namespace, V1alpha1WorkflowCreateRequest(workflow=body)
-        )
+        spec: Dict[str, Any] = dict(body.get("spec") or {})
+        arguments: Optional[Dict[str, Any]] = spec.get("arguments")
 
-        # return the computed Workflow
-        return created
+        if not arguments:
+            if parameters:
+                raise AttributeError("The Workflow doesn't take any parameters.")
+            return body
 
-    def to_file(self, fp: Union[Path, str], fmt="yaml", **kwargs):
-        """Dumps the Workflow to a file."""
-        d: Dict[str, Any] = _utils.sanitize_for_serialization(self)
+        declared: List[Dict[str, Any]] = list(arguments.get("parameters") or [])
+        spec["arguments"] = {
+            **arguments,
+            "parameters": _registry.parameters(declared, parameters or {}),
+        }
 
-        opts = kwargs
+        return {**body, "spec": spec}
 
-        if fmt == "json":
-            path = Path(fp).write_text(json.dumps(d, **opts))
-        else:
-            path = Path(fp).write_text(
-                yaml.dump(d, Dumper=_utils.BlockDumper, **opts) + "\n"
-            )
+    def to_yaml(
+        self, omitempty=True, serializer: Optional[str] = None, **kwargs
+    ) -> str:
+        """Returns the Workflow manifest as a YAML.
 
-    def to_yaml(self, omitempty=True, **kwargs) -> str:
-        """Returns the Workflow manifest as a YAML."""
+        :param serializer: str, name of a YAML serializer, see `get_serializer`
+            [default, if it is a YAML serializer, otherwise 'yaml']
+        :raises: ValueError if the serializer does not emit YAML
+        """
         d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
 
-        opts = dict(default_flow_style=False)
-        opts.update(kwargs)
-
-        serialized = yaml.dump(d, Dumper=_utils.BlockDumper, **opts)
+        serialized = get_yaml_serializer(serializer).dumps(d, **kwargs)
 
         return serialized
 
+    def dumps(self, fmt: Optional[str] = None, omitempty=True, **kwargs) -> str:
+        """Returns the Workflow manifest serialized, e.g. as a JSON.
+
+        :param fmt: str, name of the serializer, see `get_serializer` [default]
+        :raises: ValueError if there is no such serializer
+        """
+        d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
+
+        return get_serializer(fmt).dumps(d, **kwargs)
+
     def to_dict(self, omitempty=True) -> Dict[str, Any]:
         """Returns the Workflow manifest as a dict.
 
         :param omitempty: bool, whether to omit empty values
         """
+        type(self).__compile_deferred__()
+
         result = V1alpha1Workflow.to_dict(self)
 
         if omitempty:
@@ -1,12 +1,10 @@
 from abc import ABCMeta
 
+import copy
 import logging
 
-import inspect
 import json
-import yaml
-
-import requests
+import textwrap
 
 
 from inflection import dasherize
@@ -18,13 +16,10 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
-from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
 
-from argo.workflows.client import ApiClient
-
 from argo.workflows.client.models import V1alpha1Arguments
 from argo.workflows.client.models import V1alpha1Artifact
 from argo.workflows.client.models import V1alpha1DAGTask
@@ -37,7 +32,12 @@ from argo.workflows.client.models import V1alpha1WorkflowTemplateSpec
 from argo.workflows.client.models import V1ObjectMeta
 
 
+from ._base import ResourceMixin
+from . import _http
 from . import _utils
+from ._http import HTTPCache
+from ._serializers import get_serializer
+from ._serializers import get_yaml_serializer
 
 __all__ = ["WorkflowTemplate"]
 
@@ -80,10 +80,30 @@ class WorkflowTemplateMeta(ABCMeta):
             # No need to initialize any further
             return klass
 
-        cls.__compile(klass, name, bases, props)
+        if "lazy" in kwargs:
+            klass.__lazy__ = kwargs["lazy"]
+
+        lazy: Optional[bool] = klass.__lazy__
+        if lazy is None:
+            lazy = _utils.lazy_compilation()
+
+        if lazy:
+            # defer compilation until the class is used for the first time
+            klass.__deferred__ = (name, bases, props)
+        else:
+            cls.__compile(klass, name, bases, props)
 
         return klass
 
+    def __compile_deferred__(klass: Type["WorkflowTemplate"]) -> None:
+        """Compile the class if its compilation has been deferred."""
+        deferred: Optional[Tuple[Any, ...]] = vars(klass).get("__deferred__")
+        if deferred is None:
+            return
+
+        del klass.__deferred__
+        type(klass).__compile(klass, *deferred)
+
     @classmethod
     def __compile(
         cls,
@@ -156,69 +176,39 @@ class WorkflowTemplateMeta(ABCMeta):
             # nothing to do
             return template
 
-        script: List[str] = [f"class {scope}:\n"]
-        script.append(f'    """Scoped objects injected from scope \'{scope}\'."""\n\n')
+        script: List[str] = [
+            f"class {scope}:\n"
+            f'    """Scoped objects injected from scope \'{scope}\'."""\n\n'
+        ]
 
         scoped_objects = scopes.get(scope) or []
         for so in scoped_objects:
-            source, _ = inspect.getsourcelines(so.__get__(cls).__code__)
+            source: Tuple[str, ...] = _utils.getsourcelines(so.__get__(cls).__code__)
 
             for co_start, line in enumerate(source):
                 if line.strip().startswith("def"):
                     break
 
-            source = ["    @staticmethod\n"] + source[co_start:] + ["\n"]
-            script.extend(source)
-
-        script = script + [
-            "\n",
-            *template.script.source.splitlines(keepends=True),
-        ]
+            # re-indent to the scope class, whatever the nesting of the DSL class
+            body: str = textwrap.dedent("".join(source[co_start:]))
+            script.append(f"    @staticmethod\n{textwrap.indent(body, '    ')}\n")
 
-        import_lines: List[str] = []
-        source_lines: List[str] = []
-
-        import_in_previous_line = False
-        for line in script:
-            if "import " in line:
-                import_lines.append(line.strip(" "))
-                import_in_previous_line = True
-            else:
-                is_blankline = not bool(line.strip())
-                if import_in_previous_line and is_blankline:
-                    # blank line separating imports
-                    pass
-                else:
-                    source_lines.append(line)
-
-                import_in_previous_line = False
-
-        # split `imports` and `from` and sort them separately
-        import_lines_with_from: Set[str] = set()
-        import_lines_without_from: Set[str] = set()
-
-        for line in import_lines:
-            if "from " in line:
-                import_lines_with_from.add(line)
-            else:
-                import_lines_without_from.add(line)
-
-        import_lines = [
-            *sorted(import_lines_without_from),
-            "\n",
-            *sorted(import_lines_with_from),
-        ]
+        script.append("\n" + template.script.source)
 
-        template.script.source = "".join((*import_lines, "\n", *source_lines))
+        template.script.source = _utils.hoist_imports(*script)
 
         return template
 
 
-class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
+class WorkflowTemplate(ResourceMixin, metaclass=WorkflowTemplateMeta):
     """Base class for Workflows."""
 
     __model__ = V1alpha1WorkflowTemplate
 
+    # whether compilation of subclasses is deferred until their first use,
+    # None stands for the default given by `_utils.lazy_compilation`
+    __lazy__: Optional[bool] = None
+
     def __init__(self, compile=True):
         """WorkflowTemplate is the definition of a workflow resource.
 
@@ -230,13 +220,12 @@ class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
         self._compiled_model: Union[V1alpha1WorkflowTemplate, None] = None
         self.__validated = False
 
+        # the metadata of the class is shared, each instance owns a copy
+        self.metadata = copy.deepcopy(type(self).metadata)
+
         if compile:
             self.compile()
 
-    def __hash__(self) -> str:
-        """Compute hash of this WorkflowTemplate."""
-        return self.to_str().__hash__()
-
     @property
     def model(self) -> Union[V1alpha1WorkflowTemplate, None]:
         """Return the WorkflowTemplate model.
@@ -263,6 +252,8 @@ class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
         """Set WorkflowTemplate name."""
         self.metadata.name = name
 
+        vars(self).pop("__digest__", None)
+
     @property
     def validated(self) -> bool:
         """Return whether this workflow has been validated."""
@@ -270,50 +261,71 @@ class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
 
     @classmethod
     def from_file(
-        cls, fp: Union[str, Path], validate: bool = True
+        cls, fp: Union[str, Path], validate: bool = True, *, lazy: bool = False
     ) -> "WorkflowTemplate":
-        """Create a WorkflowTemplate from a file."""
+        """Create a WorkflowTemplate from a file, see `from_dict`."""
         wf_path = Path(fp)
 
-        wf: Dict[str, Any] = yaml.safe_load(wf_path.read_text())
-        return cls.from_dict(wf, validate=validate)
+        wf: Dict[str, Any] = _utils.safe_load(wf_path.read_text())
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_url(cls, url: str, validate: bool = True) -> "WorkflowTemplate":
-        """Create a WorkflowTemplate from a remote file."""
-        resp = requests.get(url)
-        resp.raise_for_status()
+    def from_url(
+        cls,
+        url: str,
+        validate: bool = True,
+        *,
+        lazy: bool = False,
+        cache: Optional[HTTPCache] = None,
+        timeout: Optional[float] = _http.DEFAULT_TIMEOUT,
+    ) -> "WorkflowTemplate":
+        """Create a WorkflowTemplate from a remote file, see `from_dict`.
 
-        wf: Dict[str, Any] = yaml.safe_load(resp.text)
-        return cls.from_dict(wf, validate=validate)
+        Connections to the server are kept alive and reused, cached
+        manifests are revalidated by conditional requests, see `HTTPCache`.
 
-    @classmethod
-    def from_dict(cls, wf: Dict[str, Any], validate: bool = True) -> "WorkflowTemplate":
-        """Create a WorkflowTemplate from a dict."""
-        return cls.from_string(json.dumps(wf), validate=validate)
+        :param cache: HTTPCache, cache of the manifests [64 entries, in memory]
+        :param timeout: float, seconds to wait for the server to respond [60]
+        """
+        text: str = _http.fetch(url, cache=cache, timeout=timeout)
+
+        wf: Dict[str, Any] = _utils.safe_load(text)
+        return cls.from_dict(wf, validate=validate, lazy=lazy)
 
     @classmethod
-    def from_string(cls, wf: str, validate: bool = True) -> "WorkflowTemplate":
-        """Create a WorkflowTemplate from a YAML string."""
-        body = {"data": wf}
+    def from_dict(
+        cls, wf: Dict[str, Any], validate: bool = True, *, lazy: bool = False
+    ) -> "WorkflowTemplate":
+        """Create a WorkflowTemplate from a dict.
+
+        :param validate: bool, whether to deserialize the manifest into models,
+            otherwise the attributes are left as dicts
+        :param lazy: bool, whether to defer deserialization (and validation)
+            of nested models until they're accessed for the first time,
+            the dict must not be modified until then
+        """
+        return cls.__deserialize(wf, validate=validate, lazy=lazy)
 
-        return cls.__deserialize(body, validate=validate)
+    @classmethod
+    def from_string(
+        cls, wf: str, validate: bool = True, *, lazy: bool = False
+    ) -> "WorkflowTemplate":
+        """Create a WorkflowTemplate from a JSON string, see `from_dict`."""
+        return cls.__deserialize(json.loads(wf), validate=validate, lazy=lazy)
 
     @classmethod
     def __deserialize(
-        cls, body: Dict[str, str], *, validate: bool
+        cls, manifest: Dict[str, Any], *, validate: bool, lazy: bool = False
     ) -> "WorkflowTemplate":
-        """Deserialize given object into a WorkflowTemplate instance."""
+        """Deserialize given manifest into a WorkflowTemplate instance."""
         wf: Union[V1alpha1WorkflowTemplate, Dict[str, Any]]
         if validate:
-            attr = type("Response", (), body)
-
-            wf = ApiClient().deserialize(attr, cls.__model__)
+            wf = _utils.to_model(manifest, cls.__model__, lazy=lazy)
         else:
             _LOGGER.warning(
                 "Validation is turned off. This may result in missing or invalid attributes."
             )
-            wf = json.loads(body["data"])
+            wf = copy.deepcopy(manifest)
 
         self = cls(compile=False)
 
@@ -336,6 +348,16 @@ class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
         if self.model is not None:
             return self.model
 
+        type(self).__compile_deferred__()
+
+        manifest: Optional[Dict[str, Any]] = self._cached_manifest()
+        if manifest is not None:
+            # the spec of the class has been compiled by another instance
+            self.model = self.__model__(**manifest)
+            self.__validated = True
+
+            return self.model
+
         def _compile(obj: Any):
             if hasattr(obj, "__model__"):
                 if not hasattr(obj, "model"):
@@ -377,39 +399,46 @@ class WorkflowTemplate(metaclass=WorkflowTemplateMeta):
             return obj
 
         self.spec = _compile(self.spec)
-        self.model = self.__model__(**self.to_dict(omitempty=False))
+
+        manifest = self._cache_manifest(self.to_dict(omitempty=False))
+        self.model = self.__model__(**manifest)
 
         self.__validated = True
 
         return self.model
 
-    def to_file(self, fp: Union[Path, str], fmt="yaml", **kwargs):
-        """Dumps the WorkflowTemplate to a file."""
-        d: Dict[str, Any] = _utils.sanitize_for_serialization(self)
+    def to_yaml(
+        self, omitempty=True, serializer: Optional[str] = None, **kwargs
+    ) -> str:
+        """Returns the WorkflowTemplate manifest as a YAML.
 
-        opts = kwargs
+        :param serializer: str, name of a YAML serializer, see `get_serializer`
+            [default, if it is a YAML serializer, otherwise 'yaml']
+        :raises: ValueError if the serializer does not emit YAML
+        """
+        d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
 
-        if fmt == "json":
-            Path(fp).write_text(json.dumps(d, **opts))
-        else:
-            Path(fp).write_text(yaml.dump(d, Dumper=_utils.BlockDumper, **opts) + "\n")
+        serialized = get_yaml_serializer(serializer).dumps(d, **kwargs)
 
-    def to_yaml(self, omitempty=True, **kwargs) -> str:
-        """Returns the WorkflowTemplate manifest as a YAML."""
-        d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
+        return serialized
 
-        opts = dict(default_flow_style=False)
-        opts.update(kwargs)
+    def dumps(self, fmt: Optional[str] = None, omitempty=True, **kwargs) -> str:
+        """Returns the WorkflowTemplate manifest serialized, e.g. as a JSON.
 
-        serialized = yaml.dump(d, Dumper=_utils.BlockDumper, **opts)
+        :param fmt: str, name of the serializer, see `get_serializer` [default]
+        :raises: ValueError if there is no such serializer
+        """
+        d: Dict[str, Any] = self.to_dict(omitempty=omitempty)
 
-        return serialized
+        return get_serializer(fmt).dumps(d, **kwargs)
 
     def to_dict(self, omitempty=True) -> Dict[str, Any]:
         """Returns the WorkflowTemplate manifest as a dict.
 
         :param omitempty: bool, whether to omit empty values
         """
+        type(self).__compile_deferred__()
+
         result = self.__model__.to_dict(self)
 
         if omitempty:
@@ -1,4 +1,3 @@
-import inspect
 import re
 import textwrap
 
@@ -41,6 +40,7 @@ from ._base import Prop
 from ._base import Spec
 from ._inputs import inputs
 from ._outputs import outputs
+from . import _utils
 
 
 __all__ = [
@@ -159,16 +159,9 @@ class closure(Prop, command=["python"]):
 
         self.name = dasherize(f.__code__.co_name)
 
-        source: List[str]
-        source, _ = inspect.getsourcelines(f.__code__)
-
-        co_start: int = 0
-        for i, line in enumerate(source):
-            if re.search(r"\)( -> (.+))?:[\s\n\r]+$", line):
-                co_start = i + 1
-                break
-
-        self.source = textwrap.dedent("".join(source[co_start:]))
+        # the source is extracted on first access, see `closure.source`
+        self.__code = f.__code__
+        self._source = None
 
         tmpl = template(f)
         tmpl.callable = False
@@ -177,6 +170,27 @@ class closure(Prop, command=["python"]):
 
         return tmpl
 
+    @property
+    def source(self) -> str:
+        """Return source code of the closure body."""
+        if self._source is None:
+            source: Tuple[str, ...] = _utils.getsourcelines(self.__code)
+
+            co_start: int = 0
+            for i, line in enumerate(source):
+                if re.search(r"\)( -> (.+))?:[\s\n\r]+$", line):
+                    co_start = i + 1
+                    break
+
+            self._source = textwrap.dedent("".join(source[co_start:]))
+
+        return self._source
+
+    @source.setter
+    def source(self, source: str):
+        """Set source code of the closure body."""
+        self._source = source
+
 
 class scope:
     """Mark scope for closures."""
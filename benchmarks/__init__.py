@@ -0,0 +1 @@
+"""Argo Python DSL benchmarks."""
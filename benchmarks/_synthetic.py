@@ -0,0 +1,119 @@
+"""Generators of synthetic DSL workflows used by the benchmarks."""
+
+import importlib
+import sys
+
+from pathlib import Path
+
+from typing import List
+
+
+_HEADER = """\
+from argo.workflows.dsl import {kind}
+from argo.workflows.dsl.tasks import dependencies
+from argo.workflows.dsl.tasks import parameter
+from argo.workflows.dsl.tasks import task
+from argo.workflows.dsl.templates import closure
+from argo.workflows.dsl.templates import inputs
+from argo.workflows.dsl.templates import scope
+from argo.workflows.dsl.templates import template
+from argo.workflows.dsl.templates import V1alpha1Parameter
+from argo.workflows.dsl.templates import V1alpha1Template
+from argo.workflows.dsl.templates import V1Container
+"""
+
+_TASK = '''
+    @task
+    @parameter(name="message", value="{i}")
+    def task_{i}(self, message: V1alpha1Parameter) -> V1alpha1Template:
+        return self.echo_{i}(message=message)
+
+    @template
+    @inputs.parameter(name="message")
+    def echo_{i}(self, message: V1alpha1Parameter) -> V1Container:
+        return V1Container(
+            image="alpine:3.7",
+            name="echo",
+            command=["echo", "{{{{inputs.parameters.message}}}}"],
+        )
+'''
+
+_SCOPE = '''
+    @scope(name="{scope}")
+    def helper_{i}(value: int) -> int:
+        import math
+        from functools import reduce
+
+        return math.floor(value * {i})
+'''
+
+_CLOSURE = '''
+    @closure(scope="{scope}", image="python:3.8")
+    def closure_{i}() -> V1alpha1Template:
+        import json
+
+        print(json.dumps({scope}.helper_{j}({i})))
+'''
+
+
+def workflow_source(
+    name: str,
+    n_templates: int,
+    *,
+    n_closures: int = 0,
+    n_scopes: int = 0,
+    kind: str = "Workflow",
+) -> str:
+    """Return source of a DSL class with `n_templates` tasks and templates.
+
+    Closures are spread evenly among `n_scopes` scopes, each scope
+    defines a single helper function.
+    """
+    body: List[str] = [f"class {name}({kind}):\n"]
+    if kind == "CronWorkflow":
+        body.append('    schedule = "0 0 1 1 *"\n')
+
+    for i in range(n_templates):
+        body.append(_TASK.format(i=i))
+    for i in range(n_scopes):
+        body.append(_SCOPE.format(i=i, scope=f"scope_{i}"))
+    for i in range(n_closures):
+        j = i % n_scopes
+        body.append(_CLOSURE.format(i=i, j=j, scope=f"scope_{j}"))
+
+    return "".join(body)
+
+
+def write_module(path: Path, sources: List[str], kind: str = "Workflow") -> Path:
+    """Write a module of DSL classes to `path`."""
+    path.write_text("\n\n".join([_HEADER.format(kind=kind), *sources]))
+
+    return path
+
+
+def write_package(
+    root: Path, package: str, n_classes: int, n_templates: int, **kwargs
+) -> Path:
+    """Write a package with a module per DSL class into `root`."""
+    kind: str = kwargs.get("kind", "Workflow")
+
+    pkg = root / package
+    pkg.mkdir(parents=True, exist_ok=True)
+    (pkg / "__init__.py").write_text("")
+
+    for i in range(n_classes):
+        source = workflow_source(f"Synthetic{i}", n_templates, **kwargs)
+        write_module(pkg / f"synthetic_{i}.py", [source], kind=kind)
+
+    return pkg
+
+
+def import_module(root: Path, module: str):
+    """Import `module` from `root`, without importing it twice."""
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+    importlib.invalidate_caches()
+    sys.modules.pop(module, None)
+
+    return importlib.import_module(module)
@@ -0,0 +1,127 @@
+"""Benchmark submissions of the whole spec vs by reference to a WorkflowTemplate.
+
+Workflows are submitted one at a time to a local Argo server stand-in
+which counts the bytes it receives and echoes the created workflows.
+
+Usage: python -m benchmarks.bench_by_reference [N_WORKFLOWS [N_TEMPLATES ...]]
+"""
+
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from pathlib import Path
+
+from socketserver import ThreadingMixIn
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Arguments
+from argo.workflows.client.models import V1alpha1Parameter
+
+from argo.workflows.dsl import submit_sweep
+
+from .bench_emit import workflow
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    received = 0
+
+
+def serve() -> _Server:
+    """Start a server echoing created workflows."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            request = self.rfile.read(int(self.headers["Content-Length"]))
+            self.server.received += len(request)
+
+            # {"workflow": {...}} -> {...}, not parsed to spare the CPU
+            body = request[request.index(b":") + 1 : request.rindex(b"}")]
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def main(n_workflows: int = 200, *sizes: int):
+    httpd = serve()
+
+    config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+    client = ApiClient(configuration=config)
+
+    print(f"{n_workflows} workflows")
+    print(f"{'templates':>10} {'method':>26} {'per workflow':>13} {'request':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for n_templates in sizes or (10, 500):
+            wf = workflow(root, n_templates)
+            wf.spec.arguments = V1alpha1Arguments(
+                parameters=[
+                    V1alpha1Parameter(name="lr"),
+                    V1alpha1Parameter(name="seed", default="0"),
+                ]
+            )
+            variants = [{"lr": f"{i / n_workflows:.4f}"} for i in range(n_workflows)]
+
+            def submit(by_reference: bool):
+                for values in variants:
+                    wf.submit(
+                        client, "bench", parameters=values, by_reference=by_reference
+                    )
+
+            def sweep(by_reference: bool):
+                results = submit_sweep(
+                    client,
+                    "bench",
+                    wf,
+                    variants,
+                    concurrency=1,
+                    by_reference=by_reference,
+                )
+                assert all(r.ok for r in results)
+
+            for name, run, by_reference in (
+                ("submit", submit, False),
+                ("submit, by_reference", submit, True),
+                ("submit_sweep", sweep, False),
+                ("submit_sweep, by_reference", sweep, True),
+            ):
+                # the template is registered by the first submission
+                received = httpd.received
+                start = time.perf_counter()
+                run(by_reference)
+                duration = (time.perf_counter() - start) / n_workflows
+                size = (httpd.received - received) / n_workflows
+
+                print(
+                    f"{n_templates:>10} {name:>26} {duration * 1e3:>11.2f}ms"
+                    f" {size / 1024:>8.1f}KiB"
+                )
+
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""Benchmark compilation of closures sharing scoped helpers.
+
+Usage: python -m benchmarks.bench_closures [N_CLOSURES] [N_SCOPES]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from argo.workflows.dsl import _utils
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+def main(n_closures: int = 200, n_scopes: int = 20, repeat: int = 5):
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for i in range(repeat):
+            # a fresh module (and fresh code objects) for every round
+            name = f"bench_closures_wf_{i}"
+            source = workflow_source(
+                "Closures", 0, n_closures=n_closures, n_scopes=n_scopes
+            )
+            write_module(root / f"{name}.py", [source])
+
+            # identical sources would be served from the caches of the last round
+            _utils.getsourcelines.cache_clear()
+            _utils.split_imports.cache_clear()
+
+            start = time.perf_counter()
+            module = import_module(root, name)
+            module.Closures()
+            timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+
+    print(f"closures:     {n_closures}")
+    print(f"scopes:       {n_scopes}")
+    print(f"compile:      {best:.3f}s (best of {repeat})")
+    print(f"per closure:  {best / n_closures * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Benchmark compilation of a large Workflow.
+
+Usage: python -m benchmarks.bench_compile [N_TEMPLATES]
+"""
+
+import cProfile
+import pstats
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+def main(n_templates: int = 5000):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_module(root / "bench_compile_wf.py", [workflow_source("Big", n_templates)])
+
+        start = time.perf_counter()
+        module = import_module(root, "bench_compile_wf")
+        class_creation = time.perf_counter() - start
+
+        profile = cProfile.Profile()
+
+        start = time.perf_counter()
+        profile.runcall(module.Big)
+        first = time.perf_counter() - start
+
+        stats = pstats.Stats(profile).stats
+        # own time of SpecProxy.__call__ including builtins it calls (getattr, ...)
+        proxies = [
+            func for func in stats
+            if func[0].endswith("_base.py") and func[2] == "__call__"
+        ]
+        proxy = sum(stats[func][2] for func in proxies)
+        for func, (_, _, _, _, callers) in stats.items():
+            if func[0] == "~":
+                proxy += sum(callers[p][2] for p in proxies if p in callers)
+
+        start = time.perf_counter()
+        module.Big()
+        second = time.perf_counter() - start
+
+    print(f"templates:          {n_templates}")
+    print(f"class creation:     {class_creation:.3f}s")
+    print(f"first compile:      {first:.3f}s")
+    print(f"per template:       {first / n_templates * 1e6:.1f}us")
+    print(f"SpecProxy.__call__: {proxy / n_templates * 1e6:.1f}us per template")
+    print(f"second instance:    {second:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,36 @@
+"""Benchmark digests of compiled workflows.
+
+Usage: python -m benchmarks.bench_digest [N_TEMPLATES ...]
+"""
+
+import sys
+import tempfile
+import timeit
+
+from pathlib import Path
+
+from .bench_emit import workflow
+
+
+def main(*sizes: int, repeat: int = 3):
+    print(f"{'templates':>10} {'method':>18} {'time':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for n_templates in sizes or (10, 1000):
+            wf = workflow(root, n_templates)
+
+            for name, stmt in (
+                # the former implementation of `__hash__`
+                ("hash(to_str())", lambda: hash(wf.to_str())),
+                ("digest()", lambda: wf.digest(refresh=True)),
+                ("digest() cached", lambda: wf.digest()),
+            ):
+                number = max(1, 1000 // n_templates)
+                best = min(timeit.repeat(stmt, number=number, repeat=repeat))
+                print(f"{n_templates:>10} {name:>18} {best / number * 1e3:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""Benchmark exporting many workflows, a file per workflow vs a single stream.
+
+Usage: python -m benchmarks.bench_dump_all [N_WORKFLOWS]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from argo.workflows.dsl import dump_all
+from argo.workflows.dsl import Workflow
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+def workflows(root: Path, n_workflows: int) -> List[Workflow]:
+    """Return `n_workflows` compiled workflows of 5 templates each."""
+    sources = [workflow_source(f"Synthetic{i}", 5) for i in range(n_workflows)]
+    write_module(root / "bench_dump_all_wf.py", sources)
+
+    module = import_module(root, "bench_dump_all_wf")
+
+    return [getattr(module, f"Synthetic{i}")() for i in range(n_workflows)]
+
+
+def main(n_workflows: int = 3000, repeat: int = 3):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        wfs = workflows(root, n_workflows)
+
+        out_dir = root / "manifests"
+        out_dir.mkdir()
+
+        def to_files(fmt: str):
+            for i, wf in enumerate(wfs):
+                wf.to_file(out_dir / f"{i}.{fmt}", fmt=fmt)
+
+        methods: Dict[str, Callable[[], None]] = {
+            "to_file yaml": lambda: to_files("yaml"),
+            "dump_all yaml": lambda: dump_all(wfs, root / "all.yaml", "yaml"),
+            "to_file json": lambda: to_files("json"),
+            "dump_all json": lambda: dump_all(wfs, root / "all.jsonl", "json"),
+        }
+
+        print(f"{n_workflows} workflows")
+        print(f"{'method':>14} {'time':>10} {'peak memory':>12}")
+
+        for name, method in methods.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                method()
+                timings.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            method()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{name:>14} {min(timings):>9.3f}s {peak / 1024 ** 2:>10.2f}MB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""Benchmark dumping compiled workflows to files.
+
+Compares sanitizing the model into a dict before serializing it
+with emitting the manifest while walking the model.
+
+Usage: python -m benchmarks.bench_emit [N_TEMPLATES ...]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+from typing import Callable
+from typing import Dict
+from typing import TextIO
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import get_serializer
+from argo.workflows.dsl import Workflow
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+def workflow(root: Path, n_templates: int) -> Workflow:
+    """Return compiled workflow of `n_templates` tasks and templates."""
+    name = f"bench_emit_wf_{n_templates}"
+    write_module(root / f"{name}.py", [workflow_source("Synthetic", n_templates)])
+
+    return import_module(root, name).Synthetic()
+
+
+def main(*sizes: int, repeat: int = 3):
+    print(
+        f"{'templates':>10} {'format':>6} {'method':>8} {'time':>10}"
+        f" {'peak memory':>12}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for n_templates in sizes or (1000, 5000):
+            wf = workflow(root, n_templates)
+
+            for fmt in ("yaml", "json"):
+                serializer = get_serializer(fmt)
+
+                methods: Dict[str, Callable[[TextIO], None]] = {
+                    "sanitize": lambda f: f.write(
+                        serializer.dumps(_utils.sanitize_for_serialization(wf))
+                    ),
+                    "emit": lambda f: serializer.dump(wf, f),
+                }
+
+                for method, dump in methods.items():
+                    path = root / f"manifest.{fmt}"
+
+                    timings = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        with path.open("w") as f:
+                            dump(f)
+                        timings.append(time.perf_counter() - start)
+
+                    tracemalloc.start()
+                    with path.open("w") as f:
+                        dump(f)
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                    print(
+                        f"{n_templates:>10} {fmt:>6} {method:>8}"
+                        f" {min(timings) * 1e3:>8.1f}ms {peak / 1024 ** 2:>10.2f}MB"
+                    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
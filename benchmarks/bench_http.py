@@ -0,0 +1,108 @@
+"""Benchmark fetching of remote manifests from a local server.
+
+The server delays every response by LATENCY_MS to mimic a remote one.
+
+Usage: python -m benchmarks.bench_http [N_MANIFESTS [LATENCY_MS]]
+"""
+
+import sys
+import tempfile
+import threading
+import time
+import requests
+import yaml
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from pathlib import Path
+
+from socketserver import ThreadingMixIn
+
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import HTTPCache
+from argo.workflows.dsl import Workflow
+
+from .bench_emit import workflow
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve(body: bytes, latency: float) -> _Server:
+    """Start a server responding with `body`, with ETag, at any path."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+
+            not_modified = self.headers.get("If-None-Match") == '"v1"'
+            payload = b"" if not_modified else body
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def main(n_manifests: int = 50, latency_ms: float = 10.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        manifest = _utils.sanitize_for_serialization(workflow(root, 200))
+        httpd = serve(yaml.dump(manifest).encode(), latency_ms / 1e3)
+
+        server = f"http://127.0.0.1:{httpd.server_address[1]}"
+        urls: List[str] = [f"{server}/wf-{i}.yaml" for i in range(n_manifests)]
+
+        def legacy():
+            # the former implementation of `Workflow.from_url`
+            for url in urls:
+                resp = requests.get(url)
+                resp.raise_for_status()
+                Workflow.from_dict(yaml.safe_load(resp.text))
+
+        revalidated = HTTPCache()
+        fresh = HTTPCache(root / "http", ttl=3600)
+
+        methods: Dict[str, Callable[[], None]] = {
+            "requests.get": legacy,
+            "from_url": lambda: [Workflow.from_url(u, cache=HTTPCache()) for u in urls],
+            "from_url (304)": lambda: [
+                Workflow.from_url(u, cache=revalidated) for u in urls
+            ],
+            "from_url (ttl)": lambda: [Workflow.from_url(u, cache=fresh) for u in urls],
+            "from_urls": lambda: Workflow.from_urls(urls, cache=HTTPCache()),
+        }
+
+        print(f"{n_manifests} manifests, {latency_ms}ms latency")
+        print(f"{'method':>16} {'time':>10}")
+
+        for name, method in methods.items():
+            method()  # warm up the caches
+
+            start = time.perf_counter()
+            method()
+            print(f"{name:>16} {time.perf_counter() - start:>9.3f}s")
+
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
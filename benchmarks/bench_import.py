@@ -0,0 +1,63 @@
+"""Benchmark import of a package of many DSL classes, eager vs. lazy.
+
+Usage: python -m benchmarks.bench_import [N_CLASSES] [N_TEMPLATES]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+
+from ._synthetic import write_package
+
+
+_SCRIPT = """\
+import importlib
+import time
+
+start = time.perf_counter()
+for i in range({n_classes}):
+    importlib.import_module(f"synthetic_pkg.synthetic_{{i}}")
+imported = time.perf_counter() - start
+
+start = time.perf_counter()
+for i in range(5):
+    module = importlib.import_module(f"synthetic_pkg.synthetic_{{i}}")
+    getattr(module, f"Synthetic{{i}}")().to_yaml()
+used = time.perf_counter() - start
+
+print(f"{{imported:.3f}} {{used:.3f}}")
+"""
+
+
+def run(root: Path, n_classes: int, lazy: bool):
+    env = dict(os.environ, ARGO_DSL_LAZY="1" if lazy else "0")
+    env["PYTHONPATH"] = os.pathsep.join([str(root), *sys.path])
+
+    out = subprocess.check_output(
+        [sys.executable, "-c", _SCRIPT.format(n_classes=n_classes)], env=env
+    )
+
+    return map(float, out.split())
+
+
+def main(n_classes: int = 800, n_templates: int = 5):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_package(
+            root, "synthetic_pkg", n_classes, n_templates, n_closures=2, n_scopes=1
+        )
+        # warm up bytecode caches
+        run(root, n_classes, lazy=True)
+
+        print(f"classes: {n_classes}, templates per class: {n_templates}")
+        for lazy in (False, True):
+            imported, used = run(root, n_classes, lazy)
+            mode = "lazy " if lazy else "eager"
+            print(f"{mode}  import: {imported:.3f}s  first use of 5 classes: {used:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
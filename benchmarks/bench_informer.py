@@ -0,0 +1,119 @@
+"""Benchmark repeated queries of workflows, GET requests vs `WorkflowInformer`.
+
+Every workflow of a local Argo server stand-in is queried by name ROUNDS
+times, as by a dashboard refreshing the status of the workflows.
+
+Usage: python -m benchmarks.bench_informer [N_WORKFLOWS [ROUNDS]]
+"""
+
+import json
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from socketserver import ThreadingMixIn
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client import WorkflowServiceApi
+
+from argo.workflows.dsl import WorkflowInformer
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    requests = 0
+
+
+def serve(manifests: Dict[str, Dict[str, Any]]) -> _Server:
+    """Start a server of the workflows, their watch stream stays idle."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.server.requests += 1
+
+            path: List[str] = self.path.split("?")[0].split("/")
+            if path[3] == "workflow-events":
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(60)
+                return
+
+            if len(path) > 5:
+                body: Any = manifests[path[5]]
+            else:
+                items = list(manifests.values())
+                body = {"metadata": {"resourceVersion": "1"}, "items": items}
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def main(n_workflows: int = 200, rounds: int = 10):
+    manifests: Dict[str, Dict[str, Any]] = {
+        f"wf-{i}": {
+            "metadata": {"name": f"wf-{i}", "labels": {"team": f"team-{i % 4}"}},
+            "spec": {"entrypoint": "main", "templates": [{"name": "main"}]},
+            "status": {"phase": "Running"},
+        }
+        for i in range(n_workflows)
+    }
+
+    print(f"{n_workflows} workflows, {rounds} rounds")
+    print(f"{'method':>10} {'per query':>12} {'requests':>9}")
+
+    for method in ("GET", "informer"):
+        httpd = serve(manifests)
+        config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+        client = ApiClient(configuration=config)
+
+        service = WorkflowServiceApi(api_client=client)
+        informer = WorkflowInformer(client, "bench").start()
+
+        def get(name: str) -> Any:
+            if method == "informer":
+                return informer.get(name)
+
+            return service.get_workflow("bench", name)
+
+        requests = httpd.requests
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name in manifests:
+                assert get(name).status.phase == "Running"
+        duration = (time.perf_counter() - start) / (rounds * n_workflows)
+
+        requests = httpd.requests - requests
+        print(f"{method:>10} {duration * 1e6:>10.1f}us {requests:>9}")
+
+        informer.stop()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
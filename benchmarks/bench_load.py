@@ -0,0 +1,97 @@
+"""Benchmark loading of large (archived) workflow manifests.
+
+Usage: python -m benchmarks.bench_load [N_TEMPLATES ...]
+"""
+
+import json
+import sys
+import tempfile
+import timeit
+import yaml
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client.models import V1alpha1Workflow
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import Workflow
+
+from .bench_emit import workflow
+
+
+def archived(root: Path, n_templates: int) -> Dict[str, Any]:
+    """Return manifest of a finished workflow of `n_templates` templates."""
+    manifest: Dict[str, Any] = _utils.sanitize_for_serialization(
+        workflow(root, n_templates)
+    )
+    manifest["metadata"]["name"] = "synthetic-abcde"
+
+    nodes: Dict[str, Any] = {}
+    for i in range(n_templates):
+        node_id = f"synthetic-abcde-{i:010d}"
+        nodes[node_id] = {
+            "id": node_id,
+            "name": f"synthetic-abcde.task-{i}",
+            "displayName": f"task-{i}",
+            "type": "Pod",
+            "templateName": f"echo-{i}",
+            "phase": "Succeeded",
+            "startedAt": "2020-01-01T00:00:00Z",
+            "finishedAt": "2020-01-01T00:01:00Z",
+            "inputs": {"parameters": [{"name": "message", "value": str(i)}]},
+            "outputs": {"exitCode": "0"},
+            "children": [f"synthetic-abcde-{i + 1:010d}"],
+        }
+
+    manifest["status"] = {
+        "phase": "Succeeded",
+        "startedAt": "2020-01-01T00:00:00Z",
+        "finishedAt": "2020-01-01T01:00:00Z",
+        "nodes": nodes,
+    }
+
+    return manifest
+
+
+def audit(path: Path) -> Any:
+    """Load the workflow lazily and read a few fields."""
+    wf = Workflow.from_file(path, lazy=True)
+
+    return wf.metadata.name, wf.spec.entrypoint, wf.status.phase
+
+
+def main(*sizes: int, repeat: int = 3):
+    print(f"{'templates':>10} {'size':>8} {'method':>24} {'time':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for n_templates in sizes or (100, 2000):
+            path = root / f"archived-{n_templates}.yaml"
+            path.write_text(yaml.dump(archived(root, n_templates)))
+
+            def legacy():
+                # the former implementation of `Workflow.from_file`
+                wf = yaml.safe_load(path.read_text())
+                response = type("Response", (), {"data": json.dumps(wf)})
+                return ApiClient().deserialize(response, V1alpha1Workflow)
+
+            for name, stmt in (
+                ("safe_load + roundtrip", legacy),
+                ("from_file", lambda: Workflow.from_file(path)),
+                ("from_file(lazy=True)", lambda: audit(path)),
+                ("  _utils.safe_load", lambda: _utils.safe_load(path.read_text())),
+            ):
+                best = min(timeit.repeat(stmt, number=1, repeat=repeat))
+                print(
+                    f"{n_templates:>10} {path.stat().st_size / 1024 ** 2:>6.2f}MB"
+                    f" {name:>24} {best * 1e3:>8.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""Benchmark loading of many manifests, one by one vs in a process pool.
+
+Usage: python -m benchmarks.bench_load_many [N_FILES] [N_TEMPLATES]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+from pathlib import Path
+
+from argo.workflows.dsl import Workflow
+
+from .bench_load import archived
+
+
+def main(n_files: int = 2000, n_templates: int = 20):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        manifest: str = yaml.dump(archived(root, n_templates))
+
+        manifests = root / "manifests"
+        manifests.mkdir()
+        for i in range(n_files):
+            (manifests / f"archived-{i}.yaml").write_text(manifest)
+
+        print(f"{n_files} files of {len(manifest) / 1024:.1f}kB, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        for path in sorted(manifests.iterdir()):
+            Workflow.from_file(path)
+        print(f"{'from_file':>24} {time.perf_counter() - start:>8.3f}s")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            for result in Workflow.load_many(manifests, workers=workers):
+                assert result.ok, result.error
+            duration = time.perf_counter() - start
+            print(f"{f'load_many(workers={workers})':>24} {duration:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""Benchmark `omitempty` over synthetic manifests.
+
+Usage: python -m benchmarks.bench_omitempty [N_TEMPLATES ...]
+"""
+
+import copy
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+
+from argo.workflows.dsl import _utils
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+def manifest(n_templates: int) -> Dict[str, Any]:
+    """Return a manifest (including empty values) of `n_templates` templates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_module(root / "bench_omitempty_wf.py", [workflow_source("Synthetic", 10)])
+
+        module = import_module(root, "bench_omitempty_wf")
+        d: Dict[str, Any] = module.Synthetic().to_dict(omitempty=False)
+
+    # the first template is the DAG, repeat the others
+    main, *templates = d["spec"]["templates"]
+    tasks = main["dag"]["tasks"]
+
+    main["dag"]["tasks"] = [copy.deepcopy(tasks[i % 10]) for i in range(n_templates)]
+    d["spec"]["templates"] = [main] + [
+        copy.deepcopy(templates[i % 10]) for i in range(n_templates)
+    ]
+
+    return d
+
+
+def main(*sizes: int):
+    print(f"{'templates':>10} {'time':>10} {'templates/s':>12} {'peak memory':>12}")
+
+    for n_templates in sizes or (10, 1000, 20000):
+        d = manifest(n_templates)
+        repeat = max(3, 10000 // n_templates)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _utils.omitempty(d)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        _utils.omitempty(d)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        best = min(timings)
+        print(
+            f"{n_templates:>10} {best * 1e3:>8.2f}ms {n_templates / best:>12.0f}"
+            f" {peak / 1024 ** 2:>10.2f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
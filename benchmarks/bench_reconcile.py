@@ -0,0 +1,147 @@
+"""Benchmark deploys of workflow templates, re-applying all vs `reconcile`.
+
+A local Argo server stand-in delays every response by LATENCY_MS to mimic
+a remote one. N_TEMPLATES templates are deployed unchanged and with 10
+of them changed.
+
+Usage: python -m benchmarks.bench_reconcile [N_TEMPLATES [LATENCY_MS]]
+"""
+
+import json
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from socketserver import ThreadingMixIn
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client import WorkflowTemplateServiceApi
+from argo.workflows.client.models import V1alpha1WorkflowTemplateUpdateRequest
+
+from argo.workflows.dsl import reconcile
+from argo.workflows.dsl import WorkflowTemplate
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    requests = 0
+
+
+def serve(latency: float) -> _Server:
+    """Start a server storing workflow templates."""
+    stored: Dict[str, Any] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self._respond({"metadata": {}, "items": list(stored.values())})
+
+        def do_POST(self):
+            self.do_PUT()
+
+        def do_PUT(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            manifest = request["template"]
+            manifest["metadata"]["resourceVersion"] = str(self.server.requests)
+            stored[manifest["metadata"]["name"]] = manifest
+
+            self._respond(manifest)
+
+        def _respond(self, body: Any):
+            self.server.requests += 1
+            time.sleep(latency)
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def templates(n_templates: int, changed: int = 0) -> List[WorkflowTemplate]:
+    """Return the templates, the first `changed` of them with another image."""
+    return [
+        WorkflowTemplate.from_dict(
+            {
+                "apiVersion": "argoproj.io/v1alpha1",
+                "kind": "WorkflowTemplate",
+                "metadata": {"name": f"template-{i}"},
+                "spec": {
+                    "entrypoint": "main",
+                    "templates": [
+                        {
+                            "name": "main",
+                            "container": {
+                                "image": "alpine:3.8" if i < changed else "alpine:3.7",
+                                "command": ["echo", f"{i}"],
+                            },
+                        }
+                    ],
+                },
+            }
+        )
+        for i in range(n_templates)
+    ]
+
+
+def apply_all(client: ApiClient, items: List[WorkflowTemplate]):
+    """Write every template, as `kubectl apply` does."""
+    service = WorkflowTemplateServiceApi(api_client=client)
+    for template in items:
+        request = V1alpha1WorkflowTemplateUpdateRequest(
+            name=template.name, namespace="bench", template=template
+        )
+        service.update_workflow_template("bench", template.name, request)
+
+
+def main(n_templates: int = 400, latency_ms: float = 20.0):
+    httpd = serve(latency_ms / 1e3)
+
+    config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+    config.connection_pool_maxsize = 8
+    client = ApiClient(configuration=config)
+
+    reconcile(client, "bench", templates(n_templates))
+
+    print(f"{n_templates} templates, {latency_ms}ms latency")
+    print(f"{'deploy':>24} {'time':>9} {'requests':>9}")
+
+    unchanged = templates(n_templates)
+    changed = templates(n_templates, changed=10)
+
+    for name, deploy in (
+        ("reconcile, unchanged", lambda: reconcile(client, "bench", unchanged)),
+        ("reconcile, 10 changed", lambda: reconcile(client, "bench", changed)),
+        ("apply all", lambda: apply_all(client, changed)),
+    ):
+        requests = httpd.requests
+        start = time.perf_counter()
+        deploy()
+        duration = time.perf_counter() - start
+
+        print(f"{name:>24} {duration:>8.2f}s {httpd.requests - requests:>9}")
+
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]), *map(float, sys.argv[2:]))
@@ -0,0 +1,31 @@
+"""Benchmark per-call overhead of (de)serialization of small workflows.
+
+Usage: python -m benchmarks.bench_roundtrip [N_CALLS]
+"""
+
+import json
+import sys
+import timeit
+
+from pathlib import Path
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import Workflow
+
+_WORKFLOW_FILE = Path(__file__).parent.parent / "tests/data/workflows/hello-world.yaml"
+
+
+def main(n_calls: int = 2000):
+    wf = Workflow.from_file(_WORKFLOW_FILE)
+    manifest = json.dumps(_utils.sanitize_for_serialization(wf))
+
+    for name, stmt in (
+        ("sanitize_for_serialization", lambda: _utils.sanitize_for_serialization(wf)),
+        ("from_string", lambda: Workflow.from_string(manifest)),
+    ):
+        best = min(timeit.repeat(stmt, number=n_calls, repeat=3))
+        print(f"{name:>28}: {best / n_calls * 1e6:8.1f}us per call")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+"""Benchmark serializer backends on large manifests.
+
+Usage: python -m benchmarks.bench_serializers [N_TEMPLATES ...]
+"""
+
+import sys
+import time
+
+from typing import Dict
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import get_serializer
+from argo.workflows.dsl import Serializer
+from argo.workflows.dsl import YAMLSerializer
+
+from .bench_omitempty import manifest
+
+
+def main(*sizes: int, repeat: int = 3):
+    serializers: Dict[str, Serializer] = {
+        # the generic representer, as used before the serializer backends
+        "yaml (BlockDumper)": YAMLSerializer(_utils.BlockDumper),
+        "yaml": get_serializer("yaml"),
+        "json": get_serializer("json"),
+    }
+
+    print(f"{'templates':>10} {'serializer':>20} {'time':>10} {'MB/s':>8}")
+
+    for n_templates in sizes or (1000, 10000):
+        d = _utils.omitempty(manifest(n_templates))
+
+        for name, serializer in serializers.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                serialized = serializer.dumps(d)
+                timings.append(time.perf_counter() - start)
+
+            best = min(timings)
+            print(
+                f"{n_templates:>10} {name:>20} {best:>9.3f}s"
+                f" {len(serialized) / best / 1024 ** 2:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""Benchmark queries of huge status node maps, models vs `NodeStatusView`.
+
+A completed workflow of N_NODES nodes, 1% of them failed, is decoded
+from JSON and its failed leaf nodes are looked up.
+
+Usage: python -m benchmarks.bench_status [N_NODES]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from argo.workflows.client.models import V1alpha1Workflow
+
+from argo.workflows.dsl import NodeStatusView
+from argo.workflows.dsl import _utils
+
+
+def manifest(n_nodes: int) -> str:
+    """Return JSON of a workflow of a DAG of `n_nodes` pods."""
+    nodes: Dict[str, Any] = {
+        "wf": {
+            "id": "wf",
+            "name": "wf",
+            "displayName": "wf",
+            "type": "DAG",
+            "phase": "Failed",
+            "templateName": "main",
+            "children": [f"wf-{i}" for i in range(n_nodes)],
+        }
+    }
+    for i in range(n_nodes):
+        nodes[f"wf-{i}"] = {
+            "id": f"wf-{i}",
+            "name": f"wf.task-{i}",
+            "displayName": f"task-{i}",
+            "type": "Pod",
+            "phase": "Failed" if i % 100 == 0 else "Succeeded",
+            "templateName": f"template-{i % 10}",
+            "boundaryID": "wf",
+            "startedAt": "2020-01-01T00:00:00Z",
+            "finishedAt": "2020-01-01T00:01:00Z",
+            "hostNodeName": "node-1",
+            "resourcesDuration": {"cpu": 60, "memory": 60},
+            "outputs": {
+                "parameters": [{"name": "result", "value": f"{i}"}],
+                "exitCode": "0",
+            },
+        }
+
+    return json.dumps(
+        {
+            "apiVersion": "argoproj.io/v1alpha1",
+            "kind": "Workflow",
+            "metadata": {"name": "wf"},
+            "spec": {"entrypoint": "main", "templates": [{"name": "main"}]},
+            "status": {"phase": "Failed", "nodes": nodes},
+        }
+    )
+
+
+def failed_leaves(wf: V1alpha1Workflow) -> List[str]:
+    return [
+        node.id
+        for node in wf.status.nodes.values()
+        if node.phase == "Failed" and not node.children
+    ]
+
+
+def measure(fn: Callable[[], Any]) -> Tuple[Any, float, float]:
+    """Return the result, seconds and peak MiB allocated by the call."""
+    start = time.perf_counter()
+    result = fn()
+    duration = time.perf_counter() - start
+
+    # traced separately, tracing slows down the call
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, duration, peak / 2 ** 20
+
+
+def main(n_nodes: int = 10_000):
+    text = manifest(n_nodes)
+    print(f"{n_nodes} nodes, {len(text) / 2 ** 20:.1f}MiB of JSON")
+    print(f"{'method':>16} {'decode':>10} {'peak':>9} {'query':>10}")
+
+    wf, decode, peak = measure(lambda: _utils.deserialize(text, V1alpha1Workflow))
+    expected, query, _ = measure(lambda: failed_leaves(wf))
+    report("models", decode, peak, query)
+
+    nodes, decode, peak = measure(lambda: NodeStatusView.from_json(text))
+    found, query, _ = measure(lambda: nodes.ids(phase="Failed", leaf=True))
+    report("NodeStatusView", decode, peak, query)
+
+    assert found == expected
+
+
+def report(method: str, decode: float, peak: float, query: float):
+    print(f"{method:>16} {decode:>9.3f}s {peak:>7.1f}MiB {query * 1e3:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
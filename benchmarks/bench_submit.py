@@ -0,0 +1,116 @@
+"""Benchmark submission of many workflows to a local Argo server stand-in.
+
+The server delays every response by LATENCY_MS to mimic a remote one.
+
+Usage: python -m benchmarks.bench_submit [N_WORKFLOWS [LATENCY_MS]]
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from pathlib import Path
+
+from socketserver import ThreadingMixIn
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+
+from argo.workflows.dsl import submit_many
+from argo.workflows.dsl import AsyncClient
+
+from ._synthetic import import_module
+from ._synthetic import workflow_source
+from ._synthetic import write_module
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve(latency: float) -> _Server:
+    """Start a server echoing created workflows."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            request = self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(latency)
+
+            # {"workflow": {...}} -> {...}, not parsed to spare the CPU
+            body = request[request.index(b":") + 1 : request.rindex(b"}")]
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def main(n_workflows: int = 500, latency_ms: float = 20.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        write_module(root / "bench_submit_wf.py", [workflow_source("Synthetic", 5)])
+        klass = import_module(root, "bench_submit_wf").Synthetic
+
+        httpd = serve(latency_ms / 1e3)
+
+        print(f"{n_workflows} workflows, {latency_ms}ms latency")
+        print(f"{'method':>22} {'time':>10} {'throughput':>12}")
+
+        for concurrency in (0, 1, 8, 32):
+            config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+            config.connection_pool_maxsize = max(concurrency, 1)
+            client = ApiClient(configuration=config)
+
+            wfs = [klass() for _ in range(n_workflows)]
+
+            start = time.perf_counter()
+            if concurrency:
+                name = f"submit_many({concurrency})"
+                results = submit_many(client, "bench", wfs, concurrency=concurrency)
+                assert all(r.ok for r in results)
+            else:
+                name = "submit"
+                for wf in wfs:
+                    wf.submit(client, "bench")
+
+            duration = time.perf_counter() - start
+            print(f"{name:>22} {duration:>9.3f}s {n_workflows / duration:>10.1f}/s")
+
+        async def asubmit(wfs):
+            async with AsyncClient(config, limit=64) as client:
+                await asyncio.gather(*(wf.asubmit(client, "bench") for wf in wfs))
+
+        wfs = [klass() for _ in range(n_workflows)]
+
+        start = time.perf_counter()
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(asubmit(wfs))
+        loop.close()
+
+        duration = time.perf_counter() - start
+        name = "asubmit (64 conns)"
+        print(f"{name:>22} {duration:>9.3f}s {n_workflows / duration:>10.1f}/s")
+
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
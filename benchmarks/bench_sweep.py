@@ -0,0 +1,65 @@
+"""Benchmark parameter sweeps, `submit(parameters=...)` vs `submit_sweep`.
+
+Workflows are submitted one at a time to a local Argo server stand-in
+which echoes the created workflows, as the Argo server does.
+
+Usage: python -m benchmarks.bench_sweep [N_VARIANTS [N_TEMPLATES ...]]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Arguments
+from argo.workflows.client.models import V1alpha1Parameter
+
+from argo.workflows.dsl import submit_sweep
+
+from .bench_emit import workflow
+from .bench_submit import serve
+
+
+def main(n_variants: int = 200, *sizes: int):
+    httpd = serve(latency=0.0)
+
+    config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+    client = ApiClient(configuration=config)
+
+    print(f"{n_variants} variants")
+    print(f"{'templates':>10} {'method':>14} {'per variant':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        for n_templates in sizes or (10, 500):
+            wf = workflow(root, n_templates)
+            wf.spec.arguments = V1alpha1Arguments(
+                parameters=[
+                    V1alpha1Parameter(name="lr"),
+                    V1alpha1Parameter(name="seed", default="0"),
+                ]
+            )
+            variants = [{"lr": f"{i / n_variants:.4f}"} for i in range(n_variants)]
+
+            start = time.perf_counter()
+            for values in variants:
+                wf.submit(client, "bench", parameters=values)
+            legacy = (time.perf_counter() - start) / n_variants
+
+            start = time.perf_counter()
+            results = submit_sweep(client, "bench", wf, variants, concurrency=1)
+            sweep = (time.perf_counter() - start) / n_variants
+            assert all(r.ok for r in results)
+
+            for name, duration in (("submit", legacy), ("submit_sweep", sweep)):
+                print(f"{n_templates:>10} {name:>14} {duration * 1e3:>10.2f}ms")
+
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""Benchmark waiting for workflows, polling vs `wait_all`.
+
+Workflows of a local Argo server stand-in finish one by one over SPAN_S
+seconds. They're awaited by polling every workflow each INTERVAL_S
+seconds, as by `scripts/validate_workflow.sh`, and by the watch stream.
+
+Usage: python -m benchmarks.bench_wait [N_WORKFLOWS [SPAN_S [INTERVAL_S]]]
+"""
+
+import json
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
+from socketserver import ThreadingMixIn
+
+from typing import Any
+from typing import Dict
+from typing import List
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client import WorkflowServiceApi
+
+from argo.workflows.dsl import wait_all
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    requests = 0
+
+
+def serve(finish: Dict[str, float]) -> _Server:
+    """Start a server of workflows finishing at the given times."""
+
+    def manifest(name: str) -> Dict[str, Any]:
+        phase = "Succeeded" if time.monotonic() >= finish[name] else "Running"
+        return {"metadata": {"name": name}, "spec": {}, "status": {"phase": phase}}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.server.requests += 1
+
+            path: List[str] = self.path.split("?")[0].split("/")
+            if path[3] == "workflow-events":
+                return self._stream()
+
+            if len(path) > 5:
+                body: Any = manifest(path[5])
+            else:
+                items = [manifest(name) for name in finish]
+                body = {"metadata": {"resourceVersion": "1"}, "items": items}
+
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            for name, at in sorted(finish.items(), key=lambda item: item[1]):
+                time.sleep(max(0.0, at - time.monotonic()))
+
+                event = {"result": {"type": "MODIFIED", "object": manifest(name)}}
+                data = json.dumps(event).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    return httpd
+
+
+def poll(client: ApiClient, names: List[str], interval: float):
+    """Poll the workflows until they finish."""
+    service = WorkflowServiceApi(api_client=client)
+
+    pending = list(names)
+    while pending:
+        pending = [
+            name
+            for name in pending
+            if service.get_workflow("bench", name).status.phase != "Succeeded"
+        ]
+        if pending:
+            time.sleep(interval)
+
+
+def main(n_workflows: int = 200, span: float = 2.0, interval: float = 1.0):
+    names = [f"wf-{i}" for i in range(n_workflows)]
+
+    print(f"{n_workflows} workflows finishing over {span}s")
+    print(f"{'method':>22} {'after the last':>15} {'requests':>9}")
+
+    for method in (f"poll every {interval}s", "wait_all"):
+        start = time.monotonic()
+        finish = {
+            name: start + span * (i + 1) / n_workflows for i, name in enumerate(names)
+        }
+
+        httpd = serve(finish)
+        config = Configuration(host=f"http://127.0.0.1:{httpd.server_address[1]}")
+        client = ApiClient(configuration=config)
+
+        if method == "wait_all":
+            wait_all(client, "bench", names)
+        else:
+            poll(client, names, interval)
+
+        latency = time.monotonic() - max(finish.values())
+        print(f"{method:>22} {latency * 1e3:>13.1f}ms {httpd.requests:>9}")
+
+        httpd.shutdown()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]), *map(float, sys.argv[2:]))
@@ -44,6 +44,10 @@ setup_args = dict(
     packages=["argo.workflows.%s" % p for p in find_packages(where="argo/workflows/")],
     zip_safe=False,
     install_requires=REQUIREMENTS,
+    extras_require={"async": ["aiohttp"]},
+    entry_points={
+        "console_scripts": ["argo-dsl=argo.workflows.dsl.__main__:main"],
+    },
 )
 
 if __name__ == "__main__":
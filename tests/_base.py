@@ -1,12 +1,99 @@
 """A base class for implementing tests."""
 
+import asyncio
+import contextlib
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+
 from pathlib import Path
 
+from socketserver import ThreadingMixIn
+
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+
 
 _HERE = Path(__file__).parent
 
+T = TypeVar("T")
+
 
 class TestCase:
     """A base class for implementing test cases."""
 
     DATA = _HERE / "data"
+
+
+class Handler(BaseHTTPRequestHandler):
+    """A base class for local server stand-ins, see `serve`."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def read_json(self) -> Any:
+        """Read the JSON body of the request."""
+        return json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        """Send the response, the body is encoded as JSON unless it is bytes."""
+        data: bytes = body if isinstance(body, bytes) else json.dumps(body).encode()
+
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_chunked(self):
+        """Start a streamed response, see `send_chunk`."""
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def send_chunk(self, body: Any):
+        """Send a JSON line of a streamed response."""
+        data = json.dumps(body).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def end_chunked(self):
+        """End a streamed response."""
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@contextlib.contextmanager
+def serve(handler: Type[BaseHTTPRequestHandler]) -> Iterator[str]:
+    """Serve requests by the handler on a local port, yields the URL."""
+    httpd = _Server(("127.0.0.1", 0), handler)
+
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def run(coro: Awaitable[T]) -> T:
+    """Run the coroutine by a new event loop, like `asyncio.run` of Python 3.7."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from pathlib import Path
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.rest import ApiException
+
+from argo.workflows.dsl import AsyncClient
+from argo.workflows.dsl import HTTPCache
+from argo.workflows.dsl import Workflow
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import run
+from ._base import serve
+
+"""Asynchronous client test suite."""
+
+pytest.importorskip("aiohttp")
+
+
+_WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+
+class _Handler(Handler):
+    """Argo server stand-in, also serving the manifest at /manifests/."""
+
+    created: List[Dict[str, Any]] = []
+    log: List[str] = []
+
+    def do_GET(self):
+        self.log.append(self.path)
+
+        if self.path.startswith("/manifests/"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                return self.send(304, b"", {"ETag": '"v1"'})
+            return self.send(200, _WORKFLOW_FILE.read_bytes(), {"ETag": '"v1"'})
+
+        if self.path.startswith("/api/v1/workflow-events/"):
+            events = b"".join(
+                json.dumps({"result": {"type": "ADDED", "object": wf}}).encode()
+                + b"\n"
+                for wf in self.created
+            )
+            return self.send(200, events)
+
+        if self.path.startswith("/api/v1/workflows/test?"):
+            return self.send(
+                200, {"metadata": {"resourceVersion": "1"}, "items": self.created}
+            )
+
+        name = self.path.rsplit("/", 1)[-1]
+        for wf in self.created:
+            if wf["metadata"]["name"] == name:
+                return self.send(200, wf)
+
+        self.send(404, {"message": "not found"})
+
+    def do_POST(self):
+        wf: Dict[str, Any] = self.read_json()["workflow"]
+        wf["metadata"]["name"] = f"hello-world-{len(self.created)}"
+        self.created.append(wf)
+
+        self.send(200, wf)
+
+
+@pytest.fixture  # type: ignore
+def config() -> Iterator[Configuration]:
+    """Configuration of a local Argo server fixture."""
+    _Handler.created, _Handler.log = [], []
+
+    with serve(_Handler) as url:
+        yield Configuration(host=url)
+
+
+def _submit(config: Configuration, n: int) -> List[V1alpha1Workflow]:
+    """Submit `n` workflows asynchronously."""
+
+    async def main():
+        async with AsyncClient(config) as client:
+            wfs = [Workflow.from_file(_WORKFLOW_FILE) for _ in range(n)]
+            return await asyncio.gather(*(wf.asubmit(client, "test") for wf in wfs))
+
+    return run(main())
+
+
+class TestAsyncClient(TestCase):
+    """Test asynchronous submission and queries."""
+
+    def test_asubmit(self, config: Configuration) -> None:
+        """Test `Workflow.asubmit` method."""
+        created = _submit(config, 10)
+
+        assert all(isinstance(wf, V1alpha1Workflow) for wf in created)
+        assert sorted(wf.metadata.name for wf in created) == [
+            f"hello-world-{i}" for i in range(10)
+        ]
+        assert len(_Handler.created) == 10
+
+    def test_get_workflow(self, config: Configuration) -> None:
+        """Test `AsyncClient.get_workflow` method."""
+        _submit(config, 3)
+
+        async def main():
+            async with AsyncClient(config) as client:
+                wf = await client.get_workflow("test", "hello-world-2")
+                assert wf.metadata.name == "hello-world-2"
+                assert wf.spec == Workflow.from_file(_WORKFLOW_FILE).spec
+
+                with pytest.raises(ApiException) as exc:
+                    await client.get_workflow("test", "missing")
+                assert exc.value.status == 404
+
+        run(main())
+
+    def test_list_workflows(self, config: Configuration) -> None:
+        """Test `AsyncClient.list_workflows` method."""
+        _submit(config, 3)
+
+        async def main():
+            async with AsyncClient(config) as client:
+                return await client.list_workflows("test", label_selector="a=b")
+
+        wf_list = run(main())
+
+        assert len(wf_list.items) == 3
+        assert _Handler.log[-1].endswith("listOptions.labelSelector=a%3Db")
+
+    def test_watch_workflows(self, config: Configuration) -> None:
+        """Test `AsyncClient.watch_workflows` method."""
+        created = _submit(config, 3)
+
+        async def main():
+            async with AsyncClient(config) as client:
+                return [e async for e in client.watch_workflows("test")]
+
+        events = run(main())
+
+        assert [e.type for e in events] == ["ADDED"] * 3
+
+        by_name = {wf.metadata.name: wf for wf in created}
+        assert all(e.object == by_name[e.object.metadata.name] for e in events)
+
+    def test_afrom_url(self, config: Configuration) -> None:
+        """Test `Workflow.afrom_url` method."""
+        url = f"{config.host}/manifests/hello-world.yaml"
+        cache = HTTPCache()
+
+        async def main():
+            wf = await Workflow.afrom_url(url, cache=cache)
+            assert wf == Workflow.from_file(_WORKFLOW_FILE)
+
+            async with AsyncClient() as client:
+                assert await Workflow.afrom_url(url, client=client, cache=cache) == wf
+
+        run(main())
+
+        # revalidated by the second request
+        assert _Handler.log == ["/manifests/hello-world.yaml"] * 2
+
+    def test_afrom_url_disk(self, config: Configuration, tmpdir) -> None:
+        """Test that entries on disk are not read nor written by the event loop."""
+        url = f"{config.host}/manifests/hello-world.yaml"
+        threads: List[threading.Thread] = []
+
+        class _Cache(HTTPCache):
+            def get(self, url: str):
+                threads.append(threading.current_thread())
+                return super().get(url)
+
+            def put(self, url: str, entry):
+                threads.append(threading.current_thread())
+                return super().put(url, entry)
+
+        cache = _Cache(Path(str(tmpdir)))
+
+        async def main():
+            for _ in range(2):
+                wf = await Workflow.afrom_url(url, cache=cache)
+                assert wf == Workflow.from_file(_WORKFLOW_FILE)
+
+        run(main())
+
+        # fetched, then revalidated
+        assert len(threads) == 4
+        assert threading.main_thread() not in threads
+        assert list(Path(str(tmpdir)).glob("*.json"))
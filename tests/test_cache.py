@@ -0,0 +1,136 @@
+import os
+
+from pathlib import Path
+
+from argo.workflows.dsl import BuildCache
+from argo.workflows.dsl import compile_all
+from argo.workflows.dsl import Workflow
+
+from ._base import TestCase
+
+"""Build cache test suite."""
+
+
+_SOURCE = '''
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl.templates import V1Container
+from argo.workflows.dsl.templates import template
+
+IMAGE = "{image}"
+
+
+class Cached(Workflow):
+    entrypoint = "echo"
+
+    @template
+    def echo(self) -> V1Container:
+        return V1Container(image=IMAGE, name="echo")
+'''
+
+
+class TestBuildCache(TestCase):
+    """Test BuildCache."""
+
+    def test_to_file(self, tmpdir) -> None:
+        """Test `Workflow.to_file` with a build cache."""
+        cache = BuildCache(Path(str(tmpdir)) / "cache")
+
+        class TestWorkflowCached(Workflow):
+            name = "test"
+
+        path = Path(str(tmpdir)) / "test.yaml"
+
+        TestWorkflowCached(compile=False).to_file(path, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        manifest = path.read_text()
+        path.unlink()
+
+        TestWorkflowCached(compile=False).to_file(path, cache=cache)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert path.read_text() == manifest
+
+        # the format is part of the key
+        TestWorkflowCached().to_file(path, fmt="json", cache=cache)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # so is the metadata of the instance
+        wf = TestWorkflowCached(compile=False)
+        wf.metadata.name = "renamed"
+        wf.to_file(path, cache=cache)
+        assert (cache.hits, cache.misses) == (1, 3)
+        assert "name: renamed" in path.read_text()
+
+        # loaded workflows carry their own spec, they're not cached
+        Workflow.from_file(path).to_file(path, cache=cache)
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_compile_all(self, tmpdir) -> None:
+        """Test `compile_all` with a build cache."""
+        cache = BuildCache(Path(str(tmpdir)) / "cache")
+
+        source = Path(str(tmpdir)) / "cached.py"
+        output = Path(str(tmpdir)) / "output"
+
+        source.write_text(_SOURCE.format(image="alpine:3.7"))
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and not result.cached
+
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and result.cached
+
+        # module level code is part of the key
+        source.write_text(_SOURCE.format(image="alpine:3.8"))
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and not result.cached
+
+        wf = Workflow.from_file(result.path)
+        assert wf.spec.templates[0].container.image == "alpine:3.8"
+
+    def test_evict(self, tmpdir) -> None:
+        """Test eviction of least recently used entries."""
+        cache = BuildCache(Path(str(tmpdir)))
+
+        for mtime, key in enumerate(("aa", "bb", "cc")):
+            cache.put(key * 32, b"x" * 1024)
+            os.utime(str(cache._entry(key * 32)), (mtime, mtime))
+
+        # mark the first entry as recently used
+        assert cache.get("aa" * 32) is not None
+
+        cache.max_size = 2 * 1024
+        cache.evict()
+
+        assert cache.get("aa" * 32) is not None
+        assert cache.get("cc" * 32) is not None
+        assert cache.get("bb" * 32) is None
+
+    def test_compile_all_imports(self, tmpdir, monkeypatch) -> None:
+        """Test that imported modules are part of the cache key."""
+        cache = BuildCache(Path(str(tmpdir)) / "cache")
+
+        sources = Path(str(tmpdir)) / "sources"
+        sources.mkdir()
+        monkeypatch.syspath_prepend(str(sources))
+
+        helper = sources / "cached_helper.py"
+        source = sources / "cached_imports.py"
+        output = Path(str(tmpdir)) / "output"
+
+        source.write_text(
+            _SOURCE.replace('IMAGE = "{image}"', "from cached_helper import IMAGE")
+        )
+
+        helper.write_text('IMAGE = "alpine:3.7"\n')
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and not result.cached
+
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and result.cached
+
+        helper.write_text('IMAGE = "alpine:3.8"\n')
+        (result,) = compile_all(source, workers=1, output=output, cache=cache)
+        assert result.ok and not result.cached
+
+        wf = Workflow.from_file(result.path)
+        assert wf.spec.templates[0].container.image == "alpine:3.8"
@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from argo.workflows.dsl import compile_all
+from argo.workflows.dsl import Workflow
+
+from ._base import TestCase
+
+"""Bulk compiler test suite."""
+
+
+class TestCompiler(TestCase):
+    """Test compile_all."""
+
+    _WORKFLOWS_DIR = Path(__file__).parent / "workflows"
+
+    def test_compile_all(self, tmpdir) -> None:
+        """Test `compile_all` function."""
+        sources = Path(str(tmpdir)) / "sources"
+        sources.mkdir()
+
+        broken = sources / "broken.py"
+        broken.write_text("raise RuntimeError('broken')\n")
+
+        output = Path(str(tmpdir)) / "output"
+        results = compile_all(
+            [self._WORKFLOWS_DIR / "hello-world.py", sources], workers=2, output=output
+        )
+
+        assert len(results) == 2
+
+        hello_world, failed = results
+        assert hello_world.ok
+        assert hello_world.name == "HelloWorld"
+        assert hello_world.path == output / "hello-world" / "hello-world.yaml"
+
+        wf = Workflow.from_file(hello_world.path)
+        assert wf.spec.entrypoint == "whalesay"
+
+        # failures do not abort the batch
+        assert not failed.ok
+        assert failed.name is None
+        assert "RuntimeError: broken" in failed.error
+
+    def test_compile_all_collisions(self, tmpdir) -> None:
+        """Test `compile_all` with classes of the same name in different modules."""
+        source = (self._WORKFLOWS_DIR / "hello-world.py").read_text()
+
+        sources = Path(str(tmpdir)) / "sources"
+        for package in ("a", "b"):
+            (sources / package).mkdir(parents=True)
+            (sources / package / "hello.py").write_text(source)
+
+        output = Path(str(tmpdir)) / "output"
+        results = compile_all(sources, workers=2, output=output)
+
+        # written by the module path
+        assert [r.path for r in results] == [
+            output / "a" / "hello" / "hello-world.yaml",
+            output / "b" / "hello" / "hello-world.yaml",
+        ]
+
+        # the same script given twice
+        results = compile_all(
+            [sources / "a" / "hello.py", sources / "b" / "hello.py"], output=output
+        )
+
+        assert len(results) == 2
+        for r in results:
+            assert not r.ok
+            assert r.path is None
+            assert "written by 2 classes" in r.error
+
+    def test_compile_all_imports(self, tmpdir) -> None:
+        """Test `compile_all` of scripts importing their sibling modules."""
+        source = (self._WORKFLOWS_DIR / "hello-world.py").read_text()
+        source = source.replace('"hello world"', "MESSAGE")
+
+        sources = Path(str(tmpdir)) / "sources"
+        (sources / "package").mkdir(parents=True)
+
+        (sources / "messages.py").write_text("MESSAGE = 'script'\n")
+        (sources / "script.py").write_text(f"from messages import MESSAGE\n{source}")
+
+        (sources / "package" / "__init__.py").write_text("MESSAGE = 'package'\n")
+        (sources / "package" / "module.py").write_text(
+            f"from . import MESSAGE\n{source}"
+        )
+
+        output = Path(str(tmpdir)) / "output"
+        results = compile_all(sources, workers=2, output=output)
+
+        # package files are not compiled as scripts, nor are modules importing them
+        assert all(r.ok for r in results)
+        assert [r.path for r in results] == [
+            output / "package" / "module" / "hello-world.yaml",
+            output / "script" / "hello-world.yaml",
+        ]
+
+        messages = [
+            Workflow.from_file(r.path).spec.templates[0].container.args[0]
+            for r in results
+        ]
+        assert messages == ["package", "script"]
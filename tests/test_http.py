@@ -0,0 +1,147 @@
+import os
+import requests
+
+import pytest
+
+from pathlib import Path
+
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from argo.workflows.dsl import HTTPCache
+from argo.workflows.dsl import Workflow
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Remote manifests test suite."""
+
+
+_WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+
+class _Handler(Handler):
+    """Artifact server stand-in, serves the same manifest at any path."""
+
+    etag = '"v1"'
+    log: List[Tuple[str, int, int]] = []  # (path, status, client port)
+
+    def do_GET(self):
+        if self.path.startswith("/missing"):
+            status, body = 404, b""
+        elif self.headers.get("If-None-Match") == self.etag:
+            status, body = 304, b""
+        else:
+            status, body = 200, _WORKFLOW_FILE.read_bytes()
+
+        self.log.append((self.path, status, self.client_address[1]))
+        self.send(status, body, {"ETag": self.etag})
+
+
+@pytest.fixture  # type: ignore
+def server() -> Iterator[str]:
+    """Local HTTP server fixture, yields its URL."""
+    _Handler.log = []
+
+    with serve(_Handler) as url:
+        yield url
+
+
+class TestHTTP(TestCase):
+    """Test fetching of remote manifests."""
+
+    def test_from_url(self, server: str) -> None:
+        """Test `Workflow.from_url` against a local server."""
+        cache = HTTPCache()
+
+        wf = Workflow.from_url(f"{server}/hello-world.yaml", cache=cache)
+        assert wf == Workflow.from_file(_WORKFLOW_FILE)
+
+        # cached manifests are revalidated
+        assert Workflow.from_url(f"{server}/hello-world.yaml", cache=cache) == wf
+        assert [status for _, status, _ in _Handler.log] == [200, 304]
+
+        # connections are reused
+        assert len({port for _, _, port in _Handler.log}) == 1
+
+        with pytest.raises(requests.HTTPError, match="404"):
+            Workflow.from_url(f"{server}/missing.yaml", cache=cache)
+
+    def test_from_url_ttl(self, server: str, tmpdir) -> None:
+        """Test `Workflow.from_url` with an on-disk cache."""
+        url = f"{server}/hello-world.yaml"
+        path = Path(str(tmpdir)) / "http"
+
+        wf = Workflow.from_url(url, cache=HTTPCache(path, ttl=60))
+
+        # shared by another process (cache instance), no request within ttl
+        assert Workflow.from_url(url, cache=HTTPCache(path, ttl=60)) == wf
+        assert len(_Handler.log) == 1
+
+        # expired, revalidated
+        assert Workflow.from_url(url, cache=HTTPCache(path)) == wf
+        assert [status for _, status, _ in _Handler.log] == [200, 304]
+
+        HTTPCache(path).clear()
+        assert not list(path.glob("*.json"))
+
+    def test_max_entries(self, server: str, tmpdir) -> None:
+        """Test eviction of the least recently used entries kept in memory."""
+        cache = HTTPCache(max_entries=2)
+
+        urls = [f"{server}/hello-world-{i}.yaml" for i in range(3)]
+        for url in urls:
+            Workflow.from_url(url, cache=cache)
+        Workflow.from_url(urls[1], cache=cache)  # recently used
+
+        Workflow.from_url(f"{server}/hello-world-3.yaml", cache=cache)
+
+        assert cache.get(urls[0]) is None
+        assert cache.get(urls[1]) is not None
+        assert cache.get(urls[2]) is None
+
+        # evicted entries are read from disk again
+        cache = HTTPCache(Path(str(tmpdir)), max_entries=1)
+        for url in urls:
+            Workflow.from_url(url, cache=cache)
+
+        assert len(cache._entries) == 1
+        assert all(cache.get(url) is not None for url in urls)
+
+    def test_max_size(self, server: str, tmpdir) -> None:
+        """Test eviction of the least recently used entries on disk."""
+        cache = HTTPCache(Path(str(tmpdir)))
+
+        urls = [f"{server}/hello-world-{i}.yaml" for i in range(3)]
+        for i, url in enumerate(urls):
+            Workflow.from_url(url, cache=cache)
+            os.utime(str(cache._entry(url)), (i, i))
+
+        # a temporary file of a crashed writer, see `atomic_open`
+        entry = cache._entry(urls[0])
+        stale = entry.with_name(f".{entry.name}.tmp-crashed")
+        stale.write_text("")
+        os.utime(str(stale), (0, 0))
+
+        cache.max_size = sum(cache._entry(url).stat().st_size for url in urls[1:])
+        cache.evict()
+
+        assert [cache._entry(url).exists() for url in urls] == [False, True, True]
+        assert not stale.exists()
+
+    def test_from_urls(self, server: str) -> None:
+        """Test `Workflow.from_urls` method."""
+        urls = [f"{server}/hello-world-{i}.yaml" for i in range(8)]
+
+        wfs = Workflow.from_urls(urls, workers=4, cache=HTTPCache())
+
+        assert len(wfs) == 8
+        assert all(wf == Workflow.from_file(_WORKFLOW_FILE) for wf in wfs)
+        assert sorted(path for path, _, _ in _Handler.log) == sorted(
+            url[len(server) :] for url in urls
+        )
+
+        with pytest.raises(requests.HTTPError, match="404"):
+            Workflow.from_urls(urls + [f"{server}/missing.yaml"], cache=HTTPCache())
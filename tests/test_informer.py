@@ -0,0 +1,217 @@
+import time
+
+import pytest
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.models import V1ObjectMeta
+from argo.workflows.client.rest import ApiException
+
+from argo.workflows.dsl import RetryPolicy
+from argo.workflows.dsl import WorkflowInformer
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Workflow informer test suite."""
+
+
+def _manifest(name: str, phase: str, **labels: str) -> Dict[str, Any]:
+    return {
+        "metadata": {"name": name, "labels": labels},
+        "spec": {},
+        "status": {"phase": phase},
+    }
+
+
+def _eventually(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+
+    return True
+
+
+class _Handler(Handler):
+    """Argo server stand-in, streams `events` as they're appended.
+
+    Workflows `listed` are returned by the list, at resource version 1,
+    the events follow at resource versions 2, 3, ... Streams fail if
+    the server is `broken`, requests are rejected if `forbidden`.
+    """
+
+    listed: List[Dict[str, Any]] = []
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    broken = False
+    forbidden = False
+
+    requests: List[str] = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query: Dict[str, List[str]] = parse_qs(url.query)
+        path: List[str] = url.path.split("/")
+
+        if self.forbidden:
+            self.requests.append("forbidden")
+            return self.send(403, {"message": "forbidden"})
+
+        if path[3] == "workflow-events":
+            self.requests.append("watch")
+            return self._stream(query)
+
+        if len(path) > 5:
+            self.requests.append("get")
+            [found] = [wf for wf in self.listed if wf["metadata"]["name"] == path[5]]
+            return self.send(200, found)
+
+        self.requests.append("list")
+        self.send(200, {"metadata": {"resourceVersion": "1"}, "items": self.listed})
+
+    def _stream(self, query: Dict[str, List[str]]):
+        if self.broken:
+            return self.send(503, {"message": "unavailable"})
+
+        [version] = query["listOptions.resourceVersion"]
+        [seconds] = query["listOptions.timeoutSeconds"]
+
+        self.send_chunked()
+
+        i = int(version) - 1
+        deadline = time.monotonic() + int(seconds)
+        while time.monotonic() < deadline and not self.broken:
+            for type_, obj in self.events[i:]:
+                i += 1
+                obj["metadata"]["resourceVersion"] = str(i + 1)
+                self.send_chunk({"result": {"type": type_, "object": obj}})
+
+            time.sleep(0.01)
+
+        self.end_chunked()
+
+
+@pytest.fixture  # type: ignore
+def client() -> Iterator[ApiClient]:
+    """Client of a local Argo server fixture."""
+    _Handler.listed, _Handler.events, _Handler.requests = [], [], []
+    _Handler.broken = _Handler.forbidden = False
+
+    with serve(_Handler) as url:
+        try:
+            yield ApiClient(configuration=Configuration(host=url))
+        finally:
+            _Handler.broken = True  # ends the streams
+
+
+class TestInformer(TestCase):
+    """Test the local cache of workflows."""
+
+    def test_informer(self, client: ApiClient) -> None:
+        """Test `WorkflowInformer` queries."""
+        _Handler.listed = [
+            _manifest("a", "Running", team="data"),
+            _manifest("b", "Succeeded", team="data"),
+            _manifest("c", "Running", team="ml"),
+        ]
+
+        with WorkflowInformer(client, "test") as informer:
+            assert len(informer) == 3
+            assert informer.get("a").status.phase == "Running"
+            assert informer.get(V1ObjectMeta(name="b")).status.phase == "Succeeded"
+            assert informer.get("missing") is None
+
+            names = [wf.metadata.name for wf in informer.list(phase="Running")]
+            assert names == ["a", "c"]
+            names = [
+                wf.metadata.name
+                for wf in informer.list(labels={"team": "data"}, phase="Running")
+            ]
+            assert names == ["a"]
+            assert len(informer.list()) == 3
+
+            # a created workflow not delivered by the stream yet
+            created = V1alpha1Workflow(metadata=V1ObjectMeta(name="e"), spec={})
+            assert informer.get(created) is created
+
+        # answered locally
+        assert _Handler.requests.count("get") == 0
+        assert _Handler.requests.count("list") == 1
+
+    def test_informer_events(self, client: ApiClient) -> None:
+        """Test `WorkflowInformer` updates by the watch stream."""
+        _Handler.listed = [
+            _manifest("a", "Running", team="data"),
+            _manifest("c", "Running", team="ml"),
+        ]
+
+        with WorkflowInformer(client, "test") as informer:
+            _Handler.events += [
+                ("MODIFIED", _manifest("a", "Failed", team="data")),
+                ("ADDED", _manifest("d", "Pending", team="ml")),
+                ("DELETED", _manifest("c", "Running", team="ml")),
+            ]
+            assert _eventually(lambda: informer.get("c") is None)
+
+            assert informer.get("a").status.phase == "Failed"
+            names = [wf.metadata.name for wf in informer.list(labels={"team": "ml"})]
+            assert names == ["d"]
+            assert informer.list(phase="Running") == []
+
+        assert _Handler.requests.count("list") == 1
+
+    def test_informer_stale(self, client: ApiClient) -> None:
+        """Test `WorkflowInformer` falling back to requests when stale."""
+        _Handler.listed = [_manifest("a", "Running")]
+        _Handler.broken = True
+
+        informer = WorkflowInformer(
+            client, "test", max_staleness=0.2, retry=RetryPolicy(backoff=0.01)
+        )
+        with informer:
+            assert informer.get("a").status.phase == "Running"
+            assert _Handler.requests.count("get") == 0
+
+            assert _eventually(lambda: informer.stale)
+
+            _Handler.listed = [_manifest("a", "Succeeded")]
+            assert informer.get("a").status.phase == "Succeeded"
+            assert [wf.status.phase for wf in informer.list()] == ["Succeeded"]
+            assert _Handler.requests.count("get") == 1
+
+            # recovered, the stand-in streams no events of the change
+            _Handler.broken = False
+            assert _eventually(lambda: not informer.stale)
+            assert informer.get("a").status.phase == "Running"
+
+    def test_informer_forbidden(self, client: ApiClient) -> None:
+        """Test `WorkflowInformer` stopped by a non-retryable failure."""
+        _Handler.listed = [_manifest("a", "Running")]
+        _Handler.forbidden = True
+
+        informer = WorkflowInformer(
+            client, "test", max_staleness=1.0, retry=RetryPolicy(backoff=0.01)
+        )
+        with pytest.raises(ApiException) as exc:
+            informer.start(timeout=5.0)
+
+        assert exc.value.status == 403
+        assert _Handler.requests == ["forbidden"]  # not retried
+
+        # started again once permitted
+        _Handler.forbidden = False
+        with informer:
+            assert informer.get("a").status.phase == "Running"
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from argo.workflows.dsl import LoadResult
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl import WorkflowTemplate
+
+from ._base import TestCase
+
+"""Bulk loader test suite."""
+
+
+class TestLoader(TestCase):
+    """Test load_many."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+    def test_load_many(self, tmpdir) -> None:
+        """Test `Workflow.load_many` method."""
+        manifests = Path(str(tmpdir)) / "manifests"
+        (manifests / "nested").mkdir(parents=True)
+
+        for i in range(5):
+            path = manifests / "nested" / f"hello-world-{i}.yaml"
+            path.write_text(self._WORKFLOW_FILE.read_text())
+
+        broken = manifests / "broken.yaml"
+        broken.write_text("metadata: [\n")
+
+        results = list(Workflow.load_many(manifests, workers=2, chunksize=2))
+
+        assert len(results) == 6
+        assert all(isinstance(r, LoadResult) for r in results)
+
+        loaded = sorted((r for r in results if r.ok), key=lambda r: r.path)
+        assert [r.path.name for r in loaded] == [
+            f"hello-world-{i}.yaml" for i in range(5)
+        ]
+        assert all(isinstance(r.obj, Workflow) for r in loaded)
+        assert loaded[0].obj == Workflow.from_file(self._WORKFLOW_FILE)
+
+        # failures do not abort the batch
+        [failed] = [r for r in results if not r.ok]
+        assert failed.path == broken
+        assert failed.obj is None
+        assert "ParserError" in failed.error
+
+        # glob patterns
+        pattern = str(manifests / "**" / "hello-world-*.yaml")
+        assert len(list(WorkflowTemplate.load_many(pattern, workers=1))) == 5
+
+        assert list(Workflow.load_many([], workers=1)) == []
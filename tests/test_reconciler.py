@@ -0,0 +1,267 @@
+import pytest
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from urllib.parse import urlparse
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+
+from argo.workflows.dsl import reconcile
+from argo.workflows.dsl import ClusterWorkflowTemplate
+from argo.workflows.dsl import WorkflowTemplate
+from argo.workflows.dsl import _reconciler
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Template reconciliation test suite."""
+
+
+class _Handler(Handler):
+    """Argo server stand-in, stores (cluster) workflow templates.
+
+    Updates are rejected with 409 unless they carry the current
+    resource version, as by the Kubernetes API. Templates are modified
+    right before the updates if `modify` is set.
+    """
+
+    stored: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    requests: List[Tuple[str, str]] = []
+    version = 0
+    modify = False
+
+    def _route(self) -> Tuple[str, List[str]]:
+        path: List[str] = urlparse(self.path).path.split("/")[3:]
+        if path[0] == "cluster-workflow-templates":
+            return "ClusterWorkflowTemplate", path[1:]
+
+        return "WorkflowTemplate", path[2:]
+
+    def _store(self, kind: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        type(self).version += 1
+
+        manifest["metadata"]["resourceVersion"] = str(self.version)
+        self.stored[kind, manifest["metadata"]["name"]] = manifest
+
+        return manifest
+
+    def do_GET(self):
+        kind, path = self._route()
+        self.requests.append(("GET", kind))
+
+        if path:
+            found = self.stored.get((kind, path[0]))
+            return self.send(200, found) if found else self.send(404, {})
+
+        items = [wf for (k, _), wf in sorted(self.stored.items()) if k == kind]
+        self.send(200, {"metadata": {}, "items": items})
+
+    def do_POST(self):
+        kind, _ = self._route()
+        self.requests.append(("POST", kind))
+
+        manifest = self.read_json()["template"]
+        if (kind, manifest["metadata"]["name"]) in self.stored:
+            return self.send(409, {"message": "already exists"})
+
+        self.send(200, self._store(kind, manifest))
+
+    def do_PUT(self):
+        kind, [name] = self._route()
+        self.requests.append(("PUT", kind))
+
+        manifest = self.read_json()["template"]
+        if self.modify:
+            self._store(kind, self.stored[kind, name])
+
+        current = self.stored[kind, name]["metadata"]["resourceVersion"]
+        if manifest["metadata"].get("resourceVersion") != current:
+            return self.send(409, {"message": "the object has been modified"})
+
+        self.send(200, self._store(kind, manifest))
+
+    def do_DELETE(self):
+        kind, [name] = self._route()
+        self.requests.append(("DELETE", kind))
+
+        del self.stored[kind, name]
+        self.send(200, {})
+
+
+@pytest.fixture  # type: ignore
+def client() -> Iterator[ApiClient]:
+    """Client of a local Argo server fixture."""
+    _Handler.stored, _Handler.requests, _Handler.version = {}, [], 0
+    _Handler.modify = False
+
+    with serve(_Handler) as url:
+        yield ApiClient(configuration=Configuration(host=url))
+
+
+class TestReconciler(TestCase):
+    """Test reconciliation of templates."""
+
+    _TEMPLATE_FILE = TestCase.DATA / "workflows" / "workflow-template.yaml"
+    _CLUSTER_FILE = TestCase.DATA / "workflows" / "cluster-workflow-template.yaml"
+
+    def templates(self, n: int = 3) -> List[WorkflowTemplate]:
+        templates: List[WorkflowTemplate] = []
+        for i in range(n):
+            template = WorkflowTemplate.from_file(self._TEMPLATE_FILE)
+            template.name = f"template-{i}"
+            templates.append(template)
+
+        templates.append(ClusterWorkflowTemplate.from_file(self._CLUSTER_FILE))
+
+        return templates
+
+    def test_reconcile(self, client: ApiClient) -> None:
+        """Test `reconcile` creating templates."""
+        results = reconcile(client, "test", self.templates())
+
+        assert all(r.ok for r in results)
+        assert [(r.name, r.action) for r in results] == [
+            ("template-0", "create"),
+            ("template-1", "create"),
+            ("template-2", "create"),
+            ("hello-cluster-template", "create"),
+        ]
+        assert results[-1].kind == "ClusterWorkflowTemplate"
+        assert results[0].metadata.resource_version
+        assert len(_Handler.stored) == 4
+
+    def test_reconcile_unchanged(self, client: ApiClient) -> None:
+        """Test `reconcile` of applied templates is a list per kind."""
+        reconcile(client, "test", self.templates())
+
+        _Handler.requests = []
+        results = reconcile(client, "test", self.templates())
+
+        assert {r.action for r in results} == {"unchanged"}
+        assert _Handler.requests == [
+            ("GET", "WorkflowTemplate"),
+            ("GET", "ClusterWorkflowTemplate"),
+        ]
+
+    def test_reconcile_changed(self, client: ApiClient) -> None:
+        """Test `reconcile` updating changed templates."""
+        reconcile(client, "test", self.templates())
+
+        templates = self.templates()
+        templates[1].spec.entrypoint = "changed"
+
+        _Handler.requests = []
+        results = reconcile(client, "test", templates[:3])
+
+        assert [r.action for r in results] == ["unchanged", "update", "unchanged"]
+        assert _Handler.requests == [
+            ("GET", "WorkflowTemplate"),
+            ("PUT", "WorkflowTemplate"),
+        ]
+        stored = _Handler.stored["WorkflowTemplate", "template-1"]
+        assert stored["spec"]["entrypoint"] == "changed"
+
+    def test_reconcile_edited(self, client: ApiClient) -> None:
+        """Test `reconcile` updating templates edited on the server."""
+        reconcile(client, "test", self.templates())
+
+        # zero values are omitted by the server
+        _Handler.stored["WorkflowTemplate", "template-0"]["spec"]["parallelism"] = 0
+
+        # the annotated digest is left intact by the edit
+        _Handler.stored["WorkflowTemplate", "template-1"]["spec"]["entrypoint"] = "x"
+
+        results = reconcile(client, "test", self.templates()[:3])
+
+        assert [r.action for r in results] == ["unchanged", "update", "unchanged"]
+        stored = _Handler.stored["WorkflowTemplate", "template-1"]
+        assert stored["spec"]["entrypoint"] != "x"
+
+    def test_reconcile_conflict(self, client: ApiClient) -> None:
+        """Test `reconcile` of templates modified concurrently."""
+        reconcile(client, "test", self.templates())
+
+        templates = self.templates()
+        templates[1].spec.entrypoint = "changed"
+
+        plan = reconcile(client, "test", templates[:3], dry_run=True)
+        assert [r.action for r in plan] == ["unchanged", "update", "unchanged"]
+        assert _Handler.requests.count(("PUT", "WorkflowTemplate")) == 0
+
+        _Handler.modify = True
+        [_, result, _] = reconcile(client, "test", templates[:3])
+        assert not result.ok
+        assert "409" in result.error
+
+    def test_reconcile_prune(self, client: ApiClient) -> None:
+        """Test `reconcile` deleting templates."""
+        reconcile(client, "test", self.templates(), owner="project")
+
+        # not applied by reconcile
+        _Handler.stored["WorkflowTemplate", "manual"] = {
+            "metadata": {"name": "manual", "resourceVersion": "1"}
+        }
+        # applied by another project
+        _Handler.stored["WorkflowTemplate", "other"] = {
+            "metadata": {
+                "name": "other",
+                "resourceVersion": "1",
+                "annotations": {_reconciler.DIGEST_ANNOTATION: "digest"},
+                "labels": {_reconciler.OWNER_LABEL: "other"},
+            }
+        }
+
+        templates = self.templates(1)
+        assert [r.action for r in reconcile(client, "test", templates)] == [
+            "unchanged",
+            "unchanged",
+        ]
+
+        results = reconcile(client, "test", templates[:1], prune=True, owner="project")
+        assert [(r.action, r.kind, r.name) for r in results] == [
+            ("unchanged", "WorkflowTemplate", "template-0"),
+            ("delete", "WorkflowTemplate", "template-1"),
+            ("delete", "WorkflowTemplate", "template-2"),
+            ("delete", "ClusterWorkflowTemplate", "hello-cluster-template"),
+        ]
+        assert all(r.ok for r in results)
+        assert sorted(_Handler.stored) == [
+            ("WorkflowTemplate", "manual"),
+            ("WorkflowTemplate", "other"),
+            ("WorkflowTemplate", "template-0"),
+        ]
+
+        metadata = _Handler.stored["WorkflowTemplate", "template-0"]["metadata"]
+        assert metadata["annotations"][_reconciler.DIGEST_ANNOTATION] == (
+            templates[0].digest()
+        )
+        assert metadata["labels"][_reconciler.OWNER_LABEL] == "project"
+
+        with pytest.raises(ValueError):
+            reconcile(client, "test", templates[:1] * 2)
+
+        # not limited to the templates of a project
+        with pytest.raises(ValueError):
+            reconcile(client, "test", templates[:1], prune=True)
+
+    def test_reconcile_cluster(self, client: ApiClient) -> None:
+        """Test `reconcile` of cluster-scoped templates only."""
+        templates = self.templates(1)
+        reconcile(client, "test", templates, owner="project")
+
+        _Handler.requests = []
+        results = reconcile(client, None, templates[1:], prune=True, owner="project")
+
+        assert [(r.action, r.kind) for r in results] == [
+            ("unchanged", "ClusterWorkflowTemplate")
+        ]
+        assert _Handler.requests == [("GET", "ClusterWorkflowTemplate")]
+
+        with pytest.raises(ValueError):
+            reconcile(client, None, templates)
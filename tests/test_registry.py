@@ -0,0 +1,248 @@
+import pytest
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Arguments
+from argo.workflows.client.models import V1alpha1Parameter
+from argo.workflows.client.rest import ApiException
+
+from argo.workflows.dsl import submit_many
+from argo.workflows.dsl import submit_sweep
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl import _registry
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Submission by reference test suite."""
+
+
+class _Handler(Handler):
+    """Argo server stand-in, stores workflow templates and workflows.
+
+    Workflows referencing a missing template are rejected with 400,
+    as by the Argo server.
+    """
+
+    templates: Dict[str, Dict[str, Any]] = {}
+    created: List[Dict[str, Any]] = []
+    requests: List[Tuple[str, int]] = []
+
+    # the template which is created once the event is set
+    slow: Optional[str] = None
+    release = threading.Event()
+
+    def do_POST(self):
+        size = int(self.headers["Content-Length"])
+        request: Dict[str, Any] = self.read_json()
+
+        resource = self.path.split("/")[3]
+        self.requests.append((resource, size))
+
+        if resource == "workflow-templates":
+            manifest = request["template"]
+            if manifest["metadata"]["name"] == self.slow:
+                self.release.wait(5)
+
+            if manifest["metadata"]["name"] in self.templates:
+                return self.send(409, {"message": "already exists"})
+
+            self.templates[manifest["metadata"]["name"]] = manifest
+            return self.send(200, manifest)
+
+        manifest = request["workflow"]
+        ref = manifest["spec"].get("workflowTemplateRef")
+        if ref is not None and ref["name"] not in self.templates:
+            return self.send(400, {"message": f"{ref['name']} not found"})
+
+        metadata = manifest["metadata"]
+        metadata["name"] = f"{metadata['generateName']}{len(self.created)}"
+        self.created.append(manifest)
+
+        self.send(200, manifest)
+
+
+@pytest.fixture  # type: ignore
+def client() -> Iterator[ApiClient]:
+    """Client of a local Argo server fixture."""
+    _Handler.templates, _Handler.created, _Handler.requests = {}, [], []
+    _Handler.slow, _Handler.release = None, threading.Event()
+
+    # registrations of a previous server on the same port
+    vars(_registry)["__registered"].clear()
+
+    with serve(_Handler) as url:
+        yield ApiClient(configuration=Configuration(host=url))
+
+
+class TestRegistry(TestCase):
+    """Test submission of Workflows by reference."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+    def workflow(self) -> Workflow:
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        wf.name = None
+        wf.spec.arguments = V1alpha1Arguments(
+            parameters=[
+                V1alpha1Parameter(name="message"),
+                V1alpha1Parameter(name="count", default="1"),
+            ]
+        )
+        return wf
+
+    def test_submit_by_reference(self, client: ApiClient) -> None:
+        """Test `Workflow.submit` by reference."""
+        wf = self.workflow()
+        digest = wf.digest()
+
+        for i in range(3):
+            created = wf.submit(
+                client, "test", parameters={"message": str(i)}, by_reference=True
+            )
+            assert created.metadata.name == f"hello-world-{i}"
+
+        # registered once, named by the digest
+        [name] = _Handler.templates
+        assert name == wf.register(client, "test")
+        assert name.startswith("hello-world-")
+
+        template = _Handler.templates[name]
+        assert template["kind"] == "WorkflowTemplate"
+        assert template["metadata"]["labels"] == {_registry.REGISTERED_LABEL: "true"}
+        assert template["spec"]["templates"][0]["name"] == "whalesay"
+        resources = [resource for resource, _ in _Handler.requests]
+        assert resources == ["workflow-templates", *["workflows"] * 3]
+
+        submitted = _Handler.created[-1]
+        assert submitted["spec"] == {
+            "workflowTemplateRef": {"name": name},
+            "arguments": {
+                "parameters": [
+                    {"name": "message", "value": "2"},
+                    {"name": "count", "default": "1", "value": "1"},
+                ]
+            },
+        }
+
+        # the workflow is not modified
+        assert wf.digest(refresh=True) == digest
+        assert wf.spec.arguments.parameters[0].value is None
+
+    def test_submit_by_reference_size(self, client: ApiClient) -> None:
+        """Test submissions by reference are smaller than by value."""
+        wf = self.workflow()
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+        wf.submit(client, "test", parameters={"message": "0"})
+
+        [(_, by_reference), (_, by_value)] = _Handler.requests[-2:]
+        assert by_reference < by_value
+
+    def test_submit_by_reference_changed(self, client: ApiClient) -> None:
+        """Test a changed Workflow is registered as another template."""
+        wf = self.workflow()
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+
+        wf = self.workflow()
+        wf.spec.entrypoint = "changed"
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+        assert len(_Handler.templates) == 2
+
+        # changed in place, not tracked by the cached digest
+        wf.spec.templates[0].container.args = ["changed"]
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+        assert len(_Handler.templates) == 2
+
+        wf.digest(refresh=True)
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+        assert len(_Handler.templates) == 3
+
+        [*_, submitted] = _Handler.created
+        template = _Handler.templates[submitted["spec"]["workflowTemplateRef"]["name"]]
+        assert template["spec"]["templates"][0]["container"]["args"] == ["changed"]
+
+    def test_register_existing(self, client: ApiClient) -> None:
+        """Test a template registered by another process."""
+        wf = self.workflow()
+        name = wf.register(client, "test")
+
+        ref = _registry.reference(wf)
+        _registry.forget(client.configuration.host, "test", ref)
+
+        assert not _registry.register(client, "test", ref)
+        assert list(_Handler.templates) == [name]
+
+    def test_register_concurrent(self, client: ApiClient) -> None:
+        """Test that a slow registration doesn't block other templates."""
+        wf_a, wf_b = self.workflow(), self.workflow()
+        wf_b.spec.entrypoint = "other"
+
+        _Handler.slow = _registry.reference(wf_a).name
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(wf_a.register, client, "test")
+
+            assert wf_b.register(client, "test") in _Handler.templates
+            assert not future.done()
+
+            _Handler.release.set()
+            assert future.result() == _Handler.slow
+
+    def test_submit_by_reference_deleted(self, client: ApiClient) -> None:
+        """Test a deleted template is registered again by the next submission."""
+        wf = self.workflow()
+        name = wf.register(client, "test")
+
+        del _Handler.templates[name]
+        with pytest.raises(ApiException):
+            wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+
+        wf.submit(client, "test", parameters={"message": "0"}, by_reference=True)
+        assert name in _Handler.templates
+
+    def test_submit_by_reference_missing(self, client: ApiClient) -> None:
+        """Test a submission missing a required parameter."""
+        wf = self.workflow()
+        with pytest.raises(Exception, match="Missing required workflow parameter"):
+            wf.submit(client, "test", by_reference=True)
+
+    def test_submit_many_by_reference(self, client: ApiClient) -> None:
+        """Test `submit_many` and `submit_sweep` by reference."""
+        wfs = [self.workflow() for _ in range(10)]
+        for i, wf in enumerate(wfs):
+            wf.spec.arguments.parameters[0].value = str(i)
+
+        results = submit_many(client, "test", wfs, concurrency=4, by_reference=True)
+
+        assert all(r.ok for r in results)
+        assert len(_Handler.templates) == 1
+        assert len(_Handler.created) == 10
+
+        # the arguments are not part of the template
+        [name] = _Handler.templates
+        values = sorted(
+            int(wf["spec"]["arguments"]["parameters"][0]["value"])
+            for wf in _Handler.created
+        )
+        assert values == list(range(10))
+
+        variants = [{"message": str(i)} for i in range(10)]
+        results = submit_sweep(
+            client, "test", self.workflow(), variants, by_reference=True
+        )
+
+        assert all(r.ok for r in results)
+        assert len(_Handler.created) == 20
+        refs = {wf["spec"]["workflowTemplateRef"]["name"] for wf in _Handler.created}
+        assert refs == {name}
@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+import pytest
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.rest import ApiException
+
+from argo.workflows.dsl import AsyncClient
+from argo.workflows.dsl import RateLimiter
+from argo.workflows.dsl import RetryPolicy
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl import _retry
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import run
+from ._base import serve
+
+"""Rate limiting and retries test suite."""
+
+
+class _Handler(Handler):
+    """Flaky Argo server stand-in.
+
+    Responds to creates by the queued `failures`: (status, created) tuples,
+    `created` tells whether the workflow is created despite the failure.
+    """
+
+    created: List[Dict[str, Any]] = []
+    failures: List[Tuple[int, bool]] = []
+    posts = 0
+
+    def do_GET(self):
+        [selector] = parse_qs(urlparse(self.path).query)["listOptions.labelSelector"]
+        key, value = selector.split("=")
+
+        items = [
+            wf for wf in self.created if wf["metadata"]["labels"].get(key) == value
+        ]
+        self.send(200, {"metadata": {}, "items": items})
+
+    def do_POST(self):
+        request = self.read_json()
+        type(self).posts += 1
+
+        status, created = self.failures.pop(0) if self.failures else (200, True)
+        if created:
+            wf = request["workflow"]
+            wf["metadata"]["name"] = f"hello-world-{len(self.created)}"
+            self.created.append(wf)
+
+        if status == 200:
+            self.send(200, wf)
+        else:
+            self.send(status, {"message": "unavailable"}, {"Retry-After": "0"})
+
+
+@pytest.fixture  # type: ignore
+def config() -> Iterator[Configuration]:
+    """Configuration of a flaky local Argo server fixture."""
+    _Handler.created, _Handler.failures, _Handler.posts = [], [], 0
+
+    with serve(_Handler) as url:
+        yield Configuration(host=url)
+
+
+class TestRetry(TestCase):
+    """Test rate limiting and retries of submissions."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+    def test_rate_limiter(self) -> None:
+        """Test `RateLimiter` class."""
+        limiter = RateLimiter(10, burst=2)
+
+        waits = [limiter.reserve() for _ in range(4)]
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+        limiter = RateLimiter(100, burst=1)
+        start = time.perf_counter()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.perf_counter() - start >= 0.045
+
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+    def test_retry_policy(self) -> None:
+        """Test `RetryPolicy` class."""
+        retry = RetryPolicy(backoff=0.5, max_backoff=1.5, jitter=False)
+        assert [retry.delay(i) for i in (1, 2, 3)] == [0.5, 1.0, 1.5]
+        assert retry.delay(1, retry_after=1.2) == 1.2
+
+        # capped, e.g. Retry-After of an hour
+        assert retry.delay(1, retry_after=3600) == 1.5
+
+        retry = RetryPolicy(backoff=0.5)
+        assert all(0 <= retry.delay(2) <= 1.0 for _ in range(100))
+
+        assert retry.is_retryable(ApiException(503))
+        assert retry.is_retryable(ApiException(429))
+        assert retry.is_retryable(ConnectionResetError())
+        assert not retry.is_retryable(ApiException(400))
+        assert not retry.is_retryable(ValueError())
+
+        exc = ApiException(429)
+        exc.headers = {"Retry-After": "3"}
+        assert _retry.retry_after(exc) == 3.0
+
+        exc.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        assert _retry.retry_after(exc) == 0.0
+
+    def test_submit_lost_response(self, config: Configuration) -> None:
+        """Test `Workflow.submit` finding a workflow created despite a failure."""
+        client = ApiClient(configuration=config)
+        _Handler.failures = [(504, True)]
+
+        created = Workflow.from_file(self._WORKFLOW_FILE).submit(
+            client, "test", retry=RetryPolicy(backoff=0.01), limiter=RateLimiter(100)
+        )
+
+        assert created.metadata.name == "hello-world-0"
+        assert _retry.IDEMPOTENCY_LABEL in created.metadata.labels
+        assert _Handler.posts == 1
+        assert len(_Handler.created) == 1
+
+    def test_submit_throttled(self, config: Configuration) -> None:
+        """Test `Workflow.submit` retrying throttled requests."""
+        client = ApiClient(configuration=config)
+        _Handler.failures = [(429, False), (503, False)]
+
+        created = Workflow.from_file(self._WORKFLOW_FILE).submit(
+            client, "test", retry=RetryPolicy(backoff=0.01)
+        )
+
+        assert created.metadata.name == "hello-world-0"
+        assert _Handler.posts == 3
+        assert len(_Handler.created) == 1
+
+    def test_submit_not_retried(self, config: Configuration) -> None:
+        """Test `Workflow.submit` without a retry policy."""
+        client = ApiClient(configuration=config)
+        _Handler.failures = [(503, False)]
+
+        with pytest.raises(ApiException):
+            Workflow.from_file(self._WORKFLOW_FILE).submit(client, "test")
+
+        assert _Handler.posts == 1
+
+    def test_submit_gives_up(self, config: Configuration) -> None:
+        """Test `Workflow.submit` giving up after the attempts."""
+        client = ApiClient(configuration=config)
+        _Handler.failures = [(503, False)] * 3
+
+        with pytest.raises(ApiException):
+            Workflow.from_file(self._WORKFLOW_FILE).submit(
+                client, "test", retry=RetryPolicy(3, backoff=0.01)
+            )
+
+        assert _Handler.posts == 3
+
+    def test_asubmit(self, config: Configuration) -> None:
+        """Test `Workflow.asubmit` with retries."""
+        pytest.importorskip("aiohttp")
+
+        _Handler.failures = [(504, True), (429, False)]
+
+        async def main():
+            async with AsyncClient(config) as client:
+                return await asyncio.gather(
+                    *(
+                        Workflow.from_file(self._WORKFLOW_FILE).asubmit(
+                            client, "test", retry=RetryPolicy(backoff=0.01)
+                        )
+                        for _ in range(2)
+                    )
+                )
+
+        created = run(main())
+
+        assert sorted(wf.metadata.name for wf in created) == [
+            "hello-world-0",
+            "hello-world-1",
+        ]
+        assert len(_Handler.created) == 2
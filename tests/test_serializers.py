@@ -0,0 +1,162 @@
+import datetime
+import io
+import json
+
+import pytest
+import yaml
+
+from argo.workflows.client.models import V1Container
+
+from argo.workflows.dsl import _utils
+from argo.workflows.dsl import dump_all
+from argo.workflows.dsl import get_serializer
+from argo.workflows.dsl import set_default_serializer
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl import YAMLSerializer
+from argo.workflows.dsl.templates import template
+
+from ._base import TestCase
+
+"""Serializers test suite."""
+
+
+class TestSerializers(TestCase):
+    """Test serializers."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+    def test_yaml(self) -> None:
+        """Test the YAML serializer against the generic PyYAML representer."""
+        obj = {
+            "script": {"source": "import os  \nprint(os.sep)\n", "image": "python"},
+            "values": [1, 1.5, True, None, "yes", "123", [], {}, [["nested"]]],
+        }
+
+        serialized = get_serializer("yaml").dumps(obj)
+
+        assert "source: |-\n    import os\n    print(os.sep)\n" in serialized
+        assert serialized == YAMLSerializer(_utils.BlockDumper).dumps(obj)
+
+        for opts in ({"default_flow_style": None}, {"explicit_start": True}):
+            assert get_serializer("yaml").dumps(obj, **opts) == yaml.dump(
+                obj, Dumper=_utils.BlockDumper, **opts
+            )
+
+    def test_select(self, tmpdir) -> None:
+        """Test selection of the serializer per call and globally."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+
+        assert json.loads(wf.dumps("json")) == wf.to_dict()
+
+        # YAML only
+        with pytest.raises(ValueError):
+            wf.to_yaml(serializer="json")
+
+        set_default_serializer("json")
+        try:
+            path = tmpdir.join("hello-world.json")
+            wf.to_file(str(path))
+
+            assert json.loads(path.read()) == _utils.sanitize_for_serialization(wf)
+            assert json.loads(wf.dumps()) == wf.to_dict()
+            assert yaml.safe_load(wf.to_yaml()) == wf.to_dict()
+        finally:
+            set_default_serializer("yaml")
+
+        assert yaml.safe_load(wf.to_yaml()) == wf.to_dict()
+
+        with pytest.raises(ValueError):
+            get_serializer("toml")
+
+    def test_to_file_atomic(self, tmpdir) -> None:
+        """Test that a failed `to_file` leaves the file intact."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+
+        path = tmpdir.join("hello-world.json")
+        path.write("previous")
+
+        with pytest.raises(TypeError):
+            wf.to_file(str(path), fmt="json", unknown_option=True)
+
+        assert path.read() == "previous"
+        assert tmpdir.listdir() == [path]
+
+        wf.to_file(str(path), fmt="json")
+        assert json.loads(path.read()) == _utils.sanitize_for_serialization(wf)
+        assert tmpdir.listdir() == [path]
+
+        with pytest.raises(ValueError):
+            dump_all([wf], str(path), "json", indent=2)
+        assert json.loads(path.read()) == _utils.sanitize_for_serialization(wf)
+
+    def test_to_file_output(self, tmpdir) -> None:
+        """Test that `to_file` writes the same files as before the serializers."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        manifest = _utils.sanitize_for_serialization(wf)
+
+        for fmt, expected in (
+            (None, yaml.dump(manifest, Dumper=_utils.BlockDumper) + "\n"),
+            ("yml", yaml.dump(manifest, Dumper=_utils.BlockDumper) + "\n"),
+            ("json", json.dumps(manifest)),
+        ):
+            path = tmpdir.join(f"hello-world.{fmt}")
+            wf.to_file(str(path), fmt=fmt)
+
+            assert path.read() == expected
+
+    def test_dump(self) -> None:
+        """Test that models are dumped as if sanitized first."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        wf.metadata.creation_timestamp = datetime.datetime(
+            2020, 1, 1, tzinfo=datetime.timezone.utc
+        )
+
+        for serializer, opts in (
+            (get_serializer("yaml"), {}),
+            (get_serializer("yaml"), {"sort_keys": False}),
+            (get_serializer("yaml"), {"default_flow_style": None}),
+            (get_serializer("json"), {}),
+            (YAMLSerializer(_utils.BlockDumper), {}),
+        ):
+            stream = io.StringIO()
+            serializer.dump(wf, stream, **opts)
+
+            expected = serializer.dumps(_utils.sanitize_for_serialization(wf), **opts)
+            assert stream.getvalue() == expected
+
+        assert "creationTimestamp: '2020-01-01T00:00:00+00:00'" in expected
+
+    def test_dump_all(self, tmpdir) -> None:
+        """Test writing of multi-document streams."""
+        class TestWorkflowDumpAll(Workflow, lazy=True):
+            name = "test"
+
+            @template
+            def echo(self) -> V1Container:
+                return V1Container(image="alpine:3.7", name="echo")
+
+        def workflows():
+            yield TestWorkflowDumpAll(compile=False)
+            yield Workflow.from_file(self._WORKFLOW_FILE)
+
+        path = tmpdir.join("manifests.yaml")
+        assert dump_all(workflows(), str(path)) == 2
+
+        documents = list(yaml.safe_load_all(path.read()))
+        assert path.read().startswith("---\n")
+        assert [d["metadata"]["generateName"] for d in documents] == [
+            "test-workflow-dump-all-",
+            "hello-world-",
+        ]
+        assert documents[0]["spec"]["templates"][0]["container"]["image"] == "alpine:3.7"
+
+        stream = io.StringIO()
+        assert dump_all(workflows(), stream, "json") == 2
+
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == documents
+
+        with pytest.raises(ValueError):
+            dump_all(workflows(), io.StringIO(), "json", indent=2)
+
+        assert dump_all([], io.StringIO()) == 0
@@ -0,0 +1,106 @@
+import json
+
+from typing import Any
+from typing import Dict
+
+from argo.workflows.client.models import V1alpha1NodeStatus
+
+from argo.workflows.dsl import NodeStatusView
+from argo.workflows.dsl import Workflow
+from argo.workflows.dsl import _utils
+
+from ._base import TestCase
+
+"""Node status view test suite."""
+
+
+def _node(
+    node_id: str, phase: str, template: str, boundary: str = "wf", *children: str
+) -> Dict[str, Any]:
+    node: Dict[str, Any] = {
+        "id": node_id,
+        "name": f"wf.{node_id}",
+        "displayName": node_id,
+        "type": "Pod" if not children else "DAG",
+        "phase": phase,
+        "templateName": template,
+        "boundaryID": boundary,
+        "startedAt": "2020-01-01T00:00:00Z",
+        "finishedAt": "2020-01-01T00:01:30Z",
+    }
+    if children:
+        node["children"] = list(children)
+
+    return node
+
+
+class TestStatus(TestCase):
+    """Test `NodeStatusView`."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+
+    @classmethod
+    def manifest(cls) -> Dict[str, Any]:
+        manifest: Dict[str, Any] = _utils.safe_load(cls._WORKFLOW_FILE.read_text())
+        nodes = [
+            _node("wf", "Failed", "main", "", "a", "b"),
+            _node("a", "Succeeded", "whalesay"),
+            _node("b", "Failed", "fan-out", "wf", "c", "d", "e"),
+            _node("c", "Failed", "whalesay", "b"),
+            _node("d", "Succeeded", "whalesay", "b"),
+            _node("e", "Failed", "cowsay", "b"),
+        ]
+        del nodes[-1]["finishedAt"]
+
+        manifest["status"] = {
+            "phase": "Failed",
+            "nodes": {node["id"]: node for node in nodes},
+        }
+        return manifest
+
+    def test_node_status_view(self) -> None:
+        """Test `NodeStatusView` queries."""
+        nodes = NodeStatusView.of(self.manifest())
+
+        assert len(nodes) == 6
+        assert "c" in nodes and "x" not in nodes
+        assert nodes.phases() == {"Failed": 4, "Succeeded": 2}
+
+        assert nodes.ids(phase="Failed", leaf=True) == ["c", "e"]
+        assert nodes.ids(phase="Failed", leaf=False) == ["wf", "b"]
+        assert nodes.ids(template="whalesay", boundary="b") == ["c", "d"]
+        assert nodes.ids(template="whalesay", phase="Failed") == ["c"]
+        assert nodes.ids(phase="Pending") == []
+        assert nodes.ids(leaf=True) == ["a", "c", "d", "e"]
+        assert nodes.ids() == list(nodes)
+
+        [node] = nodes.select(template="cowsay")
+        assert isinstance(node, V1alpha1NodeStatus)
+        assert node.display_name == "e"
+        assert nodes["e"] is node
+
+        assert nodes.parent("c") == "b"
+        assert nodes.parent("wf") is None
+        assert nodes.children("b") == ["c", "d", "e"]
+
+        assert nodes.duration("c") == 90.0
+        assert nodes.duration("e") is None
+
+    def test_node_status_view_of(self) -> None:
+        """Test `NodeStatusView` of workflows."""
+        manifest = self.manifest()
+        expected = ["c", "e"]
+
+        # deserialized lazily, the nodes are not
+        wf = Workflow.from_dict(manifest, lazy=True)
+        assert _utils.lazy_data(wf.status) is not None
+        assert NodeStatusView.of(wf).ids(phase="Failed", leaf=True) == expected
+        assert _utils.lazy_data(wf.status) is not None
+
+        wf = Workflow.from_dict(manifest)
+        assert NodeStatusView.of(wf).ids(phase="Failed", leaf=True) == expected
+
+        nodes = NodeStatusView.from_json(json.dumps(manifest))
+        assert nodes.ids(phase="Failed", leaf=True) == expected
+
+        assert len(NodeStatusView.of(Workflow.from_file(self._WORKFLOW_FILE))) == 0
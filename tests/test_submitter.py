@@ -0,0 +1,220 @@
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Arguments
+from argo.workflows.client.models import V1alpha1CronWorkflow
+from argo.workflows.client.models import V1alpha1Parameter
+from argo.workflows.client.models import V1alpha1Workflow
+from argo.workflows.client.models import V1ObjectMeta
+
+from argo.workflows.dsl import submit_many
+from argo.workflows.dsl import submit_sweep
+from argo.workflows.dsl import CronWorkflow
+from argo.workflows.dsl import SubmitResult
+from argo.workflows.dsl import SubmitResults
+from argo.workflows.dsl import Workflow
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Batch submission test suite."""
+
+
+class _Handler(Handler):
+    """Argo server stand-in, creates (cron) workflows it is sent."""
+
+    created: List[Dict[str, Any]] = []
+    authorization: List[Optional[str]] = []
+
+    def do_POST(self):
+        self.authorization.append(self.headers.get("Authorization"))
+
+        request: Dict[str, Any] = self.read_json()
+        manifest = request.get("workflow") or request["cronWorkflow"]
+
+        metadata = manifest["metadata"]
+        if metadata.get("labels", {}).get("fail"):
+            return self.send(409, {"message": "conflict"})
+
+        metadata["name"] = metadata.get("name") or (
+            f"{metadata['generateName']}{len(self.created)}"
+        )
+        metadata["namespace"] = self.path.rsplit("/", 1)[-1]
+        self.created.append(manifest)
+
+        self.send(200, manifest, {"Content-Type": "application/json"})
+
+
+@pytest.fixture  # type: ignore
+def client() -> Iterator[ApiClient]:
+    """Client of a local Argo server fixture."""
+    _Handler.created = []
+    _Handler.authorization = []
+
+    with serve(_Handler) as url:
+        yield ApiClient(configuration=Configuration(host=url))
+
+
+class TestSubmitter(TestCase):
+    """Test submit_many and submit_sweep."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+    _CRONWORKFLOW_FILE = TestCase.DATA / "workflows" / "cron-workflow.yaml"
+
+    def workflow(self) -> Workflow:
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        wf.spec.arguments = V1alpha1Arguments(
+            parameters=[
+                V1alpha1Parameter(name="message"),
+                V1alpha1Parameter(name="count", default="1"),
+            ]
+        )
+        return wf
+
+    def test_submit_many(self, client: ApiClient) -> None:
+        """Test `submit_many` against a local server."""
+        wfs: List[Any] = [Workflow.from_file(self._WORKFLOW_FILE) for _ in range(20)]
+        wfs[7] = CronWorkflow.from_file(self._CRONWORKFLOW_FILE)
+
+        results = submit_many(client, "test", iter(wfs), concurrency=4)
+
+        assert isinstance(results, SubmitResults)
+        assert len(results) == 20
+        assert all(isinstance(r, SubmitResult) for r in results)
+        assert all(r.ok for r in results)
+        assert [r.obj for r in results] == wfs
+
+        assert isinstance(results[7].created, V1alpha1CronWorkflow)
+        assert all(
+            isinstance(r.created, V1alpha1Workflow)
+            for i, r in enumerate(results)
+            if i != 7
+        )
+        assert {r.created.metadata.namespace for r in results} == {"test"}
+        assert len(_Handler.created) == 20
+
+        # the totals of the batch
+        assert results.ok
+        assert (results.succeeded, results.failed) == (20, 0)
+        assert results.duration > 0
+        assert results.rate == 20 / results.duration
+
+    def test_submit_many_failures(self, client: ApiClient) -> None:
+        """Test that failures do not abort `submit_many`."""
+        wfs: List[Any] = [Workflow.from_file(self._WORKFLOW_FILE) for _ in range(5)]
+        wfs[3].metadata.labels = {"fail": "true"}
+
+        results = submit_many(client, "test", wfs, concurrency=4)
+
+        assert [i for i, r in enumerate(results) if not r.ok] == [3]
+        assert not results.ok
+        assert (results.succeeded, results.failed) == (4, 1)
+        assert results[3].created is None
+        assert "409" in results[3].error
+        assert len(_Handler.created) == 4
+
+        [failed] = submit_many(client, "test", [object()])
+        assert "TypeError" in failed.error
+
+    def test_submit_sweep(self, client: ApiClient) -> None:
+        """Test `submit_sweep` against a local server."""
+        wf = self.workflow()
+        digest = wf.digest()
+
+        variants = [{"message": str(i)} for i in range(10)]
+        results = submit_sweep(client, "test", wf, iter(variants), concurrency=4)
+
+        assert [r.obj for r in results] == variants
+        assert all(r.ok for r in results)
+
+        created = [r.created for r in results]
+        assert all(isinstance(m, V1ObjectMeta) for m in created)
+        assert {m.namespace for m in created} == {"test"}
+        assert len(_Handler.created) == 10
+
+        parameters = sorted(
+            (wf["spec"]["arguments"]["parameters"] for wf in _Handler.created),
+            key=lambda p: int(p[0]["value"]),
+        )
+        assert parameters[3] == [
+            {"name": "message", "value": "3"},
+            {"name": "count", "default": "1", "value": "1"},
+        ]
+
+        # the workflow is not modified
+        assert wf.digest(refresh=True) == digest
+        assert wf.spec.arguments.parameters[0].value is None
+
+    def test_submit_sweep_failures(self, client: ApiClient) -> None:
+        """Test that failures do not abort `submit_sweep`."""
+        variants = [{"message": "0"}, {"count": "2"}, {"message": "2"}]
+
+        results = submit_sweep(client, "test", self.workflow(), variants)
+
+        assert [i for i, r in enumerate(results) if not r.ok] == [1]
+        assert "Missing required workflow parameter message" in results[1].error
+        assert len(_Handler.created) == 2
+
+        [failed] = submit_sweep(
+            client, "test", Workflow.from_file(self._WORKFLOW_FILE), [{"a": "b"}]
+        )
+        assert "AttributeError" in failed.error
+
+    def test_submit_sweep_request(self, client: ApiClient) -> None:
+        """Test that `submit_sweep` sends the same request as `submit`."""
+        wf = self.workflow()
+
+        [result] = submit_sweep(client, "test", wf, [{"message": "3"}])
+        assert result.ok
+
+        wf.submit(client, "test", parameters={"message": "3"})
+
+        swept, submitted = _Handler.created
+        assert swept["spec"] == submitted["spec"]
+
+    def test_submit_sweep_auth(self, client: ApiClient) -> None:
+        """Test that `submit_sweep` sends the requests as the client does."""
+        client.configuration.api_key["authorization"] = "token"
+        client.configuration.api_key_prefix["authorization"] = "Bearer"
+
+        results = submit_sweep(client, "test", self.workflow(), [{"message": "1"}])
+        assert results.ok
+
+        assert _Handler.authorization == ["Bearer token"]
+
+        # path parameters are quoted
+        results = submit_sweep(client, "a/b", self.workflow(), [{"message": "1"}])
+        assert [r.created.namespace for r in results] == ["a%2Fb"]
+
+    def test_submit_parameters(self, client: ApiClient) -> None:
+        """Test concurrent `submit` of parameters of instances of a class."""
+        wfs: List[Workflow] = [self.workflow() for _ in range(20)]
+        digest = wfs[0].digest()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(wf.submit, client, "test", parameters={"message": m})
+                for m, wf in zip(map(str, range(20)), wfs)
+            ]
+        assert all(future.result() for future in futures)
+
+        values = sorted(
+            int(wf["spec"]["arguments"]["parameters"][0]["value"])
+            for wf in _Handler.created
+        )
+        assert values == list(range(20))
+
+        # the Workflows are not modified
+        for wf in wfs:
+            assert wf.digest(refresh=True) == digest
+            assert wf.spec.arguments.parameters[0].value is None
@@ -0,0 +1,102 @@
+import copy
+import json
+import yaml
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1alpha1Workflow
+
+from argo.workflows.dsl import _utils
+
+from ._base import TestCase
+
+"""Utilities test suite."""
+
+
+class TestUtils(TestCase):
+    """Test _utils."""
+
+    def test_omitempty(self) -> None:
+        """Test `omitempty` function."""
+        shared = {"name": "shared", "value": None}
+        obj = {
+            "a": None,
+            "b": {"c": None, "d": [{"e": None, "f": 1}, [{"g": None}], None]},
+            "h": [shared, shared],
+            "i": shared,
+        }
+        original = copy.deepcopy(obj)
+
+        result = _utils.omitempty(obj)
+
+        assert result == {
+            "b": {"d": [{"f": 1}, [{}], None]},
+            "h": [{"name": "shared"}, {"name": "shared"}],
+            "i": {"name": "shared"},
+        }
+        # the object is not modified
+        assert obj == original
+        # shared sub-objects are copied once
+        assert result["h"][0] is result["h"][1] is result["i"]
+        assert result["i"] is not shared
+
+        # no recursion limit
+        deep = leaf = {}
+        for _ in range(10000):
+            leaf["child"] = leaf = {"empty": None}
+
+        depth, node = 0, _utils.omitempty(deep)
+        while "child" in node:
+            depth, node = depth + 1, node["child"]
+
+        assert depth == 10000
+        assert node == {}
+
+    def test_deserialize(self) -> None:
+        """Test `deserialize` function."""
+        manifest = json.dumps(
+            yaml.safe_load((self.DATA / "workflows" / "hello-world.yaml").read_text())
+        )
+        response = type("Response", (), {"data": manifest})
+
+        expected = ApiClient().deserialize(response, V1alpha1Workflow)
+        wf = _utils.deserialize(manifest, V1alpha1Workflow)
+
+        assert isinstance(wf, V1alpha1Workflow)
+        assert wf == expected
+        assert wf.spec.templates[0].container.image == "docker/whalesay:latest"
+        # models share the configuration of the serializer
+        assert wf.spec.local_vars_configuration is wf.metadata.local_vars_configuration
+
+        expected_manifest = ApiClient().sanitize_for_serialization(expected)
+        assert _utils.sanitize_for_serialization(wf) == expected_manifest
+
+        # the default configuration is honored
+        config = Configuration()
+        config.client_side_validation = False
+        Configuration.set_default(config)
+        try:
+            serializer = _utils._ModelSerializer()
+            assert not serializer.configuration.client_side_validation
+        finally:
+            Configuration.set_default(None)
+
+    def test_to_model(self) -> None:
+        """Test `to_model` function."""
+        manifest = _utils.safe_load(
+            (self.DATA / "workflows" / "hello-world.yaml").read_text()
+        )
+        manifest["status"] = {"startedAt": "2020-01-01T00:00:00Z", "nodes": {}}
+        original = copy.deepcopy(manifest)
+
+        response = type("Response", (), {"data": json.dumps(manifest)})
+        expected = ApiClient().deserialize(response, V1alpha1Workflow)
+
+        wf = _utils.to_model(manifest, V1alpha1Workflow)
+
+        assert wf == expected
+        assert wf.status.started_at.year == 2020
+        # the manifest is not modified
+        assert manifest == original
+
+        assert _utils.to_model(None, V1alpha1Workflow) is None
@@ -0,0 +1,211 @@
+import pytest
+
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from argo.workflows.client import ApiClient
+from argo.workflows.client import Configuration
+from argo.workflows.client.models import V1ObjectMeta
+from argo.workflows.client.rest import ApiException
+
+from argo.workflows.dsl import wait_all
+from argo.workflows.dsl import RetryPolicy
+from argo.workflows.dsl import Workflow
+
+from ._base import Handler
+from ._base import TestCase
+from ._base import serve
+
+"""Waiting for workflows test suite."""
+
+
+def _event(type_: str, name: str, phase: str) -> Tuple[str, Dict[str, Any]]:
+    return (
+        type_,
+        {"metadata": {"name": name}, "spec": {}, "status": {"phase": phase}},
+    )
+
+
+class _Handler(Handler):
+    """Argo server stand-in, streams the queued `events` of workflows.
+
+    Workflows `listed` are returned by the list, at resource version 1,
+    the events follow at resource versions 2, 3, ... A stream is broken
+    after `drop_after` events, resource versions below `expired` are gone.
+    """
+
+    listed: List[Dict[str, Any]] = []
+    events: List[Tuple[str, Dict[str, Any]]] = []
+    drop_after: Optional[int] = None
+    expired = 0
+
+    lists = 0
+    watches: List[Dict[str, List[str]]] = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query: Dict[str, List[str]] = parse_qs(url.query)
+
+        if url.path.startswith("/api/v1/workflows/"):
+            type(self).lists += 1
+            self.send(200, {"metadata": {"resourceVersion": "1"}, "items": self.listed})
+            return
+
+        self.watches.append(query)
+
+        [version] = query["listOptions.resourceVersion"]
+        self.send_chunked()
+
+        if int(version) < self.expired:
+            self.send_chunk({"error": {"httpCode": 410, "message": "too old"}})
+            self.end_chunked()
+            return
+
+        for i, (type_, obj) in enumerate(self.events[int(version) - 1 :]):
+            if self.drop_after is not None and i >= self.drop_after:
+                self.close_connection = True  # broken stream
+                return
+
+            obj["metadata"]["resourceVersion"] = str(int(version) + i + 1)
+            self.send_chunk({"result": {"type": type_, "object": obj}})
+
+        # no more events until the timeout of the stream
+        self.end_chunked()
+
+
+@pytest.fixture  # type: ignore
+def client() -> Iterator[ApiClient]:
+    """Client of a local Argo server fixture."""
+    _Handler.listed, _Handler.events, _Handler.watches = [], [], []
+    _Handler.drop_after, _Handler.expired, _Handler.lists = None, 0, 0
+
+    with serve(_Handler) as url:
+        yield ApiClient(configuration=Configuration(host=url))
+
+
+class TestWatch(TestCase):
+    """Test waiting for workflows by the watch stream."""
+
+    _WORKFLOW_FILE = TestCase.DATA / "workflows" / "hello-world.yaml"
+    _RETRY = RetryPolicy(3, backoff=0.01)
+
+    def test_wait(self, client: ApiClient) -> None:
+        """Test `Workflow.wait` method."""
+        _Handler.listed = [_event("", "hello-world", "Running")[1]]
+        _Handler.events = [
+            _event("MODIFIED", "hello-world", "Running"),
+            _event("MODIFIED", "hello-world", "Succeeded"),
+        ]
+
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        finished = wf.wait(client, "test", timeout=5)
+
+        assert finished.metadata.name == "hello-world"
+        assert finished.status.phase == "Succeeded"
+
+        [watch] = _Handler.watches
+        assert watch["listOptions.fieldSelector"] == ["metadata.name=hello-world"]
+        assert watch["listOptions.resourceVersion"] == ["1"]
+
+    def test_wait_finished(self, client: ApiClient) -> None:
+        """Test `Workflow.wait` for a workflow which has finished already."""
+        _Handler.listed = [_event("", "hello-world", "Failed")[1]]
+
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        finished = wf.wait(client, "test", name="hello-world")
+
+        assert finished.status.phase == "Failed"
+        assert _Handler.watches == []
+
+    def test_wait_unnamed(self, client: ApiClient) -> None:
+        """Test `Workflow.wait` for a Workflow whose name is generated."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE)
+        wf.name = ""
+
+        with pytest.raises(ValueError):
+            wf.wait(client, "test", timeout=5)
+
+        with pytest.raises(ValueError):
+            wait_all(client, "test", ["a", ""], timeout=5)
+
+        assert _Handler.lists == 0
+
+    def test_wait_all(self, client: ApiClient) -> None:
+        """Test `wait_all` function."""
+        _Handler.listed = [
+            _event("", "a", "Succeeded")[1],
+            _event("", "b", "Running")[1],
+            _event("", "c", "Pending")[1],
+        ]
+        _Handler.events = [
+            _event("MODIFIED", "b", "Running"),
+            _event("MODIFIED", "other", "Succeeded"),
+            _event("MODIFIED", "c", "Error"),
+            _event("MODIFIED", "b", "Failed"),
+        ]
+        _Handler.drop_after = 1
+
+        finished = wait_all(
+            client,
+            "test",
+            ["c", V1ObjectMeta(name="b"), "a"],
+            timeout=5,
+            retry=self._RETRY,
+        )
+
+        assert list(finished) == ["c", "b", "a"]
+        assert [wf.status.phase for wf in finished.values()] == [
+            "Error",
+            "Failed",
+            "Succeeded",
+        ]
+
+        # resumed from the last event of the broken streams
+        assert [w["listOptions.resourceVersion"] for w in _Handler.watches] == [
+            ["1"],
+            ["2"],
+            ["3"],
+            ["4"],
+        ]
+        assert _Handler.lists == 1
+
+    def test_wait_all_expired(self, client: ApiClient) -> None:
+        """Test `wait_all` relisting expired resource versions."""
+        _Handler.listed = [_event("", "a", "Running")[1]]
+        _Handler.expired = 2
+
+        with pytest.raises(TimeoutError):
+            wait_all(client, "test", ["a"], timeout=0.5)
+
+        assert _Handler.lists > 1
+
+        _Handler.listed = [_event("", "a", "Succeeded")[1]]
+        assert wait_all(client, "test", ["a"], timeout=5)["a"].status.phase
+
+    def test_wait_all_deleted(self, client: ApiClient) -> None:
+        """Test `wait_all` with a workflow deleted while running."""
+        _Handler.listed = [_event("", "a", "Running")[1]]
+        _Handler.events = [_event("DELETED", "a", "Running")]
+
+        with pytest.raises(ApiException) as exc:
+            wait_all(client, "test", ["a"], timeout=5)
+
+        assert exc.value.status == 404
+
+    def test_wait_all_missing(self, client: ApiClient) -> None:
+        """Test `wait_all` with a workflow which doesn't exist."""
+        _Handler.listed = [_event("", "a", "Running")[1]]
+
+        with pytest.raises(ApiException) as exc:
+            wait_all(client, "test", ["a", "missing"])
+
+        assert exc.value.status == 404
+        assert "missing" in exc.value.reason
+        assert _Handler.watches == []
@@ -1,6 +1,7 @@
 import flexmock
 import pytest
 import requests
+import yaml
 
 from argo.workflows.client import ApiClient, WorkflowServiceApi
 from argo.workflows.client.models import (
@@ -8,6 +9,7 @@ from argo.workflows.client.models import (
     V1alpha1Parameter,
     V1alpha1Template,
     V1alpha1Workflow,
+    V1alpha1WorkflowSpec,
     V1Container
 )
 
@@ -17,7 +19,7 @@ from argo.workflows.dsl.tasks import (
     parameter,
     task
 )
-from argo.workflows.dsl.templates import inputs, template
+from argo.workflows.dsl.templates import closure, inputs, scope, template
 
 from ._base import TestCase
 
@@ -91,6 +93,160 @@ class TestWorkflow(TestCase):
         assert isinstance(wf_a, V1alpha1Workflow)
         assert isinstance(wf_b, V1alpha1Workflow)
 
+    def test_compile_cache(self) -> None:
+        """Test that `Workflow.compile` caches the compiled spec per class."""
+        class TestWorkflowCache(Workflow):
+            @template
+            def echo(self) -> V1Container:
+                return V1Container(image="alpine:3.7", name="echo")
+
+        wf_a = TestWorkflowCache()
+        assert "__compiled__" in vars(TestWorkflowCache)
+
+        wf_b = TestWorkflowCache()
+
+        assert wf_a.model == wf_b.model
+        # instances must not share the compiled model
+        assert wf_a.model is not wf_b.model
+
+        wf_a.model.spec["templates"][0]["name"] = "changed"
+        assert wf_b.model.spec["templates"][0]["name"] == "echo"
+
+        assert wf_b.validated
+
+        # each instance owns its spec, changes of it are seen by the instance only
+        wf_a.spec.templates[0].container.image = "changed"
+        assert wf_a.to_dict()["spec"]["templates"][0]["container"]["image"] == "changed"
+        assert wf_a.digest() != wf_b.digest()
+
+        wf_c = TestWorkflowCache()
+        assert wf_c.model.spec["templates"][0]["container"]["image"] == "alpine:3.7"
+        assert wf_c.spec.templates[0].container.image == "alpine:3.7"
+        assert wf_c.digest() == wf_b.digest()
+
+        # each instance owns its metadata, later instances don't see changes of it
+        wf_a.name = "renamed"
+        assert wf_b.name == ""
+
+        wf_c = TestWorkflowCache()
+        assert wf_c.model.metadata["name"] == ""
+        assert wf_c.model.metadata["generate_name"] == "test-workflow-cache-"
+        assert "name: renamed" not in wf_c.to_yaml()
+
+        # loaded workflows carry their own manifest
+        wf_d = Workflow.from_file(self._WORKFLOW_FILE)
+        wf_d.compile()
+
+        manifest = wf_d.to_dict()
+        manifest["metadata"]["name"] = "other"
+
+        wf_e = Workflow.from_dict(manifest)
+        assert wf_e.compile().metadata["name"] == "other"
+
+    def test_compile_lazy(self) -> None:
+        """Test deferred compilation of Workflow classes."""
+        class TestWorkflowLazy(Workflow, lazy=True):
+            name = "test"
+
+            @task
+            def A(self) -> V1alpha1Template:
+                return self.echo()
+
+            @template
+            def echo(self) -> V1Container:
+                return V1Container(image="alpine:3.7", name="echo")
+
+        assert "__deferred__" in vars(TestWorkflowLazy)
+        assert isinstance(TestWorkflowLazy.spec, dict)
+
+        class TestWorkflowLazySubclass(TestWorkflowLazy):
+            """Laziness is inherited."""
+
+        assert "__deferred__" in vars(TestWorkflowLazySubclass)
+
+        wf = TestWorkflowLazy()
+        manifest = wf.to_dict()
+
+        assert "__deferred__" not in vars(TestWorkflowLazy)
+        assert [t["name"] for t in manifest["spec"]["templates"]] == ["main", "echo"]
+
+        class TestWorkflowEager(TestWorkflowLazy, lazy=False):
+            name = "test"
+
+        assert "__deferred__" not in vars(TestWorkflowEager)
+
+    def test_compile_closure(self) -> None:
+        """Test that imports of closures and scoped objects are hoisted."""
+        class TestWorkflowClosure(Workflow):
+            name = "test"
+
+            @scope(name="helpers")
+            def sep() -> str:
+                import os
+                from typing import (
+                    Any,
+                )
+
+                return os.sep
+
+            @closure(scope="helpers", image="python:3.8")
+            def run() -> V1alpha1Template:
+                import os
+
+                print("import nothing")
+                print(os.getcwd() + helpers.sep())
+
+        wf = TestWorkflowClosure()
+        source = wf.spec.templates[0].script.source
+
+        assert source.startswith("import os\n\nfrom typing import (\n    Any,\n)\n")
+        assert source.count("import os") == 1
+        assert 'print("import nothing")' in source
+        assert "    @staticmethod\n    def sep() -> str:\n        return os.sep\n" in source
+
+    def test_digest(self) -> None:
+        """Test `Workflow.digest` and hashing of Workflows."""
+        wf_a = Workflow.from_file(self._WORKFLOW_FILE)
+        wf_b = Workflow.from_dict(yaml.safe_load(self._WORKFLOW_FILE.read_text()))
+
+        assert len(wf_a.digest()) == 64
+        assert wf_a.digest() == wf_b.digest()
+
+        # hashed and compared by the digest
+        assert wf_a == wf_b
+        assert hash(wf_a) == hash(wf_b)
+        assert len({wf_a, wf_b}) == 1
+
+        wf_b.name = "other"
+        assert wf_a.digest() != wf_b.digest()
+        assert wf_a != wf_b
+        assert len({wf_a, wf_b}) == 2
+
+        # in-place changes of nested objects require refresh
+        digest = wf_b.digest()
+        wf_b.spec.templates[0].name = "changed"
+        assert wf_b.digest() == digest
+        assert wf_b.digest(refresh=True) != digest
+
+        wf_b.spec = wf_a.spec
+        wf_b.name = wf_a.name
+        assert wf_a.digest() == wf_b.digest()
+        assert wf_a == wf_b
+
+        # hashing doesn't compile
+        class TestWorkflowHash(Workflow):
+            @template
+            def echo(self) -> V1Container:
+                return V1Container(image="alpine:3.7", name="echo")
+
+        wf_c = TestWorkflowHash(compile=False)
+        with pytest.raises(TypeError):
+            hash(wf_c)
+        assert wf_c.model is None
+
+        wf_c.compile()
+        assert hash(wf_c) == hash(TestWorkflowHash())
+
     def test_from_file(self) -> None:
         """Test `Workflow.from_file` method."""
         wf = Workflow.from_file(self._WORKFLOW_FILE)
@@ -100,14 +256,42 @@ class TestWorkflow(TestCase):
         assert wf.kind == "Workflow"
         assert len(wf.spec.templates) == 1
 
+    def test_from_file_lazy(self) -> None:
+        """Test `Workflow.from_file` with lazy validation."""
+        wf = Workflow.from_file(self._WORKFLOW_FILE, lazy=True)
+
+        # nested models are not built until accessed
+        assert "__lazy__" in vars(wf.spec)
+        assert wf.validated
+
+        assert isinstance(wf.spec, V1alpha1WorkflowSpec)
+        assert wf.spec.entrypoint == "whalesay"
+        assert "__lazy__" not in vars(wf.spec)
+        assert type(wf.spec) is V1alpha1WorkflowSpec
+        assert "__lazy__" in vars(wf.spec.templates[0])
+
+        assert wf == Workflow.from_file(self._WORKFLOW_FILE)
+        assert wf.to_dict() == Workflow.from_file(self._WORKFLOW_FILE).to_dict()
+
+        manifest = {"metadata": {"name": "invalid"}, "spec": {"templates": [{}]}}
+        wf = Workflow.from_dict(manifest, lazy=True)
+        with pytest.raises(ValueError):
+            # V1alpha1Template requires name
+            wf.spec.templates[0].name
+
     def test_from_url(self, url: str) -> None:
         """Test `Workflow.from_url` method."""
         fake_response = type(
             "Response",
             (),
-            {"text": self._WORKFLOW_FILE.read_text(), "raise_for_status": lambda: None},
+            {
+                "text": self._WORKFLOW_FILE.read_text(),
+                "status_code": 200,
+                "headers": {},
+                "raise_for_status": lambda: None,
+            },
         )
-        flexmock(requests).should_receive("get").and_return(fake_response)
+        flexmock(requests.Session).should_receive("get").and_return(fake_response)
 
         wf = Workflow.from_url(url)
 
@@ -101,9 +101,14 @@ class TestWorkflow(TestCase):
         fake_response = type(
             "Response",
             (),
-            {"text": self._WORKFLOW_FILE.read_text(), "raise_for_status": lambda: None},
+            {
+                "text": self._WORKFLOW_FILE.read_text(),
+                "status_code": 200,
+                "headers": {},
+                "raise_for_status": lambda: None,
+            },
         )
-        flexmock(requests).should_receive("get").and_return(fake_response)
+        flexmock(requests.Session).should_receive("get").and_return(fake_response)
 
         wf = WorkflowTemplate.from_url(url)
 